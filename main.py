@@ -141,6 +141,16 @@ def main():
         QFileDialog {
             background-color: #141E30; color: #dce6f2;
         }
+        QPushButton#primaryBtn, QPushButton#secondaryBtn {
+            color: white; border: none;
+            padding: 10px 20px; border-radius: 4px; font-weight: bold;
+        }
+        QPushButton#primaryBtn { background-color: #0078D7; }
+        QPushButton#primaryBtn:hover { background-color: #005B9C; }
+        QPushButton#secondaryBtn { background-color: #6C757D; }
+        QPushButton#secondaryBtn:hover { background-color: #545B62; }
+        QLabel[heading="true"] { color: #0078D7; margin-top: 10px; }
+        QLabel#messageText { font-size: 15px; color: #dce6f2; }
     ''')
 
     # Create and show main window
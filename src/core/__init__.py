@@ -2,6 +2,6 @@
 from .user_manager import UserManager
 from .password_generator import PasswordGenerator
 from .encryption_manager import EncryptionManager
-from .password_manager import PasswordManager
+from .password_manager import PasswordManager, UnsupportedVaultError
 
-__all__ = ['UserManager', 'PasswordGenerator', 'EncryptionManager', 'PasswordManager'] 
\ No newline at end of file
+__all__ = ['UserManager', 'PasswordGenerator', 'EncryptionManager', 'PasswordManager', 'UnsupportedVaultError'] 
\ No newline at end of file
@@ -3,42 +3,200 @@ Encryption Manager
 Handles encryption and decryption of sensitive data.
 """
 
-import base64
+import io
 import os
-from cryptography.fernet import Fernet
+from functools import lru_cache
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from typing import Optional
+from typing import List, Optional
+
+try:
+    import pybase64 as base64  # SIMD base64, a drop-in replacement for the stdlib module
+except ImportError:
+    import base64
+
+try:
+    # Fernet is only needed to read vaults written before the switch to AES-GCM.
+    # rfernet is a Rust implementation of the same token format, several times faster.
+    from rfernet import Fernet
+except ImportError:
+    from cryptography.fernet import Fernet
+
+try:
+    from argon2.low_level import hash_secret_raw, Type
+except ImportError:  # argon2-cffi is optional
+    hash_secret_raw = None
+
+# Key derivation functions, as stored in the 'kdf' field of a .lp file
+KDF_PBKDF2_SHA256 = "pbkdf2-sha256"  # Legacy (files without a 'kdf' field)
+KDF_PBKDF2_SHA512 = "pbkdf2-sha512"
+KDF_ARGON2ID = "argon2id"
+DEFAULT_KDF = KDF_ARGON2ID if hash_secret_raw is not None else KDF_PBKDF2_SHA512
+
+# Ciphers, as stored in the 'cipher' field of a .lp file
+CIPHER_FERNET = "fernet"  # Legacy (files without a 'cipher' field)
+CIPHER_AES_GCM = "aes-256-gcm"
+DEFAULT_CIPHER = CIPHER_AES_GCM
+
+NONCE_SIZE = 12
+CHUNK_SIZE = 1024 * 1024  # Plaintext bytes per chunk for large binary data
+
+
+@lru_cache(maxsize=8)
+def _derive(master_pw: bytes, salt: bytes, kdf: str = KDF_PBKDF2_SHA256) -> bytes:
+    """Run the KDF once per (password, salt, kdf) and cache the raw 32-byte key."""
+    if kdf == KDF_ARGON2ID:
+        if hash_secret_raw is None:
+            raise ValueError("This vault requires Argon2id support (argon2-cffi is not installed).")
+        raw_key = hash_secret_raw(
+            secret=master_pw,
+            salt=salt,
+            time_cost=3,
+            memory_cost=64 * 1024,
+            parallelism=4,
+            hash_len=32,
+            type=Type.ID,
+        )
+    elif kdf == KDF_PBKDF2_SHA512:
+        raw_key = PBKDF2HMAC(
+            algorithm=hashes.SHA512(),
+            length=32,
+            salt=salt,
+            iterations=210000,
+        ).derive(master_pw)
+    elif kdf == KDF_PBKDF2_SHA256:
+        raw_key = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=100000,
+        ).derive(master_pw)
+    else:
+        raise ValueError(f"Unsupported key derivation function: {kdf}")
+    return raw_key
 
 
 class EncryptionManager:
     """Handles encryption and decryption of sensitive data."""
     
-    def __init__(self, master_password: str, salt: Optional[bytes] = None):
+    def __init__(self, master_password: str, salt: Optional[bytes] = None,
+                 kdf: str = DEFAULT_KDF, cipher: str = DEFAULT_CIPHER):
         self.master_password = master_password.encode()
         self.salt = salt if salt is not None else os.urandom(16)  # Use provided salt or generate new one
-
-        self.key = self._derive_key()
-        self.cipher = Fernet(self.key)
+        self.kdf = kdf
+        self.cipher_name = cipher
+        if kdf not in (KDF_PBKDF2_SHA256, KDF_PBKDF2_SHA512, KDF_ARGON2ID):
+            raise ValueError(f"Unsupported key derivation function: {kdf}")
+        if kdf == KDF_ARGON2ID and hash_secret_raw is None:
+            raise ValueError("This vault requires Argon2id support (argon2-cffi is not installed).")
+        if cipher not in (CIPHER_AES_GCM, CIPHER_FERNET):
+            raise ValueError(f"Unsupported cipher: {cipher}")
+        # The key is derived on first use, so a manager that import_data replaces
+        # with one for the vault's own salt/KDF never runs the KDF at all
+        self._cipher = None
+    
+    @property
+    def key(self) -> bytes:
+        """The raw derived key."""
+        return self._derive_key()
+    
+    @property
+    def cipher(self):
+        """The AESGCM or Fernet instance, created on first use."""
+        if self._cipher is None:
+            if self.cipher_name == CIPHER_AES_GCM:
+                self._cipher = AESGCM(self.key)
+            else:
+                self._cipher = Fernet(base64.urlsafe_b64encode(self.key).decode())
+        return self._cipher
     
     def _derive_key(self) -> bytes:
         """Derive encryption key from master password."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(self.master_password))
+        return _derive(self.master_password, self.salt, self.kdf)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached derived keys (e.g. on logout)."""
+        _derive.cache_clear()
     
     def get_salt(self) -> bytes:
         """Return the salt used for key derivation."""
         return self.salt
     
+    def get_kdf(self) -> str:
+        """Return the name of the key derivation function in use."""
+        return self.kdf
+    
+    def get_cipher(self) -> str:
+        """Return the name of the cipher in use."""
+        return self.cipher_name
+    
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt raw bytes and return the binary token."""
+        if self.cipher_name == CIPHER_AES_GCM:
+            nonce = os.urandom(NONCE_SIZE)
+            return nonce + self.cipher.encrypt(nonce, data, None)
+        token = self.cipher.encrypt(data)
+        # rfernet returns str tokens, cryptography returns bytes
+        return token.encode() if isinstance(token, str) else token
+    
+    def decrypt_bytes(self, token: bytes) -> bytes:
+        """Decrypt a binary token produced by encrypt_bytes."""
+        if self.cipher_name == CIPHER_AES_GCM:
+            return self.cipher.decrypt(token[:NONCE_SIZE], token[NONCE_SIZE:], None)
+        return self.cipher.decrypt(token.decode())
+    
+    def encrypt_chunks(self, data: bytes, chunk_size: int = CHUNK_SIZE) -> List[bytes]:
+        """Encrypt large data as a list of independent AES-GCM chunks.
+        
+        Each chunk's nonce is a random 8-byte prefix shared by the whole list followed by
+        the 4-byte chunk index, and the last chunk is authenticated as final so that
+        reordered or truncated chunk lists fail to decrypt.
+        """
+        if self.cipher_name != CIPHER_AES_GCM:
+            raise ValueError("Chunked encryption requires AES-GCM.")
+        prefix = os.urandom(NONCE_SIZE - 4)
+        chunk_count = max(1, -(-len(data) // chunk_size))
+        view = memoryview(data)
+        chunks = []
+        for index in range(chunk_count):
+            nonce = prefix + index.to_bytes(4, 'big')
+            final = b"\x01" if index == chunk_count - 1 else b"\x00"
+            plaintext = view[index * chunk_size:(index + 1) * chunk_size]
+            chunks.append(nonce + self.cipher.encrypt(nonce, plaintext, final))
+        return chunks
+    
+    def decrypt_chunks(self, chunks: List[bytes]) -> bytes:
+        """Decrypt a chunk list produced by encrypt_chunks."""
+        if self.cipher_name != CIPHER_AES_GCM:
+            raise ValueError("Chunked decryption requires AES-GCM.")
+        output = io.BytesIO()
+        for index, chunk in enumerate(chunks):
+            nonce = chunk[:NONCE_SIZE]
+            if nonce[-4:] != index.to_bytes(4, 'big'):
+                raise ValueError("Encrypted chunks are out of order.")
+            final = b"\x01" if index == len(chunks) - 1 else b"\x00"
+            output.write(self.cipher.decrypt(nonce, chunk[NONCE_SIZE:], final))
+        return output.getvalue()
+    
+    def encrypt_token(self, data: bytes) -> str:
+        """Encrypt raw bytes and return the token as text."""
+        token = self.encrypt_bytes(data)
+        if self.cipher_name == CIPHER_AES_GCM:
+            return base64.b64encode(token).decode()
+        return token.decode()  # Fernet tokens are already base64 text
+    
+    def decrypt_token(self, encrypted_data: str) -> bytes:
+        """Decrypt a text token produced by encrypt_token."""
+        if self.cipher_name == CIPHER_AES_GCM:
+            return self.decrypt_bytes(base64.b64decode(encrypted_data))
+        return self.decrypt_bytes(encrypted_data.encode())
+    
     def encrypt(self, data: str) -> str:
         """Encrypt data."""
-        return self.cipher.encrypt(data.encode()).decode()
+        return self.encrypt_token(data.encode())
     
     def decrypt(self, encrypted_data: str) -> str:
         """Decrypt data."""
-        return self.cipher.decrypt(encrypted_data.encode()).decode() 
\ No newline at end of file
+        return self.decrypt_token(encrypted_data).decode()
\ No newline at end of file
@@ -5,6 +5,10 @@ Handles password generation with various complexity options.
 
 import secrets
 import string
+from itertools import product
+
+# Characters that are easily confused with one another
+SIMILAR_CHARS = "lI1O0S5"
 
 
 class PasswordGenerator:
@@ -15,37 +19,66 @@ class PasswordGenerator:
         self.uppercase = string.ascii_uppercase
         self.digits = string.digits
         self.symbols = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+        
+        # Precompute every alphabet, keyed by (use_uppercase, use_digits, use_symbols, exclude_similar)
+        strip_similar = str.maketrans('', '', SIMILAR_CHARS)
+        self._alphabets = {}
+        for use_uppercase, use_digits, use_symbols, exclude_similar in product((False, True), repeat=4):
+            chars = ''.join((
+                self.lowercase,
+                self.uppercase if use_uppercase else '',
+                self.digits if use_digits else '',
+                self.symbols if use_symbols else '',
+            ))
+            if exclude_similar:
+                chars = chars.translate(strip_similar)
+            self._alphabets[(use_uppercase, use_digits, use_symbols, exclude_similar)] = chars
+        
+        self._upper_set = frozenset(self.uppercase)
+        self._digit_set = frozenset(self.digits)
+        self._symbol_set = frozenset(self.symbols)
     
     def generate_password(self, length: int = 16, use_uppercase: bool = True,
                          use_digits: bool = True, use_symbols: bool = True,
                          exclude_similar: bool = True) -> str:
         """Generate a secure password with specified criteria."""
-        chars = self.lowercase
-        
-        if use_uppercase:
-            chars += self.uppercase
-        if use_digits:
-            chars += self.digits
-        if use_symbols:
-            chars += self.symbols
-        
-        if exclude_similar:
-            # Remove similar characters
-            chars = chars.replace('l', '').replace('1', '').replace('I', '')
-            chars = chars.replace('O', '').replace('0', '')
-            chars = chars.replace('S', '').replace('5', '')
+        chars = self._alphabets[(bool(use_uppercase), bool(use_digits), bool(use_symbols), bool(exclude_similar))]
         
         if len(chars) < length:
             raise ValueError("Character set too small for requested length")
         
-        password = ''.join(secrets.choice(chars) for _ in range(length))
+        password = self._random_chars(chars, length)
         
         # Ensure at least one character from each selected category
-        if use_uppercase and not any(c in self.uppercase for c in password):
-            password = secrets.choice(self.uppercase) + password[1:]
-        if use_digits and not any(c in self.digits for c in password):
-            password = secrets.choice(self.digits) + password[2:]
-        if use_symbols and not any(c in self.symbols for c in password):
-            password = secrets.choice(self.symbols) + password[3:]
+        required = [category for enabled, category in (
+            (use_uppercase, self._upper_set),
+            (use_digits, self._digit_set),
+            (use_symbols, self._symbol_set),
+        ) if enabled]
+        missing = [category for category in required if category.isdisjoint(password)]
+        if missing:
+            # Keep the first character of every category that is already present,
+            # and put each missing category into its own randomly chosen slot
+            protected = {next(i for i, c in enumerate(password) if c in category)
+                         for category in required if category not in missing}
+            free_slots = [i for i in range(length) if i not in protected]
+            slots = secrets.SystemRandom().sample(free_slots, min(len(missing), len(free_slots)))
+            for slot, category in zip(slots, missing):
+                password[slot] = secrets.choice([c for c in chars if c in category])
         
-        return password 
\ No newline at end of file
+        return ''.join(password)
+    
+    @staticmethod
+    def _random_chars(chars: str, length: int) -> list:
+        """Pick length characters from chars using bulk-drawn random bytes."""
+        # Reject bytes at or above the largest multiple of len(chars) to avoid modulo bias
+        alphabet_size = len(chars)
+        limit = 256 - (256 % alphabet_size)
+        result = []
+        while len(result) < length:
+            for byte in secrets.token_bytes((length - len(result)) * 2):
+                if byte < limit:
+                    result.append(chars[byte % alphabet_size])
+                    if len(result) == length:
+                        break
+        return result 
\ No newline at end of file
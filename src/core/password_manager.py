@@ -4,28 +4,104 @@ Main password manager class handling data storage and operations.
 """
 
 import os
+import io
 import json
-import base64
+import mmap
+import struct
+import tempfile
 import secrets
 import string
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from operator import attrgetter
 from typing import List, Dict, Optional
 import hashlib # Import hashlib for deterministic salt generation
 
 import bcrypt
+try:
+    import pybase64 as base64  # SIMD base64, a drop-in replacement for the stdlib module
+except ImportError:
+    import base64
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; vaults fall back to JSON
+    msgpack = None
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; vaults are then written uncompressed
+    zstandard = None
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from ..models import PasswordEntry, SecureNote, CardEntry, IdentityEntry, FileEntry
-from .encryption_manager import EncryptionManager
+from .encryption_manager import (
+    EncryptionManager, DEFAULT_KDF, DEFAULT_CIPHER, KDF_PBKDF2_SHA256, CIPHER_FERNET
+)
 from .user_manager import UserManager
 from src.utils.resource_path import get_appdata_path
 
 
+class UnsupportedVaultError(ValueError):
+    """A vault that cannot be read here, e.g. because it needs an optional package that is not installed.
+    
+    Unlike a wrong password or a corrupted file, the vault itself is fine, so it must never
+    be replaced by an empty one.
+    """
+
+
 class PasswordManager:
     """Main password manager class handling data storage and operations."""
     
+    # .lp framing: header, separator, payload length (u64 LE), payload, then a JSON summary
+    # trailer. Version 1.0 files have no length field and run to the end of the file.
+    LP_HEADER = b"LUCKEEPASS_BACKUP_V2.0"
+    LP_HEADER_V1 = b"LUCKEEPASS_BACKUP_V1.0"
+    LP_SEPARATOR = b"\x00\xFF\x00\xFF"
+    LP_LENGTH = struct.Struct('<Q')
+    LP_PREFIX_SIZE = len(LP_HEADER) + len(LP_SEPARATOR) + LP_LENGTH.size
+    
+    # Current .lp data version and the fields encrypted for each entry type
+    DATA_VERSION = '2.2'
+    SENSITIVE_FIELDS = {
+        'passwords': ('password', 'notes'),
+        'notes': ('content',),
+        'cards': ('card_number', 'cvv', 'notes'),
+        'identities': ('social_security_number', 'driver_license', 'passport_number', 'notes'),
+        'files': ('file_data', 'notes'),
+    }
+    # Model class and display label for each entry type
+    ENTRY_TYPES = {
+        'passwords': (PasswordEntry, 'password entry'),
+        'notes': (SecureNote, 'note'),
+        'cards': (CardEntry, 'card entry'),
+        'identities': (IdentityEntry, 'identity entry'),
+        'files': (FileEntry, 'file'),
+    }
+    # Fields matched by search() for each entry list (sensitive fields are never indexed)
+    SEARCH_FIELDS = {
+        'passwords': ('title', 'username', 'url', 'category'),
+        'notes': ('title', 'category'),
+        'cards': ('title', 'card_type', 'cardholder_name', 'category'),
+        'identities': ('title', 'full_name', 'email', 'phone', 'category'),
+        'favorites': ('title', 'type', 'category'),
+    }
+    SEARCH_CACHE_SIZE = 32  # Results kept per entry list by search()
+    # Type shown in the favorites table for each model class
+    FAVORITE_TYPES = {
+        PasswordEntry: "Password",
+        SecureNote: "Secure Note",
+        CardEntry: "Card",
+        IdentityEntry: "Identity",
+        FileEntry: "File",
+    }
+    
     def __init__(self, master_password: str, user_manager: UserManager):
         self.master_password = master_password
         self.user_manager = user_manager
@@ -35,7 +111,18 @@ class PasswordManager:
         self.cards: List[CardEntry] = []
         self.identities: List[IdentityEntry] = []
         self.files: List[FileEntry] = []
-        self.categories = set()
+        # Number of entries using each category; see the categories property
+        self._category_counts: Counter = Counter()
+        # Category each entry was counted under, by id(entry); entries may be edited in place
+        self._entry_categories: Dict[int, str] = {}
+        # Favorited entries, kept up to date by add_*/update_*/delete_* and set_favorite()
+        self._favorites: list = []
+        # Timestamp shared by all changes made between _begin_batch() and _end_batch()
+        self._batch_now: Optional[str] = None
+        # Set when load_data found a vault it cannot read; save_data then refuses to overwrite it
+        self.read_only = False
+        # Lowercased search text per entry list; see search()
+        self._search_index: Dict[str, tuple] = {}
         
         # Initialize encryption_manager using the vault salt from user_manager
         vault_salt = self.user_manager.get_vault_salt()
@@ -47,10 +134,23 @@ class PasswordManager:
     
     def save_data(self) -> None:
         """Save all data to local file."""
+        if self.read_only:
+            raise Exception("Failed to save data: the existing vault could not be read, so it was not overwritten.")
         try:
-            lp_data = self.export_data()
-            with open(self.data_file, 'wb') as f:
-                f.write(lp_data)
+            # Write to a temporary file next to the vault, then atomically replace it,
+            # so a crash mid-save never leaves a truncated vault behind
+            directory = os.path.dirname(os.path.abspath(self.data_file))
+            tmp = tempfile.NamedTemporaryFile(dir=directory, prefix='.luckeepass_', suffix='.tmp', delete=False)
+            try:
+                with tmp:
+                    self.write_data(tmp)
+                    tmp.flush()
+                    os.fsync(tmp.fileno())
+                os.replace(tmp.name, self.data_file)
+            except BaseException:
+                if os.path.exists(tmp.name):
+                    os.remove(tmp.name)
+                raise
         except Exception as e:
             raise Exception(f"Failed to save data: {str(e)}")
     
@@ -59,25 +159,32 @@ class PasswordManager:
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'rb') as f:
-                    lp_data = f.read()
-                
-                # Check if file is empty
-                if len(lp_data) == 0:
-                    return
-                
-                # Try to load the data
-                try:
-                    self.import_data(lp_data)
-                except Exception as e:
-                    print("This usually means the master password is different from when the data was created.")
-                    print("Starting with fresh data. You can delete the data file to avoid this message.")
-                    # Clear any partially loaded data
-                    self.passwords = []
-                    self.notes = []
-                    self.cards = []
-                    self.identities = []
-                    self.categories = set()
+                    # Check if file is empty
+                    if os.fstat(f.fileno()).st_size == 0:
+                        return
                     
+                    # Map the file so the OS page cache owns the bytes instead of a copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as lp_data:
+                        # Try to load the data
+                        try:
+                            self.import_data(lp_data)
+                        except UnsupportedVaultError:
+                            raise
+                        except Exception as e:
+                            print("This usually means the master password is different from when the data was created.")
+                            print("Starting with fresh data. You can delete the data file to avoid this message.")
+                            # Clear any partially loaded data
+                            self.passwords = []
+                            self.notes = []
+                            self.cards = []
+                            self.identities = []
+                            self.categories = set()
+                            self.rebuild_favorites()
+                    
+            except UnsupportedVaultError:
+                # Keep the vault on disk as it is rather than saving an empty one over it
+                self.read_only = True
+                raise
             except Exception as e:
                 # If loading fails, start with empty data
                 print("Starting with fresh data")
@@ -86,194 +193,502 @@ class PasswordManager:
                 self.cards = []
                 self.identities = []
                 self.categories = set()
+                self.rebuild_favorites()
         else:
             print("No existing data file found, starting fresh")
     
+    @property
+    def categories(self):
+        """Categories currently used by at least one entry."""
+        return self._category_counts.keys()
+    
+    @categories.setter
+    def categories(self, categories) -> None:
+        self._category_counts = Counter(categories)
+        self._entry_categories = {}
+    
+    def _discard_category(self, category: str) -> None:
+        """Drop one use of a category, forgetting it once no entry uses it."""
+        self._category_counts[category] -= 1
+        if self._category_counts[category] <= 0:
+            del self._category_counts[category]
+    
+    def _count_category(self, entry) -> None:
+        """Count one use of entry's category, remembering it for when entry is replaced or deleted."""
+        self._entry_categories[id(entry)] = entry.category
+        self._category_counts[entry.category] += 1
+    
+    def _uncount_category(self, entry) -> None:
+        """Drop the use counted for entry, under the category it had when it was counted.
+        
+        The dialogs edit entries in place before update_* is called, so entry.category may
+        already be the new category.
+        """
+        self._discard_category(self._entry_categories.pop(id(entry), entry.category))
+    
+    def rebuild_categories(self) -> None:
+        """Recount categories after the entry lists were modified directly."""
+        self._category_counts = Counter()
+        self._entry_categories = {}
+        for entries in (self.passwords, self.notes, self.cards, self.identities, self.files):
+            for entry in entries:
+                self._count_category(entry)
+    
+    @property
+    def favorites(self):
+        """Return a list of all favorited items with a type attribute for display in the favorites table."""
+        return self._favorites
+    
+    def set_favorite(self, entry, is_favorite: bool) -> None:
+        """Mark an entry as favorite or not, keeping the favorites list in sync."""
+        entry.is_favorite = is_favorite
+        if is_favorite:
+            self._track_favorite(entry)
+        else:
+            self._untrack_favorite(entry)
+    
+    def _track_favorite(self, entry) -> None:
+        """Add entry to the favorites list if it is favorited and not already listed."""
+        if entry.is_favorite and not any(fav is entry for fav in self._favorites):
+            entry.type = self.FAVORITE_TYPES[type(entry)]
+            self._favorites.append(entry)
+    
+    def _untrack_favorite(self, entry) -> None:
+        """Remove entry from the favorites list if present."""
+        for i, fav in enumerate(self._favorites):
+            if fav is entry:
+                del self._favorites[i]
+                return
+    
+    def rebuild_favorites(self) -> None:
+        """Rebuild the favorites list after the entry lists were modified directly."""
+        self._favorites = []
+        for entries in (self.passwords, self.notes, self.cards, self.identities, self.files):
+            for entry in entries:
+                self._track_favorite(entry)
+    
+    def search(self, section: str, text: str) -> List[bool]:
+        """Return, for each entry of an entry list or 'favorites', whether it matches text.
+        
+        Matches are case-insensitive substring tests against SEARCH_FIELDS. The lowercased
+        field text of each list is kept and rebuilt only when the list's entries change,
+        together with the results of the last SEARCH_CACHE_SIZE searches. A search for text
+        containing an earlier search can only match entries that one matched, so only those
+        are tested again, e.g. while a search is typed one character at a time.
+        """
+        entries = tuple(getattr(self, section))
+        cached = self._search_index.get(section)
+        if cached is None or cached[0] != entries:  # Entries compare by identity
+            get_fields = attrgetter(*self.SEARCH_FIELDS[section])
+            # Fields are joined with NUL so that a match cannot span two fields
+            cached = (entries, ['\x00'.join(get_fields(entry)).lower() for entry in entries], {})
+            self._search_index[section] = cached
+        keys, results = cached[1], cached[2]
+        text = text.lower()
+        matches = results.pop(text, None)
+        if matches is None:
+            narrower = max((query for query in results if query in text), key=len, default=None)
+            if narrower is None:
+                matches = [text in key for key in keys]
+            else:
+                matches = [found and text in key for found, key in zip(results[narrower], keys)]
+            if len(results) >= self.SEARCH_CACHE_SIZE:
+                del results[next(iter(results))]  # Evict the least recently used result
+        results[text] = matches  # (Re)inserted last, as the most recently used
+        return list(matches)
+    
+    def _begin_batch(self) -> None:
+        """Start a bulk operation; every change until _end_batch() shares one timestamp."""
+        self._batch_now = datetime.now().isoformat()
+    
+    def _end_batch(self) -> None:
+        """Finish a bulk operation started with _begin_batch()."""
+        self._batch_now = None
+    
+    def _now(self) -> str:
+        """Return the timestamp for a change, reusing the batch timestamp if one is active."""
+        return self._batch_now or datetime.now().isoformat()
+    
     def add_password(self, entry: PasswordEntry) -> None:
         """Add a password entry."""
-        entry.modified = datetime.now().isoformat()
+        entry.modified = self._now()
         self.passwords.append(entry)
-        self.categories.add(entry.category)
+        self._count_category(entry)
+        self._track_favorite(entry)
     
     def update_password(self, index: int, entry: PasswordEntry) -> None:
         """Update a password entry."""
-        entry.modified = datetime.now().isoformat()
+        entry.modified = self._now()
+        self._uncount_category(self.passwords[index])
+        self._count_category(entry)
+        self._untrack_favorite(self.passwords[index])
         self.passwords[index] = entry
-        self.categories.add(entry.category)
+        self._track_favorite(entry)
+        self._search_index.clear()  # The entry may have been edited in place
     
     def delete_password(self, index: int) -> None:
         """Delete a password entry."""
+        self._uncount_category(self.passwords[index])
+        self._untrack_favorite(self.passwords[index])
         del self.passwords[index]
     
     def add_note(self, note: SecureNote) -> None:
         """Add a secure note."""
-        note.modified = datetime.now().isoformat()
+        note.modified = self._now()
         self.notes.append(note)
-        self.categories.add(note.category)
+        self._count_category(note)
+        self._track_favorite(note)
     
     def update_note(self, index: int, note: SecureNote) -> None:
         """Update a secure note."""
-        note.modified = datetime.now().isoformat()
+        note.modified = self._now()
+        self._uncount_category(self.notes[index])
+        self._count_category(note)
+        self._untrack_favorite(self.notes[index])
         self.notes[index] = note
-        self.categories.add(note.category)
+        self._track_favorite(note)
+        self._search_index.clear()  # The entry may have been edited in place
     
     def delete_note(self, index: int) -> None:
         """Delete a secure note."""
+        self._uncount_category(self.notes[index])
+        self._untrack_favorite(self.notes[index])
         del self.notes[index]
     
     def add_card(self, card: CardEntry) -> None:
         """Add a card entry."""
-        card.modified = datetime.now().isoformat()
+        card.modified = self._now()
         self.cards.append(card)
-        self.categories.add(card.category)
+        self._count_category(card)
+        self._track_favorite(card)
     
     def update_card(self, index: int, card: CardEntry) -> None:
         """Update a card entry."""
-        card.modified = datetime.now().isoformat()
+        card.modified = self._now()
+        self._uncount_category(self.cards[index])
+        self._count_category(card)
+        self._untrack_favorite(self.cards[index])
         self.cards[index] = card
-        self.categories.add(card.category)
+        self._track_favorite(card)
+        self._search_index.clear()  # The entry may have been edited in place
     
     def delete_card(self, index: int) -> None:
         """Delete a card entry."""
+        self._uncount_category(self.cards[index])
+        self._untrack_favorite(self.cards[index])
         del self.cards[index]
     
     def add_identity(self, identity: IdentityEntry) -> None:
         """Add an identity entry."""
-        identity.modified = datetime.now().isoformat()
+        identity.modified = self._now()
         self.identities.append(identity)
-        self.categories.add(identity.category)
+        self._count_category(identity)
+        self._track_favorite(identity)
     
     def update_identity(self, index: int, identity: IdentityEntry) -> None:
         """Update an identity entry."""
-        identity.modified = datetime.now().isoformat()
+        identity.modified = self._now()
+        self._uncount_category(self.identities[index])
+        self._count_category(identity)
+        self._untrack_favorite(self.identities[index])
         self.identities[index] = identity
-        self.categories.add(identity.category)
+        self._track_favorite(identity)
+        self._search_index.clear()  # The entry may have been edited in place
     
     def delete_identity(self, index: int) -> None:
         """Delete an identity entry."""
+        self._uncount_category(self.identities[index])
+        self._untrack_favorite(self.identities[index])
         del self.identities[index]
     
     def add_file(self, file_entry: FileEntry) -> None:
         """Add a file entry."""
-        file_entry.modified = datetime.now().isoformat()
+        file_entry.modified = self._now()
         self.files.append(file_entry)
-        self.categories.add(file_entry.category)
+        self._count_category(file_entry)
+        self._track_favorite(file_entry)
     
     def update_file(self, index: int, file_entry: FileEntry) -> None:
         """Update a file entry."""
-        file_entry.modified = datetime.now().isoformat()
+        file_entry.modified = self._now()
+        self._uncount_category(self.files[index])
+        self._count_category(file_entry)
+        self._untrack_favorite(self.files[index])
         self.files[index] = file_entry
-        self.categories.add(file_entry.category)
+        self._track_favorite(file_entry)
+        self._search_index.clear()  # The entry may have been edited in place
     
     def delete_file(self, index: int) -> None:
         """Delete a file entry."""
+        self._uncount_category(self.files[index])
+        self._untrack_favorite(self.files[index])
         del self.files[index]
     
     def export_data(self) -> bytes:
         """Export all data as encrypted .lp file format."""
-        data = {
-            'passwords': [entry.to_dict() for entry in self.passwords],
-            'notes': [note.to_dict() for note in self.notes],
-            'cards': [card.to_dict() for card in self.cards],
-            'identities': [identity.to_dict() for identity in self.identities],
-            'files': [file.to_dict() for file in self.files],
-            'version': '1.0',
-            'app_name': 'LuckeePass',
-            'company': 'LuckeeSoft',
-            'created': datetime.now().isoformat()
-        }
+        buffer = io.BytesIO()
+        self.write_data(buffer)
+        return buffer.getvalue()
+    
+    def write_data(self, f) -> None:
+        """Write all data in encrypted .lp file format to a seekable binary file.
         
-        # Add salt to the data for encryption
-        data['encryption_salt'] = base64.b64encode(self.encryption_manager.get_salt()).decode('utf-8')
-
-        # Encrypt each sensitive field
-        encrypted_data = {
-            'passwords': [],
-            'notes': [],
-            'cards': [],
-            'identities': [],
-            'files': [],
-            'version': '1.0',
+        Entries are encrypted and serialized one at a time as they are written, so the
+        whole encrypted vault never has to be held in memory at once.
+        """
+        # Migrate vaults opened with a legacy KDF or cipher to the current defaults on save
+        if (self.encryption_manager.get_kdf() != DEFAULT_KDF
+                or self.encryption_manager.get_cipher() != DEFAULT_CIPHER):
+            self.encryption_manager = EncryptionManager(self.master_password, salt=self.encryption_manager.get_salt())
+        
+        # Include the salt (MessagePack stores raw bytes, JSON needs base64)
+        if msgpack is not None:
+            encryption_salt = self.encryption_manager.get_salt()
+        else:
+            encryption_salt = base64.b64encode(self.encryption_manager.get_salt()).decode('utf-8')
+        
+        metadata = {
+            'version': self.DATA_VERSION,
             'app_name': 'LuckeePass',
             'company': 'LuckeeSoft',
-            'created': data['created'],
-            'encryption_salt': data['encryption_salt']  # Include salt in encrypted data
+            'created': self._now(),
+            'encryption_salt': encryption_salt,
+            'kdf': self.encryption_manager.get_kdf(),
+            'cipher': self.encryption_manager.get_cipher(),
+            'compression': 'zstd' if zstandard is not None else 'none'
         }
         
-        for entry in data['passwords']:
-            encrypted_entry = entry.copy()
-            encrypted_entry['password'] = self.encryption_manager.encrypt(entry['password'])
-            encrypted_entry['notes'] = self.encryption_manager.encrypt(entry['notes'])
-            encrypted_data['passwords'].append(encrypted_entry)
+        # Attachment contents, stored once per distinct SHA-256 and referenced by 'file_hash'
+        blobs = {}
         
-        for note in data['notes']:
-            encrypted_note = note.copy()
-            encrypted_note['content'] = self.encryption_manager.encrypt(note['content'])
-            encrypted_data['notes'].append(encrypted_note)
+        # Header and separator, then a placeholder for the payload length
+        f.write(self.LP_HEADER + self.LP_SEPARATOR)
+        length_pos = f.tell()
+        f.write(self.LP_LENGTH.pack(0))
+        payload_start = f.tell()
         
-        for card in data['cards']:
-            encrypted_card = card.copy()
-            encrypted_card['card_number'] = self.encryption_manager.encrypt(card['card_number'])
-            encrypted_card['cvv'] = self.encryption_manager.encrypt(card['cvv'])
-            encrypted_card['notes'] = self.encryption_manager.encrypt(card['notes'])
-            encrypted_data['cards'].append(encrypted_card)
+        # Serialize with MessagePack when available, otherwise compact JSON
+        if msgpack is not None:
+            packer = msgpack.Packer(use_bin_type=True)
+            f.write(packer.pack_map_header(len(self.SENSITIVE_FIELDS) + 1 + len(metadata)))
+            for section, fields in self.SENSITIVE_FIELDS.items():
+                entries = getattr(self, section)
+                f.write(packer.pack(section))
+                f.write(packer.pack_array_header(len(entries)))
+                for entry in entries:
+                    f.write(packer.pack(self._encrypt_entry(entry, fields, blobs)))
+            f.write(packer.pack('blobs'))
+            f.write(packer.pack(blobs))
+            for key, value in metadata.items():
+                f.write(packer.pack(key))
+                f.write(packer.pack(value))
+        else:
+            encrypted_data = {
+                section: [self._encrypt_entry(entry, fields, blobs) for entry in getattr(self, section)]
+                for section, fields in self.SENSITIVE_FIELDS.items()
+            }
+            encrypted_data['blobs'] = blobs
+            encrypted_data.update(metadata)
+            if orjson is not None:
+                f.write(orjson.dumps(encrypted_data))
+            else:
+                for chunk in json.JSONEncoder(separators=(',', ':')).iterencode(encrypted_data):
+                    f.write(chunk.encode('utf-8'))
         
-        for identity in data['identities']:
-            encrypted_identity = identity.copy()
-            encrypted_identity['social_security_number'] = self.encryption_manager.encrypt(identity['social_security_number'])
-            encrypted_identity['driver_license'] = self.encryption_manager.encrypt(identity['driver_license'])
-            encrypted_identity['passport_number'] = self.encryption_manager.encrypt(identity['passport_number'])
-            encrypted_identity['notes'] = self.encryption_manager.encrypt(identity['notes'])
-            encrypted_data['identities'].append(encrypted_identity)
+        # Fill in the payload length now that it is known
+        payload_end = f.tell()
+        f.seek(length_pos)
+        f.write(self.LP_LENGTH.pack(payload_end - payload_start))
+        f.seek(payload_end)
         
-        for file in data['files']:
-            encrypted_file = file.copy()
-            encrypted_file['file_data'] = self.encryption_manager.encrypt(file['file_data'])
-            encrypted_file['notes'] = self.encryption_manager.encrypt(file['notes'])
-            encrypted_data['files'].append(encrypted_file)
+        # Small plaintext summary so get_backup_info can skip the payload entirely
+        summary = {
+            'app_name': metadata['app_name'],
+            'company': metadata['company'],
+            'version': metadata['version'],
+            'created': metadata['created'],
+            'password_count': len(self.passwords),
+            'note_count': len(self.notes),
+            'card_count': len(self.cards),
+            'identity_count': len(self.identities),
+            'file_count': len(self.files)
+        }
+        f.write(json.dumps(summary).encode('utf-8'))
+    
+    def _encrypt_entry(self, entry, fields: tuple, blobs: Optional[dict] = None) -> dict:
+        """Return entry as a dict with the given fields replaced by a single encrypted '_sec' blob.
         
-        # Convert to JSON and encode
-        json_data = json.dumps(encrypted_data, indent=2)
+        When blobs is given, attachment contents are moved into it and referenced by hash.
+        """
+        stored = entry.deferred_state()
+        if stored is not None and self._can_reuse(stored):
+            # Never decrypted this session: write the ciphertext it was loaded from
+            encrypted_entry = entry.to_dict_deferred(binary=msgpack is not None)
+            if stored['file_chunks'] is not None:
+                encrypted_entry['file_chunks'] = stored['file_chunks']
+            encrypted_entry['_sec'] = stored['_sec']
+            if blobs is not None:
+                self._store_attachments(entry, encrypted_entry, blobs)
+            return encrypted_entry
+        # MessagePack stores file contents as raw bytes, and top-level file contents are
+        # replaced by their encrypted chunks below, so neither needs a base64 pass
+        encrypted_entry = entry.to_dict(binary=msgpack is not None or 'file_data' in fields)
+        if 'file_data' in fields:
+            # File contents are encrypted separately in chunks, straight from the raw bytes
+            del encrypted_entry['file_data']
+            encrypted_entry['file_chunks'] = self._encrypt_file_data(entry.file_data)
+            fields = tuple(field for field in fields if field != 'file_data')
+        secret = self._compress(self._dump_json({field: encrypted_entry.pop(field) for field in fields}))
+        if msgpack is not None:
+            encrypted_entry['_sec'] = self.encryption_manager.encrypt_bytes(secret)
+        else:
+            encrypted_entry['_sec'] = self.encryption_manager.encrypt_token(secret)
+        if blobs is not None:
+            self._store_attachments(entry, encrypted_entry, blobs)
+        return encrypted_entry
+    
+    @staticmethod
+    def _store_attachments(entry, encrypted_entry: dict, blobs: dict) -> None:
+        """Replace attachment contents in encrypted_entry with hashes of entries in blobs."""
+        for file_entry, file_dict in zip(getattr(entry, 'attached_files', ()),
+                                         encrypted_entry.get('attached_files', ())):
+            digest = file_entry.content_hash()
+            file_data = file_dict.pop('file_data')
+            blobs.setdefault(digest, file_data)
+            file_dict['file_hash'] = digest
+    
+    @staticmethod
+    def _resolve_attachments(data: dict) -> None:
+        """Put shared attachment contents back into the entries of a parsed payload."""
+        blobs = data.pop('blobs', None)
+        if not blobs:
+            return
+        # Decode each blob once so duplicate attachments share one bytes object
+        blobs = {digest: blob if isinstance(blob, bytes) else base64.b64decode(blob)
+                 for digest, blob in blobs.items()}
+        for section in PasswordManager.SENSITIVE_FIELDS:
+            for entry_data in data.get(section, ()):
+                for file_dict in entry_data.get('attached_files', ()):
+                    if 'file_hash' in file_dict:
+                        # The hash stays so FileEntry.from_dict can reuse it as the content hash
+                        file_dict['file_data'] = blobs[file_dict['file_hash']]
+    
+    def _can_reuse(self, stored: dict) -> bool:
+        """Check whether ciphertext kept from import_data can be written out unchanged."""
+        return (stored['encryption_manager'] is self.encryption_manager
+                and stored['compressed'] == (zstandard is not None)
+                and isinstance(stored['_sec'], bytes) == (msgpack is not None))
+    
+    def _decrypt_fields(self, entry_data: dict, fields: tuple) -> dict:
+        """Decrypt the separately encrypted fields of a version 1.0 entry in place and return it."""
+        for field in fields:
+            entry_data[field] = self.encryption_manager.decrypt(entry_data[field])
+        return entry_data
+    
+    @staticmethod
+    def _dump_json(value) -> bytes:
+        """Serialize the plaintext of an encrypted blob as compact UTF-8 JSON."""
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+    
+    @staticmethod
+    def _load_json(data: bytes):
+        """Parse JSON written by _dump_json (or by older versions of this class)."""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    @staticmethod
+    def _compress(data: bytes) -> bytes:
+        """Compress plaintext before encryption when zstandard is available."""
+        if zstandard is None:
+            return data
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        """Undo _compress for data from a zstd-compressed vault."""
+        if zstandard is None:
+            raise UnsupportedVaultError("This .lp file requires zstd support (zstandard is not installed).")
+        return zstandard.ZstdDecompressor().decompress(data)
+    
+    def _encrypt_file_data(self, file_data: bytes) -> list:
+        """Encrypt file contents as a list of chunks (base64 text when writing JSON)."""
+        chunks = self.encryption_manager.encrypt_chunks(self._compress(file_data))
+        if msgpack is None:
+            return [base64.b64encode(chunk).decode('utf-8') for chunk in chunks]
+        return chunks
+    
+    @staticmethod
+    def _parse_payload(payload: bytes) -> dict:
+        """Parse the data following the .lp header, either JSON or MessagePack."""
+        if payload[:1] == b'{':
+            try:
+                if orjson is not None:
+                    return orjson.loads(payload)
+                return json.loads(str(payload, 'utf-8'))
+            except UnicodeDecodeError:
+                raise ValueError("Invalid .lp file format. Corrupted data encoding.")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid .lp file format. Corrupted JSON data: {str(e)}")
+        if msgpack is None:
+            raise UnsupportedVaultError("This .lp file requires MessagePack support (msgpack is not installed).")
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid .lp file format. Corrupted data: {str(e)}")
+    
+    @staticmethod
+    def _locate_payload(lp_data) -> memoryview:
+        """Return a view of the payload within the raw contents of a .lp file."""
+        view = memoryview(lp_data)
+        if view[:len(PasswordManager.LP_HEADER)] == PasswordManager.LP_HEADER:
+            length_offset = len(PasswordManager.LP_HEADER) + len(PasswordManager.LP_SEPARATOR)
+            if view[len(PasswordManager.LP_HEADER):length_offset] != PasswordManager.LP_SEPARATOR:
+                raise ValueError("Invalid .lp file format. Corrupted file.")
+            if len(view) < PasswordManager.LP_PREFIX_SIZE:
+                raise ValueError("Invalid .lp file format. File too short.")
+            (payload_len,) = PasswordManager.LP_LENGTH.unpack_from(view, length_offset)
+            payload_end = PasswordManager.LP_PREFIX_SIZE + payload_len
+            if payload_len == 0 or payload_end > len(view):
+                raise ValueError("Invalid .lp file format. File too short.")
+            return view[PasswordManager.LP_PREFIX_SIZE:payload_end]
         
-        # Create .lp file format with proprietary header
-        lp_header = b"LUCKEEPASS_BACKUP_V1.0"
-        lp_separator = b"\x00\xFF\x00\xFF"
+        if view[:len(PasswordManager.LP_HEADER_V1)] != PasswordManager.LP_HEADER_V1:
+            raise ValueError("Invalid .lp file format. This file was not created by LuckeePass.")
         
-        # Combine header, separator, and encrypted data
-        lp_data = lp_header + lp_separator + json_data.encode('utf-8')
+        # Version 1.0: find the separator, the payload runs to the end of the file
+        separator_pos = bytes(view[:PasswordManager.LP_PREFIX_SIZE]).find(PasswordManager.LP_SEPARATOR)
+        if separator_pos == -1:
+            raise ValueError("Invalid .lp file format. Corrupted file.")
         
-        return lp_data
+        payload_start = separator_pos + len(PasswordManager.LP_SEPARATOR)
+        if payload_start >= len(view):
+            raise ValueError("Invalid .lp file format. File too short.")
+        return view[payload_start:]
     
     @staticmethod
     def get_backup_info(file_path: str) -> dict:
         """Get metadata from a LuckeePass backup file."""
         try:
             with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            lp_header = b"LUCKEEPASS_BACKUP_V1.0"
-            lp_separator = b"\x00\xFF\x00\xFF"
-            
-            if not data.startswith(lp_header):
-                raise ValueError("Invalid .lp file format")
+                prefix = f.read(PasswordManager.LP_PREFIX_SIZE)
+                if prefix.startswith(PasswordManager.LP_HEADER) and len(prefix) == PasswordManager.LP_PREFIX_SIZE:
+                    # Skip straight past the payload to the summary trailer
+                    length_offset = len(PasswordManager.LP_HEADER) + len(PasswordManager.LP_SEPARATOR)
+                    (payload_len,) = PasswordManager.LP_LENGTH.unpack_from(prefix, length_offset)
+                    f.seek(payload_len, os.SEEK_CUR)
+                    summary = json.loads(f.read().decode('utf-8'))
+                    if summary.get('app_name') != 'LuckeePass':
+                        raise ValueError("Invalid .lp file format. This file was not created by LuckeePass.")
+                    return summary
             
-            separator_pos = data.find(lp_separator)
-            if separator_pos == -1:
-                raise ValueError("Invalid .lp file format")
-            
-            json_start = separator_pos + len(lp_separator)
-            if json_start >= len(data):
-                raise ValueError("Invalid .lp file format. File too short.")
-            
-            try:
-                json_data = data[json_start:].decode('utf-8')
-            except UnicodeDecodeError:
-                raise ValueError("Invalid .lp file format. Corrupted data encoding.")
-            
-            try:
-                backup_data = json.loads(json_data)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid .lp file format. Corrupted JSON data: {str(e)}")
+            # Version 1.0 files have no summary: map the file and parse the payload,
+            # so the OS pages in only what is parsed instead of copying the whole file
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                with PasswordManager._locate_payload(data) as payload:
+                    backup_data = PasswordManager._parse_payload(payload)
             
             # Verify app name
             if backup_data.get('app_name') != 'LuckeePass':
@@ -298,127 +713,146 @@ class PasswordManager:
         """Check if a file is a valid LuckeePass .lp backup file."""
         try:
             with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            lp_header = b"LUCKEEPASS_BACKUP_V1.0"
-            return data.startswith(lp_header)
+                return f.read(len(PasswordManager.LP_HEADER)) in (PasswordManager.LP_HEADER, PasswordManager.LP_HEADER_V1)
         except Exception:
             return False
     
+    def import_file(self, file_path: str) -> None:
+        """Import data from a .lp file on disk."""
+        with open(file_path, 'rb') as f:
+            # Map the file so the OS page cache owns the bytes instead of a copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as lp_data:
+                self.import_data(lp_data)
+    
     def import_data(self, lp_data: bytes) -> None:
         """Import data from .lp file format."""
-        # Check for .lp file header
-        lp_header = b"LUCKEEPASS_BACKUP_V1.0"
-        lp_separator = b"\x00\xFF\x00\xFF"
-        
-        if not lp_data.startswith(lp_header):
-            raise ValueError("Invalid .lp file format. This file was not created by LuckeePass.")
-        
-        # Find separator and extract JSON data
-        separator_pos = lp_data.find(lp_separator)
-        if separator_pos == -1:
-            raise ValueError("Invalid .lp file format. Corrupted file.")
-        
-        json_start = separator_pos + len(lp_separator)
-        if json_start >= len(lp_data):
-            raise ValueError("Invalid .lp file format. File too short.")
-        
-        try:
-            json_data = lp_data[json_start:].decode('utf-8')
-        except UnicodeDecodeError:
-            raise ValueError("Invalid .lp file format. Corrupted data encoding.")
-        
-        try:
-            data = json.loads(json_data)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid .lp file format. Corrupted JSON data: {str(e)}")
+        # Check the .lp header and extract the payload
+        with self._locate_payload(lp_data) as payload:
+            data = self._parse_payload(payload)
         
         # Verify app name
         if data.get('app_name') != 'LuckeePass':
             raise ValueError("Invalid .lp file format. This file was not created by LuckeePass.")
+        self._resolve_attachments(data)
         
         # Get the salt from the data file and create a new encryption manager
         if 'encryption_salt' in data:
-            import base64
-            salt = base64.b64decode(data['encryption_salt'])
-            # Create a new encryption manager with the salt from the data file
-            from .encryption_manager import EncryptionManager
-            self.encryption_manager = EncryptionManager(self.master_password, salt=salt)
+            salt = data['encryption_salt']
+            if not isinstance(salt, bytes):  # JSON files store the salt as base64
+                salt = base64.b64decode(salt)
+            # Files written before the 'kdf'/'cipher' fields existed use PBKDF2-SHA256 and Fernet
+            kdf = data.get('kdf', KDF_PBKDF2_SHA256)
+            cipher = data.get('cipher', CIPHER_FERNET)
+            # Only re-key when the file was written with a different salt, KDF or cipher
+            if (salt != self.encryption_manager.get_salt()
+                    or kdf != self.encryption_manager.get_kdf()
+                    or cipher != self.encryption_manager.get_cipher()):
+                try:
+                    self.encryption_manager = EncryptionManager(self.master_password, salt=salt, kdf=kdf, cipher=cipher)
+                except ValueError as e:
+                    # A missing argon2-cffi or an unknown KDF/cipher, not a bad password
+                    raise UnsupportedVaultError(str(e)) from e
         
-        # Decrypt and load passwords
-        self.passwords = []
-        for entry_data in data.get('passwords', []):
-            try:
-                entry = entry_data.copy()
-                entry['password'] = self.encryption_manager.decrypt(entry['password'])
-                entry['notes'] = self.encryption_manager.decrypt(entry['notes'])
-                self.passwords.append(PasswordEntry.from_dict(entry))
-                self.categories.add(entry['category'])
-            except Exception as e:
-                print(f"Warning: Could not decrypt password entry '{entry_data.get('title', 'Unknown')}': {str(e)}")
-                print(f"  This might be due to a different master password or corrupted data.")
-                continue
+        # Version 1.0 files encrypt every field separately
+        per_field = data.get('version', '1.0') == '1.0'
+        compressed = data.get('compression', 'none') == 'zstd'
+        if compressed and zstandard is None:
+            # Checked up front: entries are only decompressed when first read, and the key check
+            # below would otherwise report this as a wrong password
+            raise UnsupportedVaultError("This .lp file requires zstd support (zstandard is not installed).")
         
-        # Decrypt and load notes
-        self.notes = []
-        for note_data in data.get('notes', []):
-            try:
-                note = note_data.copy()
-                note['content'] = self.encryption_manager.decrypt(note['content'])
-                self.notes.append(SecureNote.from_dict(note))
-                self.categories.add(note['category'])
-            except Exception as e:
-                print(f"Warning: Could not decrypt note '{note_data.get('title', 'Unknown')}': {str(e)}")
-                print(f"  This might be due to a different master password or corrupted data.")
-                continue
+        # Entries are only decrypted when first read, so check the key against one of them now
+        if not per_field:
+            sample = next((entry_data['_sec'] for section in self.SENSITIVE_FIELDS
+                           for entry_data in data.get(section, [])), None)
+            if sample is not None:
+                try:
+                    self._open_secret(self.encryption_manager, sample, None, compressed)
+                except Exception:
+                    raise ValueError("Could not decrypt the vault. The master password may be different or the data corrupted.")
         
-        # Decrypt and load cards
-        self.cards = []
-        for card_data in data.get('cards', []):
-            try:
-                card = card_data.copy()
-                card['card_number'] = self.encryption_manager.decrypt(card['card_number'])
-                card['cvv'] = self.encryption_manager.decrypt(card['cvv'])
-                card['notes'] = self.encryption_manager.decrypt(card['notes'])
-                self.cards.append(CardEntry.from_dict(card))
-                self.categories.add(card['category'])
-            except Exception as e:
-                print(f"Warning: Could not decrypt card entry '{card_data.get('title', 'Unknown')}': {str(e)}")
-                print(f"  This might be due to a different master password or corrupted data.")
-                continue
+        self.categories = ()
+        if per_field:
+            # Version 1.0 entries are decrypted now, on a thread pool; the cipher work runs in C
+            # and releases the GIL
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                self._set_loaded_entries({
+                    section: [(entry_data, executor.submit(self._decrypt_entry, section, entry_data).result)
+                              for entry_data in data.get(section, [])]
+                    for section in self.SENSITIVE_FIELDS
+                })
+        else:
+            # Building deferred entries is pure Python, so a thread pool would only add overhead
+            self._set_loaded_entries({
+                section: [(entry_data, partial(self._load_entry, section, entry_data, compressed))
+                          for entry_data in data.get(section, [])]
+                for section in self.SENSITIVE_FIELDS
+            })
+        self.rebuild_favorites()
+    
+    def _set_loaded_entries(self, pending: dict) -> None:
+        """Fill each entry list from (entry_data, load) pairs, skipping entries that fail to load."""
+        for section, loaders in pending.items():
+            entries = []
+            for entry_data, load in loaders:
+                try:
+                    entry = load()
+                except Exception as e:
+                    print(f"Warning: Could not decrypt {self.ENTRY_TYPES[section][1]} '{entry_data.get('title', 'Unknown')}': {str(e)}")
+                    print(f"  This might be due to a different master password or corrupted data.")
+                    continue
+                entries.append(entry)
+                self._count_category(entry)
+            setattr(self, section, entries)
+    
+    def _load_entry(self, section: str, entry_data: dict, compressed: bool = False):
+        """Build the model object for one stored entry with a '_sec' blob.
         
-        # Decrypt and load identities
-        self.identities = []
-        for identity_data in data.get('identities', []):
-            try:
-                identity = identity_data.copy()
-                identity['social_security_number'] = self.encryption_manager.decrypt(identity['social_security_number'])
-                identity['driver_license'] = self.encryption_manager.decrypt(identity['driver_license'])
-                identity['passport_number'] = self.encryption_manager.decrypt(identity['passport_number'])
-                identity['notes'] = self.encryption_manager.decrypt(identity['notes'])
-                self.identities.append(IdentityEntry.from_dict(identity))
-                self.categories.add(identity['category'])
-            except Exception as e:
-                print(f"Warning: Could not decrypt identity entry '{identity_data.get('title', 'Unknown')}': {str(e)}")
-                print(f"  This might be due to a different master password or corrupted data.")
-                continue
+        The blob is decrypted on first access to a sensitive field rather than here.
+        """
+        fields = self.SENSITIVE_FIELDS[section]
+        # entry_data comes from the freshly parsed payload, so it is safe to modify in place
+        entry = entry_data
+        secret = entry.pop('_sec')
+        chunks = entry.pop('file_chunks', None)
+        for field in fields:
+            entry[field] = ''
+        model = self.ENTRY_TYPES[section][0].from_dict(entry)
+        encryption_manager = self.encryption_manager
+        model.defer_fields(
+            fields,
+            lambda: self._open_secret(encryption_manager, secret, chunks, compressed),
+            {'encryption_manager': encryption_manager, 'compressed': compressed,
+             '_sec': secret, 'file_chunks': chunks},
+        )
+        return model
+    
+    def _decrypt_entry(self, section: str, entry_data: dict):
+        """Build the model object for one version 1.0 entry, decrypting it up front.
         
-        # Decrypt and load files
-        self.files = []
-        for file_data in data.get('files', []):
-            try:
-                file = file_data.copy()
-                # Decrypt the file data (it's stored as encrypted base64)
-                encrypted_file_data = self.encryption_manager.decrypt(file['file_data'])
-                file['file_data'] = encrypted_file_data  # This is now base64-encoded decrypted data
-                file['notes'] = self.encryption_manager.decrypt(file['notes'])
-                self.files.append(FileEntry.from_dict(file))
-                self.categories.add(file['category'])
-            except Exception as e:
-                print(f"Warning: Could not decrypt file '{file_data.get('title', 'Unknown')}': {str(e)}")
-                print(f"  This might be due to a different master password or corrupted data.")
-                continue
+        Version 1.0 files keep file contents base64-encoded inside the encrypted fields.
+        """
+        entry = self._decrypt_fields(entry_data, self.SENSITIVE_FIELDS[section])
+        return self.ENTRY_TYPES[section][0].from_dict(entry)
 
+    def _open_secret(self, encryption_manager: EncryptionManager, secret, chunks: Optional[list],
+                     compressed: bool) -> dict:
+        """Decrypt the '_sec' blob (and file chunks) of an entry loaded by _load_entry."""
+        if isinstance(secret, bytes):  # Raw token from a MessagePack file
+            secret = encryption_manager.decrypt_bytes(secret)
+        else:
+            secret = encryption_manager.decrypt_token(secret)
+        values = self._load_json(self._decompress(secret) if compressed else secret)
+        if chunks is not None:
+            file_data = encryption_manager.decrypt_chunks(
+                [chunk if isinstance(chunk, bytes) else base64.b64decode(chunk) for chunk in chunks]
+            )
+            values['file_data'] = self._decompress(file_data) if compressed else file_data
+        elif 'file_data' in values:
+            # Older files keep file contents base64-encoded inside the encrypted fields
+            values['file_data'] = base64.b64decode(values['file_data'])
+        return values
+    
     def clear_all_data(self) -> None:
         """Clear all passwords, notes, cards, and identities and save empty data."""
         self.passwords = []
@@ -427,33 +861,8 @@ class PasswordManager:
         self.identities = []
         self.files = []
         self.categories = set()
+        self._favorites = []
         try:
             self.save_data()
         except Exception as e:
             print(f"Error clearing data: {str(e)}")
-
-    @property
-    def favorites(self):
-        """Return a list of all favorited items with a type attribute for display in the favorites table."""
-        favs = []
-        for entry in self.passwords:
-            if getattr(entry, 'is_favorite', False):
-                entry.type = "Password"
-                favs.append(entry)
-        for note in self.notes:
-            if getattr(note, 'is_favorite', False):
-                note.type = "Secure Note"
-                favs.append(note)
-        for card in self.cards:
-            if getattr(card, 'is_favorite', False):
-                card.type = "Card"
-                favs.append(card)
-        for identity in self.identities:
-            if getattr(identity, 'is_favorite', False):
-                identity.type = "Identity"
-                favs.append(identity)
-        for file in self.files:
-            if getattr(file, 'is_favorite', False):
-                file.type = "File"
-                favs.append(file)
-        return favs 
\ No newline at end of file
@@ -4,83 +4,235 @@ Handles user authentication and master password management.
 """
 
 import os
+import sys
+import math
+import time
+import ctypes
+import hmac
+import hashlib
+from functools import cached_property, lru_cache
 import bcrypt
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from src.utils.resource_path import get_appdata_path
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    # Same parameters as the vault key derivation in encryption_manager
+    _password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=4)
+except ImportError:  # argon2-cffi is optional; master passwords then use bcrypt
+    _password_hasher = None
+
+ARGON2_PREFIX = b"$argon2"
+
+# bcrypt cost range for _bcrypt_rounds(); 12 is the bcrypt library's default
+BCRYPT_MIN_ROUNDS = 12
+BCRYPT_MAX_ROUNDS = 14
+BCRYPT_TARGET_SECONDS = 0.25
+
+
+def _write_private_file(path: str, data: bytes) -> None:
+    """Write a small file readable only by its owner and flush it to disk before returning."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o600)  # Also tighten files created before this mode was used
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=1)
+def _bcrypt_rounds() -> int:
+    """Pick a bcrypt cost that takes about BCRYPT_TARGET_SECONDS on this machine.
+    
+    Measured once per process with a cost-10 hash; each extra round doubles the time.
+    """
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(10))
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    rounds = 10 + int(math.log2(BCRYPT_TARGET_SECONDS / elapsed))
+    return min(max(rounds, BCRYPT_MIN_ROUNDS), BCRYPT_MAX_ROUNDS)
+
+
+def _wipe(data: bytes) -> None:
+    """Overwrite the contents of a bytes object created from a password.
+    
+    Only the encoded copy made here can be wiped; the caller's str and any copies made
+    inside the hashing libraries are out of reach.
+    """
+    # Zero- and one-byte bytes objects are shared singletons in CPython
+    if sys.implementation.name == 'cpython' and len(data) > 1:
+        ctypes.memset(id(data) + sys.getsizeof(b'') - 1, 0, len(data))
+
 
 class UserManager:
     """Handles user authentication and master password management."""
     
+    VERIFY_CACHE_SIZE = 4
+    _DUMMY_HASH = None  # Hash of a random password, for timing-equivalent checks
+    
     def __init__(self):
-        self.hashed_master_password = None
-        self.vault_salt = None
+        # Recent verification results, keyed by an HMAC of the candidate under a per-process key
+        self._verify_key = os.urandom(32)
+        self._verify_cache: Dict[bytes, bool] = {}
+        # Hashed here rather than on first use so that no verification pays for it
+        if UserManager._DUMMY_HASH is None:
+            UserManager._DUMMY_HASH = self._hash_password(os.urandom(16))
         
         # File paths
         self.master_password_file = get_appdata_path("luckeepass_master.dat")
         self.vault_salt_file = get_appdata_path("luckeepass_vault_salt.dat")
-        
-        # Load existing data
-        self.hashed_master_password = self._load_master_password_hash()
-        self.vault_salt = self._load_vault_salt()
+    
+    @cached_property
+    def hashed_master_password(self) -> Optional[bytes]:
+        """The stored master password hash, read from disk on first access."""
+        return self._load_master_password_hash()
+    
+    @cached_property
+    def vault_salt(self) -> Optional[bytes]:
+        """The stored vault salt, read from disk on first access."""
+        return self._load_vault_salt()
+    
+    def _forget_loaded_data(self) -> None:
+        """Drop the cached hash and salt so they are read from disk again when next used."""
+        self.__dict__.pop('hashed_master_password', None)
+        self.__dict__.pop('vault_salt', None)
     
     def _load_master_password_hash(self) -> Optional[bytes]:
         """Load the master password hash from file."""
-        if os.path.exists(self.master_password_file):
-            try:
-                with open(self.master_password_file, 'rb') as f:
-                    return f.read()
-            except Exception as e:
-                print(f"Error loading master password hash: {e}")
+        try:
+            with open(self.master_password_file, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading master password hash: {e}")
         return None
 
     def _save_master_password_hash(self, hashed_password: bytes) -> None:
         """Save the master password hash to file."""
         try:
-            with open(self.master_password_file, 'wb') as f:
-                f.write(hashed_password)
+            _write_private_file(self.master_password_file, hashed_password)
         except Exception as e:
             print(f"Error saving master password hash: {e}")
 
     def _load_vault_salt(self) -> Optional[bytes]:
         """Load the vault salt from file."""
-        if os.path.exists(self.vault_salt_file):
-            try:
-                with open(self.vault_salt_file, 'rb') as f:
-                    return f.read()
-            except Exception as e:
-                print(f"Error loading vault salt: {e}")
+        try:
+            with open(self.vault_salt_file, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading vault salt: {e}")
         return None
 
     def _save_vault_salt(self, salt: bytes) -> None:
         """Save the vault salt to file."""
         try:
-            with open(self.vault_salt_file, 'wb') as f:
-                f.write(salt)
+            _write_private_file(self.vault_salt_file, salt)
             self.vault_salt = salt
         except Exception as e:
             print(f"Error saving vault salt: {e}")
 
     def set_master_password(self, master_password: str) -> None:
         """Set the master password."""
-        hashed = bcrypt.hashpw(master_password.encode(), bcrypt.gensalt())
+        password = master_password.encode()
+        try:
+            hashed = self._hash_password(password)
+        finally:
+            _wipe(password)
         self._save_master_password_hash(hashed)
+        self.hashed_master_password = hashed
+        self._verify_cache.clear()
+
+        self._ensure_vault_salt()
 
-        # Generate a new vault salt if one doesn't exist
+    def _ensure_vault_salt(self) -> None:
+        """Generate and save a vault salt, unless one already exists.
+        
+        The salt file is read again first, and an existing but unreadable file is never
+        overwritten: replacing the salt would make the vault undecryptable.
+        """
         if self.vault_salt is None:
-            import os
-            new_salt = os.urandom(16)
-            self._save_vault_salt(new_salt)
+            self.vault_salt = self._load_vault_salt()
+        if self.vault_salt is None and not os.path.exists(self.vault_salt_file):
+            self._save_vault_salt(os.urandom(16))
 
-    def verify_master_password(self, master_password: str) -> bool:
-        """Verify the master password."""
-        if not self.hashed_master_password:
-            return False  # No master password set yet
+    def verify_master_password(self, master_password: Union[str, bytes, bytearray]) -> bool:
+        """Verify the master password, given as text or as UTF-8 encoded bytes.
+        
+        A bytearray lets the caller wipe its copy of the password once this returns.
+        When no master password is set, or the stored hash is unreadable, a dummy hash is
+        checked instead so that those cases take as long as a real mismatch.
+        """
+        if isinstance(master_password, str):
+            candidate = master_password.encode()
+        else:
+            # bcrypt only accepts bytes; copy through a bytearray so that the object wiped
+            # below is never the caller's own (bytes(b) returns b itself)
+            candidate = bytes(bytearray(master_password))
         try:
-            return bcrypt.checkpw(master_password.encode(), self.hashed_master_password)
+            return self._verify(candidate)
+        finally:
+            _wipe(candidate)
+
+    def _verify(self, candidate: bytes) -> bool:
+        """Verify an encoded candidate master password (see verify_master_password)."""
+        cache_key = hmac.new(self._verify_key, candidate, hashlib.sha256).digest()
+        if cache_key in self._verify_cache:
+            return self._verify_cache[cache_key]
+        hashed = self.hashed_master_password
+        try:
+            result = self._check_password(candidate, hashed or self._DUMMY_HASH)
         except ValueError as e:
             print(f"Warning: Stored master password hash is invalid: {e}. Please reset your password.")
+            self._check_password(candidate, self._DUMMY_HASH)
+            return False
+        if not hashed:
+            return False  # No master password set yet
+        if result and self._needs_rehash(hashed):
+            # Transparently upgrade bcrypt (or outdated Argon2) hashes once the password is known
+            self.hashed_master_password = self._hash_password(candidate)
+            self._save_master_password_hash(self.hashed_master_password)
+        if len(self._verify_cache) >= self.VERIFY_CACHE_SIZE:
+            del self._verify_cache[next(iter(self._verify_cache))]  # Evict the oldest result
+        self._verify_cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _hash_password(password: bytes) -> bytes:
+        """Hash a master password with Argon2id, or bcrypt when argon2-cffi is missing."""
+        if _password_hasher is not None:
+            return _password_hasher.hash(password).encode()
+        return bcrypt.hashpw(password, bcrypt.gensalt(rounds=_bcrypt_rounds()))
+
+    @staticmethod
+    def _check_password(password: bytes, hashed: bytes) -> bool:
+        """Check a password against an Argon2id or bcrypt hash."""
+        if not hashed.startswith(ARGON2_PREFIX):
+            return bcrypt.checkpw(password, hashed)
+        if _password_hasher is None:
+            raise ValueError("Argon2 support (argon2-cffi) is not installed")
+        try:
+            return _password_hasher.verify(hashed.decode(), password)
+        except VerificationError:
+            return False
+        except InvalidHashError as e:
+            raise ValueError(str(e))
+
+    @staticmethod
+    def _needs_rehash(hashed: bytes) -> bool:
+        """Check whether a stored hash should be replaced with a current Argon2id hash."""
+        if _password_hasher is None:
             return False
+        if not hashed.startswith(ARGON2_PREFIX):
+            return True
+        return _password_hasher.check_needs_rehash(hashed.decode())
 
     def get_vault_salt(self) -> Optional[bytes]:
         """Get the vault salt for encryption."""
@@ -92,7 +244,8 @@ class UserManager:
 
     def delete_user_data(self):
         """Delete all user data files (master password, vault salt, and vault data)."""
-        import os
+        self._verify_cache.clear()
+        self._forget_loaded_data()
         try:
             if os.path.exists(self.master_password_file):
                 os.remove(self.master_password_file)
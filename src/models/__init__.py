@@ -3,6 +3,6 @@ from .password_entry import PasswordEntry
 from .secure_note import SecureNote
 from .card_entry import CardEntry
 from .identity_entry import IdentityEntry
-from .file_entry import FileEntry
+from .file_entry import FileEntry, FileKind
 
-__all__ = ['PasswordEntry', 'SecureNote', 'CardEntry', 'IdentityEntry', 'FileEntry'] 
\ No newline at end of file
+__all__ = ['PasswordEntry', 'SecureNote', 'CardEntry', 'IdentityEntry', 'FileEntry', 'FileKind'] 
\ No newline at end of file
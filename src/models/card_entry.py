@@ -3,65 +3,64 @@ Card Entry Model
 Represents a credit/debit card entry with metadata.
 """
 
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Dict, List, Optional
 from .file_entry import FileEntry
+from .lazy_fields import LazyFieldsMixin
 
 
-class CardEntry:
+_CARD_KEYS = ('title', 'card_type', 'card_number', 'cardholder_name', 'expiry_month',
+              'expiry_year', 'cvv', 'notes', 'category', 'is_favorite', 'created',
+              'modified')
+_get_card_fields = attrgetter(*_CARD_KEYS)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class CardEntry(LazyFieldsMixin):
     """Represents a credit/debit card entry with metadata."""
     
-    def __init__(self, title: str, card_type: str, card_number: str, 
-                 cardholder_name: str, expiry_month: str, expiry_year: str,
-                 cvv: str = "", notes: str = "", category: str = "Cards",
-                 is_favorite: bool = False, attached_files: Optional[List[FileEntry]] = None):
-        self.title = title
-        self.card_type = card_type  # Visa, Mastercard, Amex, etc.
-        self.card_number = card_number
-        self.cardholder_name = cardholder_name
-        self.expiry_month = expiry_month
-        self.expiry_year = expiry_year
-        self.cvv = cvv
-        self.notes = notes
-        self.category = category
-        self.is_favorite = is_favorite
-        self.attached_files = attached_files or []
-        self.created = datetime.now().isoformat()
-        self.modified = self.created
+    title: str
+    card_type: str  # Visa, Mastercard, Amex, etc.
+    card_number: str
+    cardholder_name: str
+    expiry_month: str
+    expiry_year: str
+    cvv: str = ""
+    notes: str = ""
+    category: str = "Cards"
+    is_favorite: bool = False
+    attached_files: Optional[List[FileEntry]] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    type: Optional[str] = field(default=None, init=False)  # Display label set by PasswordManager for favorites
+    
+    def __post_init__(self):
+        self.category = sys.intern(self.category) if isinstance(self.category, str) else self.category
+        self.card_type = sys.intern(self.card_type) if isinstance(self.card_type, str) else self.card_type
+        self.attached_files = self.attached_files or []
+        self.created = self.created or datetime.now().isoformat()
+        self.modified = self.modified or self.created
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage."""
-        return {
-            'title': self.title,
-            'card_type': self.card_type,
-            'card_number': self.card_number,
-            'cardholder_name': self.cardholder_name,
-            'expiry_month': self.expiry_month,
-            'expiry_year': self.expiry_year,
-            'cvv': self.cvv,
-            'notes': self.notes,
-            'category': self.category,
-            'is_favorite': self.is_favorite,
-            'attached_files': [file_entry.to_dict() for file_entry in self.attached_files],
-            'created': self.created,
-            'modified': self.modified
-        }
+    def to_dict(self, binary: bool = False) -> Dict:
+        """Convert to dictionary for storage (binary keeps attached file contents as bytes)."""
+        data = dict(zip(_CARD_KEYS, _get_card_fields(self)))
+        data['attached_files'] = [file_entry.to_dict(binary) for file_entry in self.attached_files]
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'CardEntry':
         """Create from dictionary."""
         # Convert attached files from dict to FileEntry objects
-        attached_files = []
-        if 'attached_files' in data:
-            for file_data in data['attached_files']:
-                attached_files.append(FileEntry.from_dict(file_data))
+        attached_files = [FileEntry.from_dict(file_data) for file_data in data.get('attached_files', ())]
         
         entry = cls(
             data['title'], data['card_type'], data['card_number'],
             data['cardholder_name'], data['expiry_month'], data['expiry_year'],
             data.get('cvv', ''), data.get('notes', ''), data.get('category', 'Cards'),
-            data.get('is_favorite', False), attached_files
+            data.get('is_favorite', False), attached_files,
+            data.get('created'), data.get('modified')
         )
-        entry.created = data.get('created', datetime.now().isoformat())
-        entry.modified = data.get('modified', entry.created)
         return entry 
\ No newline at end of file
@@ -3,48 +3,129 @@ File Entry Model
 Represents a file entry with metadata and encrypted file data.
 """
 
+import hashlib
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import IntEnum
+from operator import attrgetter
 from typing import Dict, Optional
-import base64
+try:
+    import pybase64 as base64  # SIMD base64, a drop-in replacement for the stdlib module
+except ImportError:
+    import base64
+from .lazy_fields import LazyFieldsMixin
 
 
-class FileEntry:
+_FILE_KEYS = ('title', 'file_name', 'file_type', 'file_size', 'category', 'notes',
+              'is_favorite', 'created', 'modified')
+_get_file_fields = attrgetter(*_FILE_KEYS)
+
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp', 'svg'})
+DOCUMENT_EXTENSIONS = frozenset({'pdf', 'doc', 'docx', 'txt', 'rtf', 'odt', 'pages'})
+ARCHIVE_EXTENSIONS = frozenset({'zip', 'rar', '7z', 'tar', 'gz', 'bz2'})
+
+
+class FileKind(IntEnum):
+    """Broad kind of a file, from its extension."""
+    
+    OTHER = 0
+    IMAGE = 1
+    DOCUMENT = 2
+    ARCHIVE = 3
+
+
+_EXTENSION_KINDS = {
+    **dict.fromkeys(IMAGE_EXTENSIONS, FileKind.IMAGE),
+    **dict.fromkeys(DOCUMENT_EXTENSIONS, FileKind.DOCUMENT),
+    **dict.fromkeys(ARCHIVE_EXTENSIONS, FileKind.ARCHIVE),
+}
+
+# (unit, divisor) indexed by the size's power of 1024
+_SIZE_UNITS = (('B', 1), ('KB', 1024), ('MB', 1024 * 1024), ('GB', 1024 * 1024 * 1024))
+
+
+def format_file_size(size_bytes: int) -> str:
+    """Format a size in bytes as B, KB, MB or GB."""
+    index = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    if index == 0:
+        return f"{size_bytes} B"
+    unit, divisor = _SIZE_UNITS[index]
+    return f"{size_bytes / divisor:.1f} {unit}"
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class FileEntry(LazyFieldsMixin):
     """Represents a file entry with metadata and encrypted file data."""
     
-    def __init__(self, title: str, file_data: bytes, file_name: str, 
-                 file_type: str = "", file_size: int = 0, category: str = "Files",
-                 notes: str = "", is_favorite: bool = False):
-        self.title = title
-        self.file_data = file_data  # Raw file data (will be encrypted)
-        self.file_name = file_name  # Original filename
-        self.file_type = file_type  # File extension/type
-        self.file_size = file_size  # File size in bytes
-        self.category = category
-        self.notes = notes
-        self.is_favorite = is_favorite
-        self.created = datetime.now().isoformat()
-        self.modified = self.created
-    
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage."""
-        return {
-            'title': self.title,
-            'file_data': base64.b64encode(self.file_data).decode('utf-8'),  # Encode as base64
-            'file_name': self.file_name,
-            'file_type': self.file_type,
-            'file_size': self.file_size,
-            'category': self.category,
-            'notes': self.notes,
-            'is_favorite': self.is_favorite,
-            'created': self.created,
-            'modified': self.modified
-        }
+    _LAZY_PLACEHOLDERS = {'file_data': b''}
+    
+    title: str
+    file_data: bytes  # Raw file data (will be encrypted)
+    file_name: str  # Original filename
+    file_type: str = ""  # File extension/type
+    file_size: int = 0  # File size in bytes
+    category: str = "Files"
+    notes: str = ""
+    is_favorite: bool = False
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    type: Optional[str] = field(default=None, init=False)  # Display label set by PasswordManager for favorites
+    _encoded: Optional[tuple] = field(default=None, init=False)  # (file_data, base64 text) from the last to_dict
+    _digest: Optional[tuple] = field(default=None, init=False)  # (file_data, hex SHA-256) from the last content_hash
+    _kind: Optional[tuple] = field(default=None, init=False)  # (file_name, FileKind) from the last kind lookup
+    _size_text: Optional[tuple] = field(default=None, init=False)  # (file_size, text) from the last get_file_size_formatted
+    _thumbnail: Optional[tuple] = field(default=None, init=False)  # (file_data, PNG preview); never stored in the vault
+    
+    def __post_init__(self):
+        self.category = sys.intern(self.category) if isinstance(self.category, str) else self.category
+        self.file_type = sys.intern(self.file_type) if isinstance(self.file_type, str) else self.file_type
+        self.created = self.created or datetime.now().isoformat()
+        self.modified = self.modified or self.created
+    
+    def to_dict(self, binary: bool = False) -> Dict:
+        """Convert to dictionary for storage.
+        
+        File contents are base64-encoded for JSON, or kept as raw bytes when binary is set
+        (for binary containers such as MessagePack).
+        """
+        data = dict(zip(_FILE_KEYS, _get_file_fields(self)))
+        data['file_data'] = self.file_data if binary else self._encode_file_data()
+        return data
+    
+    def _encode_file_data(self) -> str:
+        """Return file_data as base64 text, reusing the last result while file_data is unchanged."""
+        # Holding the bytes object in the cache keeps the identity check valid
+        if self._encoded is None or self._encoded[0] is not self.file_data:
+            self._encoded = (self.file_data, base64.b64encode(self.file_data).decode('utf-8'))
+        return self._encoded[1]
+    
+    def content_hash(self) -> str:
+        """Return the hex SHA-256 of file_data, reusing the last result while file_data is unchanged."""
+        if self._digest is None or self._digest[0] is not self.file_data:
+            # One update call over the whole buffer: OpenSSL hashes it in C without the GIL
+            digest = hashlib.sha256(self.file_data, usedforsecurity=False).hexdigest()
+            self._digest = (self.file_data, digest)
+        return self._digest[1]
+    
+    @property
+    def thumbnail_png(self) -> Optional[bytes]:
+        """PNG preview image set by the UI, or None if there is none for the current file_data."""
+        if self._thumbnail is None or self._thumbnail[0] is not self.file_data:
+            return None
+        return self._thumbnail[1]
+    
+    @thumbnail_png.setter
+    def thumbnail_png(self, png: Optional[bytes]) -> None:
+        self._thumbnail = None if png is None else (self.file_data, png)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'FileEntry':
         """Create from dictionary."""
-        # Decode base64 file data back to bytes
-        file_data = base64.b64decode(data['file_data'])
+        # Decode base64 file data back to bytes (binary containers store raw bytes)
+        file_data = data['file_data']
+        if not isinstance(file_data, bytes):
+            file_data = base64.b64decode(file_data)
         
         entry = cls(
             data['title'],
@@ -54,40 +135,40 @@ class FileEntry:
             data.get('file_size', 0),
             data.get('category', 'Files'),
             data.get('notes', ''),
-            data.get('is_favorite', False)
+            data.get('is_favorite', False),
+            data.get('created'), data.get('modified')
         )
-        entry.created = data.get('created', datetime.now().isoformat())
-        entry.modified = data.get('modified', entry.created)
+        if 'file_hash' in data:
+            # Attachment read from a vault's shared table, whose key is this data's SHA-256
+            entry._digest = (file_data, data['file_hash'])
         return entry
     
     def get_file_extension(self) -> str:
         """Get file extension from filename."""
-        if '.' in self.file_name:
-            return self.file_name.split('.')[-1].lower()
-        return ""
+        _, dot, extension = self.file_name.rpartition('.')
+        return extension.lower() if dot else ""
     
     def get_file_size_formatted(self) -> str:
         """Get formatted file size string."""
-        if self.file_size < 1024:
-            return f"{self.file_size} B"
-        elif self.file_size < 1024 * 1024:
-            return f"{self.file_size / 1024:.1f} KB"
-        elif self.file_size < 1024 * 1024 * 1024:
-            return f"{self.file_size / (1024 * 1024):.1f} MB"
-        else:
-            return f"{self.file_size / (1024 * 1024 * 1024):.1f} GB"
+        if self._size_text is None or self._size_text[0] != self.file_size:
+            self._size_text = (self.file_size, format_file_size(self.file_size))
+        return self._size_text[1]
+    
+    @property
+    def kind(self) -> FileKind:
+        """The file's FileKind, looked up again only when file_name changes."""
+        if self._kind is None or self._kind[0] is not self.file_name:
+            self._kind = (self.file_name, _EXTENSION_KINDS.get(self.get_file_extension(), FileKind.OTHER))
+        return self._kind[1]
     
     def is_image(self) -> bool:
         """Check if file is an image."""
-        image_extensions = {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp', 'svg'}
-        return self.get_file_extension() in image_extensions
+        return self.kind is FileKind.IMAGE
     
     def is_document(self) -> bool:
         """Check if file is a document."""
-        document_extensions = {'pdf', 'doc', 'docx', 'txt', 'rtf', 'odt', 'pages'}
-        return self.get_file_extension() in document_extensions
+        return self.kind is FileKind.DOCUMENT
     
     def is_archive(self) -> bool:
         """Check if file is an archive."""
-        archive_extensions = {'zip', 'rar', '7z', 'tar', 'gz', 'bz2'}
-        return self.get_file_extension() in archive_extensions 
\ No newline at end of file
+        return self.kind is FileKind.ARCHIVE 
\ No newline at end of file
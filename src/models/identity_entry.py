@@ -3,75 +3,70 @@ Identity Entry Model
 Represents an identity entry with personal information.
 """
 
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Dict, List, Optional
 from .file_entry import FileEntry
+from .lazy_fields import LazyFieldsMixin
 
 
-class IdentityEntry:
+_IDENTITY_KEYS = ('title', 'first_name', 'last_name', 'email', 'phone', 'address', 'city',
+                  'state', 'zip_code', 'country', 'date_of_birth', 'social_security_number',
+                  'driver_license', 'passport_number', 'notes', 'category', 'is_favorite',
+                  'created', 'modified')
+_get_identity_fields = attrgetter(*_IDENTITY_KEYS)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class IdentityEntry(LazyFieldsMixin):
     """Represents an identity entry with personal information."""
     
-    def __init__(self, title: str, first_name: str, last_name: str, 
-                 email: str = "", phone: str = "", address: str = "",
-                 city: str = "", state: str = "", zip_code: str = "",
-                 country: str = "", date_of_birth: str = "", 
-                 social_security_number: str = "", driver_license: str = "",
-                 passport_number: str = "", notes: str = "", category: str = "Identity",
-                 is_favorite: bool = False, attached_files: Optional[List[FileEntry]] = None):
-        self.title = title
-        self.first_name = first_name
-        self.last_name = last_name
-        self.email = email
-        self.phone = phone
-        self.address = address
-        self.city = city
-        self.state = state
-        self.zip_code = zip_code
-        self.country = country
-        self.date_of_birth = date_of_birth
-        self.social_security_number = social_security_number
-        self.driver_license = driver_license
-        self.passport_number = passport_number
-        self.notes = notes
-        self.category = category
-        self.is_favorite = is_favorite
-        self.attached_files = attached_files or []
-        self.created = datetime.now().isoformat()
-        self.modified = self.created
+    title: str
+    first_name: str
+    last_name: str
+    email: str = ""
+    phone: str = ""
+    address: str = ""
+    city: str = ""
+    state: str = ""
+    zip_code: str = ""
+    country: str = ""
+    date_of_birth: str = ""
+    social_security_number: str = ""
+    driver_license: str = ""
+    passport_number: str = ""
+    notes: str = ""
+    category: str = "Identity"
+    is_favorite: bool = False
+    attached_files: Optional[List[FileEntry]] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    type: Optional[str] = field(default=None, init=False)  # Display label set by PasswordManager for favorites
+    
+    def __post_init__(self):
+        self.category = sys.intern(self.category) if isinstance(self.category, str) else self.category
+        self.attached_files = self.attached_files or []
+        self.created = self.created or datetime.now().isoformat()
+        self.modified = self.modified or self.created
+    
+    @property
+    def full_name(self) -> str:
+        """First and last name, as shown in the identities table."""
+        return f"{self.first_name} {self.last_name}".strip()
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage."""
-        return {
-            'title': self.title,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'phone': self.phone,
-            'address': self.address,
-            'city': self.city,
-            'state': self.state,
-            'zip_code': self.zip_code,
-            'country': self.country,
-            'date_of_birth': self.date_of_birth,
-            'social_security_number': self.social_security_number,
-            'driver_license': self.driver_license,
-            'passport_number': self.passport_number,
-            'notes': self.notes,
-            'category': self.category,
-            'is_favorite': self.is_favorite,
-            'attached_files': [file_entry.to_dict() for file_entry in self.attached_files],
-            'created': self.created,
-            'modified': self.modified
-        }
+    def to_dict(self, binary: bool = False) -> Dict:
+        """Convert to dictionary for storage (binary keeps attached file contents as bytes)."""
+        data = dict(zip(_IDENTITY_KEYS, _get_identity_fields(self)))
+        data['attached_files'] = [file_entry.to_dict(binary) for file_entry in self.attached_files]
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'IdentityEntry':
         """Create from dictionary."""
         # Convert attached files from dict to FileEntry objects
-        attached_files = []
-        if 'attached_files' in data:
-            for file_data in data['attached_files']:
-                attached_files.append(FileEntry.from_dict(file_data))
+        attached_files = [FileEntry.from_dict(file_data) for file_data in data.get('attached_files', ())]
         
         entry = cls(
             data['title'], data['first_name'], data['last_name'],
@@ -80,8 +75,7 @@ class IdentityEntry:
             data.get('country', ''), data.get('date_of_birth', ''),
             data.get('social_security_number', ''), data.get('driver_license', ''),
             data.get('passport_number', ''), data.get('notes', ''), data.get('category', 'Identity'),
-            data.get('is_favorite', False), attached_files
+            data.get('is_favorite', False), attached_files,
+            data.get('created'), data.get('modified')
         )
-        entry.created = data.get('created', datetime.now().isoformat())
-        entry.modified = data.get('modified', entry.created)
         return entry 
\ No newline at end of file
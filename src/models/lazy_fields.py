@@ -0,0 +1,76 @@
+"""
+Lazy Fields
+Lets a model defer loading some of its fields until they are first read.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+
+class LazyFieldsMixin:
+    """Mixin for models whose sensitive fields are decrypted on first access."""
+    
+    __slots__ = ('_lazy',)
+    
+    # Stand-in values used by to_dict_deferred() for fields whose type is not str
+    _LAZY_PLACEHOLDERS: Dict[str, object] = {}
+    
+    def defer_fields(self, fields: Tuple[str, ...], loader: Callable[[], Dict],
+                     stored: Optional[Dict] = None) -> None:
+        """Remove fields from the instance and load them with loader() on first access.
+        
+        loader returns a dict of field values. stored is kept untouched for the owner
+        (e.g. the ciphertext the fields came from) and is available through
+        deferred_state() for as long as none of the fields has been read or assigned.
+        """
+        for field in fields:
+            if self._has_field(field):
+                delattr(self, field)
+        self._lazy = (fields, loader, stored)
+    
+    def deferred_state(self) -> Optional[Dict]:
+        """Return the stored state if no deferred field has been read or assigned yet."""
+        lazy = self._lazy_state()
+        if lazy is None or any(self._has_field(field) for field in lazy[0]):
+            return None
+        return lazy[2]
+    
+    def to_dict_deferred(self, binary: bool = False) -> Dict:
+        """Return to_dict() without the deferred fields, and without loading them."""
+        fields = self._lazy_state()[0]
+        for field in fields:
+            object.__setattr__(self, field, self._LAZY_PLACEHOLDERS.get(field, ''))
+        try:
+            data = self.to_dict(binary)
+        finally:
+            for field in fields:
+                object.__delattr__(self, field)
+        for field in fields:
+            data.pop(field, None)
+        return data
+    
+    def _lazy_state(self) -> Optional[tuple]:
+        try:
+            return object.__getattribute__(self, '_lazy')
+        except AttributeError:
+            return None
+    
+    def _has_field(self, name: str) -> bool:
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            return False
+        return True
+    
+    def __getattr__(self, name: str):
+        # Only reached when normal lookup fails, i.e. for deferred fields not loaded yet
+        lazy = self._lazy_state()
+        if lazy is None or name not in lazy[0]:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        fields, loader, _ = lazy
+        values = loader()
+        for field in fields:
+            # Fields assigned since loading was deferred keep their new value
+            if not self._has_field(field):
+                object.__setattr__(self, field, values.get(field, self._LAZY_PLACEHOLDERS.get(field, '')))
+        self._lazy = None
+        return object.__getattribute__(self, name)
\ No newline at end of file
@@ -3,47 +3,51 @@ Secure Note Model
 Represents a secure note.
 """
 
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Dict, List, Optional
 from .file_entry import FileEntry
+from .lazy_fields import LazyFieldsMixin
 
 
-class SecureNote:
+_NOTE_KEYS = ('title', 'content', 'category', 'is_favorite', 'created', 'modified')
+_get_note_fields = attrgetter(*_NOTE_KEYS)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class SecureNote(LazyFieldsMixin):
     """Represents a secure note."""
     
-    def __init__(self, title: str, content: str, category: str = "General",
-                 is_favorite: bool = False, attached_files: Optional[List[FileEntry]] = None):
-        self.title = title
-        self.content = content
-        self.category = category
-        self.is_favorite = is_favorite
-        self.attached_files = attached_files or []
-        self.created = datetime.now().isoformat()
-        self.modified = self.created
+    title: str
+    content: str
+    category: str = "General"
+    is_favorite: bool = False
+    attached_files: Optional[List[FileEntry]] = None
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    type: Optional[str] = field(default=None, init=False)  # Display label set by PasswordManager for favorites
+    
+    def __post_init__(self):
+        self.category = sys.intern(self.category) if isinstance(self.category, str) else self.category
+        self.attached_files = self.attached_files or []
+        self.created = self.created or datetime.now().isoformat()
+        self.modified = self.modified or self.created
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage."""
-        return {
-            'title': self.title,
-            'content': self.content,
-            'category': self.category,
-            'is_favorite': self.is_favorite,
-            'attached_files': [file_entry.to_dict() for file_entry in self.attached_files],
-            'created': self.created,
-            'modified': self.modified
-        }
+    def to_dict(self, binary: bool = False) -> Dict:
+        """Convert to dictionary for storage (binary keeps attached file contents as bytes)."""
+        data = dict(zip(_NOTE_KEYS, _get_note_fields(self)))
+        data['attached_files'] = [file_entry.to_dict(binary) for file_entry in self.attached_files]
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'SecureNote':
         """Create from dictionary."""
         # Convert attached files from dict to FileEntry objects
-        attached_files = []
-        if 'attached_files' in data:
-            for file_data in data['attached_files']:
-                attached_files.append(FileEntry.from_dict(file_data))
+        attached_files = [FileEntry.from_dict(file_data) for file_data in data.get('attached_files', ())]
         
         note = cls(data['title'], data['content'], data.get('category', 'General'),
-                   data.get('is_favorite', False), attached_files)
-        note.created = data.get('created', datetime.now().isoformat())
-        note.modified = data.get('modified', note.created)
+                   data.get('is_favorite', False), attached_files,
+                   data.get('created'), data.get('modified'))
         return note 
\ No newline at end of file
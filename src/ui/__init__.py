@@ -1,12 +1,17 @@
 # UI package for user interface components
-from .login_dialog import LoginDialog
-from .password_generator_dialog import PasswordGeneratorDialog
-from .password_entry_dialog import PasswordEntryDialog
-from .secure_note_dialog import SecureNoteDialog
-from .main_window import MainWindow
-from .welcome_dialog import WelcomeDialog
-from .welcome_back_dialog import WelcomeBackDialog
-from .startup_choice_dialog import StartupChoiceDialog
+import importlib
+
+# Public names and the modules defining them; each module is imported on first access
+_LAZY = {
+    'LoginDialog': '.login_dialog',
+    'PasswordGeneratorDialog': '.password_generator_dialog',
+    'PasswordEntryDialog': '.password_entry_dialog',
+    'SecureNoteDialog': '.secure_note_dialog',
+    'MainWindow': '.main_window',
+    'WelcomeDialog': '.welcome_dialog',
+    'WelcomeBackDialog': '.welcome_back_dialog',
+    'StartupChoiceDialog': '.startup_choice_dialog',
+}
 
 __all__ = [
     'LoginDialog', 
@@ -17,4 +22,16 @@ __all__ = [
     'WelcomeDialog',
     'WelcomeBackDialog',
     'StartupChoiceDialog'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -3,17 +3,28 @@ Card Entry Dialog
 Dialog for adding and editing card entries.
 """
 
+from contextlib import ExitStack
+
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QMessageBox, QComboBox, QFormLayout, QTextEdit, QCheckBox, QScrollArea, QWidget, QSizePolicy
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QSignalBlocker
 from PySide6.QtGui import QFont
 
 from ..models import CardEntry
 from .file_attachment_widget import FileAttachmentWidget
 from ..utils import apply_custom_title_bar
 
+_CARD_TYPES = ("Visa", "Mastercard", "American Express", "Discover", "Other")
+_MONTHS = tuple(f"{i:02d}" for i in range(1, 13))
+# Fixed rather than from today's date, so that older expiry years stay selectable
+_YEARS = tuple(str(i) for i in range(2024, 2024 + 21))
+# Combo box index of each choice, for load_card_data
+_CARD_TYPE_INDEX = {text: i for i, text in enumerate(_CARD_TYPES)}
+_MONTH_INDEX = {text: i for i, text in enumerate(_MONTHS)}
+_YEAR_INDEX = {text: i for i, text in enumerate(_YEARS)}
+
 
 class CardEntryDialog(QDialog):
     """Dialog for adding and editing card entries."""
@@ -21,11 +32,10 @@ class CardEntryDialog(QDialog):
     def __init__(self, card_entry: CardEntry = None, parent=None):
         super().__init__(parent)
         self.card_entry = card_entry
+        self._title_bar_applied = False
         self.setup_ui()
         if card_entry:
             self.load_card_data()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -35,7 +45,6 @@ class CardEntryDialog(QDialog):
         
         # Create scroll area for the form
         scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         scroll_area.setFrameShape(QScrollArea.NoFrame)
 
@@ -48,7 +57,7 @@ class CardEntryDialog(QDialog):
         # Card Information Section Header
         card_info_label = QLabel("Card Information")
         card_info_label.setFont(QFont("Arial", 12, QFont.Bold))
-        card_info_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
+        card_info_label.setProperty("heading", True)
         layout.addWidget(card_info_label)
         
         # Form layout
@@ -61,7 +70,7 @@ class CardEntryDialog(QDialog):
         
         # Card Type
         self.card_type_combo = QComboBox()
-        self.card_type_combo.addItems(["Visa", "Mastercard", "American Express", "Discover", "Other"])
+        self.card_type_combo.addItems(_CARD_TYPES)
         self.card_type_combo.setEditable(True)
         form_layout.addRow("Card Type:", self.card_type_combo)
         
@@ -78,15 +87,12 @@ class CardEntryDialog(QDialog):
         
         # Expiry Month
         self.expiry_month_combo = QComboBox()
-        months = [f"{i:02d}" for i in range(1, 13)]
-        self.expiry_month_combo.addItems(months)
+        self.expiry_month_combo.addItems(_MONTHS)
         form_layout.addRow("Expiry Month:", self.expiry_month_combo)
         
         # Expiry Year
         self.expiry_year_combo = QComboBox()
-        current_year = 2024
-        years = [str(i) for i in range(current_year, current_year + 21)]
-        self.expiry_year_combo.addItems(years)
+        self.expiry_year_combo.addItems(_YEARS)
         form_layout.addRow("Expiry Year:", self.expiry_year_combo)
         
         # CVV
@@ -113,20 +119,28 @@ class CardEntryDialog(QDialog):
         # File Attachments Section Header
         file_label = QLabel("File Attachments")
         file_label.setFont(QFont("Arial", 12, QFont.Bold))
-        file_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
+        file_label.setProperty("heading", True)
         layout.addWidget(file_label)
         
-        # File Attachments
-        self.file_attachment_widget = FileAttachmentWidget()
-        self.file_attachment_widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Minimum)
-        layout.addWidget(self.file_attachment_widget)
+        # File Attachments: a lightweight placeholder until files are shown or added
+        self.file_attachment_widget = None
+        self.file_placeholder = QWidget()
+        placeholder_layout = QHBoxLayout(self.file_placeholder)
+        placeholder_layout.setContentsMargins(0, 0, 0, 0)
+        placeholder_layout.addWidget(QLabel("Attached Files:"))
+        add_file_btn = QPushButton("Add File")
+        add_file_btn.clicked.connect(lambda: self._ensure_file_widget().add_file())
+        placeholder_layout.addWidget(add_file_btn)
+        layout.addWidget(self.file_placeholder)
         
         # Favorite Checkbox (below file attachments)
         self.favorite_checkbox = QCheckBox("Favorite")
         layout.addWidget(self.favorite_checkbox)
         
-        # Set the form widget as the scroll area's widget
+        # Set the form widget as the scroll area's widget only once it is complete,
+        # so the scroll area sizes it a single time
         scroll_area.setWidget(form_widget)
+        scroll_area.setWidgetResizable(True)
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -136,22 +150,10 @@ class CardEntryDialog(QDialog):
         button_layout = QHBoxLayout()
         self.save_btn = QPushButton("Save")
         self.save_btn.clicked.connect(self.handle_save)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078D7; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #005B9C; }
-        """)
+        self.save_btn.setObjectName("primaryBtn")
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6C757D; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #545B62; }
-        """)
+        self.cancel_btn.setObjectName("secondaryBtn")
         button_layout.addWidget(self.save_btn)
         button_layout.addWidget(self.cancel_btn)
         main_layout.addLayout(button_layout)
@@ -159,11 +161,20 @@ class CardEntryDialog(QDialog):
     
     def load_card_data(self):
         """Load existing card data into the form."""
-        if self.card_entry:
+        if not self.card_entry:
+            return
+        
+        # Nothing is listening for edits while the form is filled in
+        fields = (self.title_edit, self.card_type_combo, self.card_number_edit, self.cardholder_name_edit,
+                  self.expiry_month_combo, self.expiry_year_combo, self.cvv_edit, self.category_edit,
+                  self.notes_edit, self.favorite_checkbox)
+        with ExitStack() as stack:
+            for widget in fields:
+                stack.enter_context(QSignalBlocker(widget))
             self.title_edit.setText(self.card_entry.title)
             
             # Set card type
-            index = self.card_type_combo.findText(self.card_entry.card_type)
+            index = _CARD_TYPE_INDEX.get(self.card_entry.card_type, -1)
             if index >= 0:
                 self.card_type_combo.setCurrentIndex(index)
             else:
@@ -173,12 +184,12 @@ class CardEntryDialog(QDialog):
             self.cardholder_name_edit.setText(self.card_entry.cardholder_name)
             
             # Set expiry month
-            month_index = self.expiry_month_combo.findText(self.card_entry.expiry_month)
+            month_index = _MONTH_INDEX.get(self.card_entry.expiry_month, -1)
             if month_index >= 0:
                 self.expiry_month_combo.setCurrentIndex(month_index)
             
             # Set expiry year
-            year_index = self.expiry_year_combo.findText(self.card_entry.expiry_year)
+            year_index = _YEAR_INDEX.get(self.card_entry.expiry_year, -1)
             if year_index >= 0:
                 self.expiry_year_combo.setCurrentIndex(year_index)
             
@@ -186,10 +197,26 @@ class CardEntryDialog(QDialog):
             self.category_edit.setText(self.card_entry.category)
             self.notes_edit.setPlainText(self.card_entry.notes)
             self.favorite_checkbox.setChecked(self.card_entry.is_favorite)
-            
-            # Load attached files
-            if hasattr(self.card_entry, 'attached_files'):
-                self.file_attachment_widget.set_attached_files(self.card_entry.attached_files)
+        
+        # Load attached files
+        if getattr(self.card_entry, 'attached_files', None):
+            self._ensure_file_widget().set_attached_files(self.card_entry.attached_files)
+    
+    def _ensure_file_widget(self) -> FileAttachmentWidget:
+        """Replace the attachments placeholder with the real widget on first use."""
+        if self.file_attachment_widget is None:
+            self.file_attachment_widget = FileAttachmentWidget()
+            self.file_attachment_widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Minimum)
+            layout = self.file_placeholder.parentWidget().layout()
+            layout.replaceWidget(self.file_placeholder, self.file_attachment_widget)
+            self.file_placeholder.deleteLater()
+        return self.file_attachment_widget
+    
+    def get_attached_files(self):
+        """Return the dialog's attachments, without building the widget if it was never needed."""
+        if self.file_attachment_widget is not None:
+            return self.file_attachment_widget.get_files()
+        return list(getattr(self.card_entry, 'attached_files', None) or [])
     
     def handle_save(self):
         """Handle saving the card entry."""
@@ -238,7 +265,7 @@ class CardEntryDialog(QDialog):
             self.card_entry.category = category
             self.card_entry.notes = notes
             self.card_entry.is_favorite = is_favorite
-            self.card_entry.attached_files = self.file_attachment_widget.get_files()
+            self.card_entry.attached_files = self.get_attached_files()
         else:
             # Create new entry
             self.card_entry = CardEntry(
@@ -252,7 +279,7 @@ class CardEntryDialog(QDialog):
                 category=category,
                 notes=notes,
                 is_favorite=is_favorite,
-                attached_files=self.file_attachment_widget.get_files()
+                attached_files=self.get_attached_files()
             )
         
         self.accept() 
@@ -263,5 +290,7 @@ class CardEntryDialog(QDialog):
 
     def showEvent(self, event):
         super().showEvent(event)
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(100, self.customize_title_bar) 
\ No newline at end of file
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar() 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QApplication
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
 from ..utils import apply_custom_title_bar
@@ -22,7 +22,7 @@ class CustomMessageBox(QDialog):
             msg_layout.addWidget(icon_label, alignment=Qt.AlignTop)
         msg_label = QLabel(message)
         msg_label.setWordWrap(True)
-        msg_label.setStyleSheet("font-size: 15px; color: #dce6f2;")
+        msg_label.setObjectName("messageText")
         msg_layout.addWidget(msg_label)
         layout.addLayout(msg_layout)
 
@@ -36,6 +36,11 @@ class CustomMessageBox(QDialog):
         layout.addLayout(btn_layout)
 
         self.setLayout(layout)
-        # Apply custom title bar
-        QApplication.processEvents()
-        apply_custom_title_bar(self) 
\ No newline at end of file
+        self._title_bar_applied = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Apply custom title bar once, when the native window first exists
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            apply_custom_title_bar(self) 
\ No newline at end of file
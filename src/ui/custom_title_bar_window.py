@@ -3,7 +3,7 @@ Custom Title Bar Window
 Base class for windows with custom title bar styling.
 """
 
-from PySide6.QtWidgets import QMainWindow, QApplication
+from PySide6.QtWidgets import QMainWindow
 from PySide6.QtCore import Qt
 
 from ..utils import apply_custom_title_bar
@@ -14,16 +14,14 @@ class CustomTitleBarWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        
-        # Apply custom title bar after window is shown
-        QApplication.processEvents()
-        self.customize_title_bar()
+        self._title_bar_applied = False
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Delay title bar customization
-        QApplication.processEvents()
-        self.customize_title_bar()
+        # Apply custom title bar once, when the native window first exists
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
@@ -0,0 +1,174 @@
+"""
+Entry Table Models
+Read-only table models over the vault's entry lists, for the main window's tables.
+"""
+
+from typing import List, Optional
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.utils.formatting import format_card_number, format_phone_number
+
+# Shown for every password, so the table neither decrypts passwords nor reveals their length
+_PASSWORD_MASK = "••••••••"
+
+
+def _mask_card_number(card_number: str) -> str:
+    """Mask a card number except its last 4 digits, formatting the visible part."""
+    if not card_number or len(card_number) < 4:
+        return card_number
+    digits = ''.join(filter(str.isdigit, card_number))
+    if len(digits) > 4:
+        masked = '**** ' * ((len(digits) - 1) // 4)
+        display_number = f"{masked}{digits[-4:]}".strip()
+    else:
+        display_number = digits
+    return format_card_number(display_number)
+
+
+def _mask_phone(phone: str) -> str:
+    """Mask a phone number except its last 4 digits, formatting the visible part."""
+    if not phone or len(phone) < 4:
+        return phone
+    digits = ''.join(filter(str.isdigit, phone))
+    if len(digits) > 4:
+        masked = '*' * (len(digits) - 4) + digits[-4:]
+        # Format as ***-***-1234 if possible
+        display_phone = f"***-***-{masked[-4:]}" if len(masked) == 10 else masked
+    else:
+        display_phone = digits
+    return format_phone_number(display_phone)
+
+
+class EntryTableModel(QAbstractTableModel):
+    """Table model over a list of entries, one row per entry.
+    
+    Subclasses name their columns in HEADERS and format each cell in display_text. Cells
+    are only formatted when a view asks for them, i.e. for the rows it paints.
+    """
+    
+    HEADERS = ()
+    
+    def __init__(self, entries: Optional[List] = None, parent=None):
+        super().__init__(parent)
+        self.entries = entries if entries is not None else []
+    
+    def set_entries(self, entries: List):
+        """Show entries, which may be the list already shown after it has changed."""
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+    
+    def entry(self, row: int):
+        """Return the entry shown in row."""
+        return self.entries[row]
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.display_text(self.entries[index.row()], index.column())
+        if role == Qt.UserRole:
+            return self.entries[index.row()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def display_text(self, entry, column: int) -> str:
+        """Return the text shown for entry in column."""
+        raise NotImplementedError
+
+
+class PasswordTableModel(EntryTableModel):
+    """Table model over password entries."""
+    
+    HEADERS = ("Title", "Username", "Password", "URL", "Category", "Last Modified")
+    
+    def display_text(self, entry, column: int) -> str:
+        if column == 0:
+            return entry.title
+        if column == 1:
+            return entry.username
+        if column == 2:
+            return _PASSWORD_MASK
+        if column == 3:
+            return entry.url
+        if column == 4:
+            return entry.category
+        return entry.modified[:10]
+
+
+class NotesTableModel(EntryTableModel):
+    """Table model over secure notes."""
+    
+    HEADERS = ("Title", "Category", "Last Modified")
+    
+    def display_text(self, entry, column: int) -> str:
+        if column == 0:
+            return entry.title
+        if column == 1:
+            return entry.category
+        return entry.modified[:10]
+
+
+class CardsTableModel(EntryTableModel):
+    """Table model over card entries, with card numbers masked."""
+    
+    HEADERS = ("Title", "Card Type", "Card Number", "Cardholder", "Expiry", "Category", "Last Modified")
+    
+    def display_text(self, entry, column: int) -> str:
+        if column == 0:
+            return entry.title
+        if column == 1:
+            return entry.card_type
+        if column == 2:
+            return _mask_card_number(entry.card_number)
+        if column == 3:
+            return entry.cardholder_name
+        if column == 4:
+            return f"{entry.expiry_month}/{entry.expiry_year}"
+        if column == 5:
+            return entry.category
+        return entry.modified[:10]
+
+
+class IdentitiesTableModel(EntryTableModel):
+    """Table model over identity entries, with phone numbers masked."""
+    
+    HEADERS = ("Title", "Name", "Email", "Phone", "Category", "Last Modified")
+    
+    def display_text(self, entry, column: int) -> str:
+        if column == 0:
+            return entry.title
+        if column == 1:
+            return entry.full_name
+        if column == 2:
+            return entry.email
+        if column == 3:
+            return _mask_phone(entry.phone)
+        if column == 4:
+            return entry.category
+        return entry.modified[:10]
+
+
+class FavoritesTableModel(EntryTableModel):
+    """Table model over favorited entries of any type."""
+    
+    HEADERS = ("Title", "Type", "Category", "Last Modified")
+    
+    def display_text(self, entry, column: int) -> str:
+        if column == 0:
+            return entry.title
+        if column == 1:
+            return entry.type
+        if column == 2:
+            return entry.category
+        return entry.modified[:10]
@@ -3,20 +3,199 @@ File Attachment Widget
 Reusable widget for attaching files to entries.
 """
 
+import atexit
 import os
 import tempfile
 import shutil
 import uuid
+from contextlib import contextmanager
 from typing import List, Optional
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QListWidget, QListWidgetItem, QFileDialog, QMessageBox,
-    QMenu, QFrame
+    QListView, QFileDialog, QMessageBox,
+    QMenu, QFrame, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal, QUrl, QTimer
-from PySide6.QtGui import QIcon, QPixmap, QImage, QDesktopServices
+from PySide6.QtCore import (
+    Qt, Signal, QUrl, QObject, QRunnable, QThreadPool, QSignalBlocker,
+    QAbstractListModel, QModelIndex
+)
+from PySide6.QtGui import QIcon, QPixmap, QImage, QDesktopServices, QPainter
+
+from ..models import FileEntry, FileKind
+from .file_entry_dialog import read_preview_image, encode_png
+
+# Emoji shown as the icon of each kind of file
+_KIND_EMOJI = {FileKind.IMAGE: "📷", FileKind.DOCUMENT: "📄", FileKind.ARCHIVE: "📦", FileKind.OTHER: "📁"}
+_icons = {}  # Rendered icons by kind, created on first use (needs a QGuiApplication)
+_ALL_FILES_FILTER = "All Files (*.*)"
+
+
+def _file_icon(kind: FileKind) -> QIcon:
+    """Return the icon for a kind of file, rendering its emoji once."""
+    icon = _icons.get(kind)
+    if icon is None:
+        pixmap = QPixmap(20, 20)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, _KIND_EMOJI[kind])
+        painter.end()
+        icon = _icons[kind] = QIcon(pixmap)
+    return icon
+
+
+class _PreviewIconSignals(QObject):
+    """Signals emitted by _PreviewIconLoader."""
+    
+    finished = Signal(object, QImage, bytes)  # FileEntry, preview (null on failure), preview as PNG
+
 
-from ..models import FileEntry
+class _PreviewIconLoader(QRunnable):
+    """Decodes an image attachment's preview on a worker thread."""
+    
+    def __init__(self, file_entry: FileEntry, file_data: bytes):
+        super().__init__()
+        self.file_entry = file_entry
+        self.file_data = file_data  # Read on the GUI thread, where the entry may decode it lazily
+        self.signals = _PreviewIconSignals()
+    
+    def run(self):
+        image = read_preview_image(self.file_data)
+        png = b"" if image.isNull() else encode_png(image)
+        self.signals.finished.emit(self.file_entry, image, png)
+
+
+class _FileListModel(QAbstractListModel):
+    """List model over a FileAttachmentWidget's attached files."""
+    
+    def __init__(self, files: List[FileEntry], parent=None):
+        super().__init__(parent)
+        self.files = files
+        self._preview_icons = {}  # Preview icon of each image attachment, or None if it has none
+        self._pending_previews = {}  # Signals of the running _PreviewIconLoader of each image attachment
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_entry = self.files[index.row()]
+        if role == Qt.DisplayRole:
+            return file_entry.title
+        if role == Qt.DecorationRole:
+            if file_entry.kind == FileKind.IMAGE:
+                icon = self._preview_icon(file_entry)
+                if icon is not None:
+                    return icon
+            return _file_icon(file_entry.kind)
+        if role == Qt.ToolTipRole:
+            # Built on hover only
+            return (f"Name: {file_entry.file_name}\n"
+                    f"Size: {file_entry.get_file_size_formatted()}\n"
+                    f"Type: {file_entry.file_type}\n"
+                    "Double-click to open")
+        if role == Qt.UserRole:
+            return file_entry
+        return None
+    
+    def _preview_icon(self, file_entry: FileEntry) -> Optional[QIcon]:
+        """Return an image attachment's preview icon, or None while it is decoded or if it has none.
+        
+        Views only ask for the decoration of rows they paint, so previews are decoded as
+        attachments scroll into view, each on a worker thread.
+        """
+        if file_entry in self._preview_icons:
+            return self._preview_icons[file_entry]
+        png = file_entry.thumbnail_png
+        if png is not None:
+            pixmap = QPixmap()
+            pixmap.loadFromData(png)
+            icon = self._preview_icons[file_entry] = QIcon(pixmap)
+            return icon
+        if file_entry not in self._pending_previews:
+            loader = _PreviewIconLoader(file_entry, file_entry.file_data)
+            loader.signals.finished.connect(self._on_preview_loaded)
+            self._pending_previews[file_entry] = loader.signals
+            QThreadPool.globalInstance().start(loader)
+        return None
+    
+    def _on_preview_loaded(self, file_entry: FileEntry, image: QImage, png: bytes):
+        """Store a preview decoded by a _PreviewIconLoader and repaint its row."""
+        self._pending_previews.pop(file_entry, None)
+        if image.isNull():
+            self._preview_icons[file_entry] = None
+        else:
+            file_entry.thumbnail_png = png  # Reused by the next dialog that shows this attachment
+            self._preview_icons[file_entry] = QIcon(QPixmap.fromImage(image))
+        for row, entry in enumerate(self.files):
+            if entry is file_entry:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+                break
+    
+    def set_files(self, files: List[FileEntry]):
+        """Show a different list of files."""
+        self.beginResetModel()
+        self.files = files
+        self._preview_icons = {}
+        self.endResetModel()
+    
+    def append(self, file_entry: FileEntry):
+        """Append a file to the list."""
+        row = len(self.files)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.files.append(file_entry)
+        self.endInsertRows()
+    
+    def pop(self, row: int) -> FileEntry:
+        """Remove and return the file at row."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        file_entry = self.files.pop(row)
+        self._preview_icons.pop(file_entry, None)
+        self.endRemoveRows()
+        return file_entry
+
+
+class _AttachmentLoaderSignals(QObject):
+    """Signals emitted by _AttachmentLoader."""
+    
+    loaded = Signal(object)  # FileEntry
+    failed = Signal(str, str)  # File path, error message
+    finished = Signal()
+
+
+class _AttachmentLoader(QRunnable):
+    """Reads the selected files into FileEntry objects on a worker thread."""
+    
+    def __init__(self, file_paths: List[str]):
+        super().__init__()
+        self.file_paths = file_paths
+        self.signals = _AttachmentLoaderSignals()
+    
+    def run(self):
+        for file_path in self.file_paths:
+            try:
+                # Read file data for storage (will be encrypted)
+                with open(file_path, 'rb') as f:
+                    file_data = f.read()
+                
+                original_name = os.path.basename(file_path)
+                file_extension = os.path.splitext(original_name)[1]
+                
+                file_entry = FileEntry(
+                    title=original_name,
+                    file_data=file_data,
+                    file_name=original_name,
+                    file_type=file_extension,
+                    file_size=len(file_data),
+                    category="Attachments"
+                )
+                # Hash here, off the UI thread; saving the vault reuses the cached digest
+                file_entry.content_hash()
+                self.signals.loaded.emit(file_entry)
+            except Exception as e:
+                self.signals.failed.emit(file_path, str(e))
+        self.signals.finished.emit()
 
 
 class FileAttachmentWidget(QWidget):
@@ -28,12 +207,13 @@ class FileAttachmentWidget(QWidget):
         super().__init__(parent)
         self.attached_files: List[FileEntry] = []
         self.temp_files = {}  # Track temporary files: {file_entry_id: temp_path}
+        self._temp_written = {}  # {temp_path: (file_data, (size, mtime))} as last written, see create_temp_file
+        self._temp_dir = None  # TemporaryDirectory holding them, created on first use
+        self._loaders = {}  # Signals of running loaders, kept alive until they finish, and their generation
+        self._load_generation = 0  # Bumped when the files are replaced; older loaders' results are dropped
+        self._bulk_depth = 0  # Nesting depth of _bulk() blocks
+        self._bulk_dirty = False  # Whether the files changed inside the current _bulk() block
         self.setup_ui()
-        
-        # Timer to clean up temporary files
-        self.cleanup_timer = QTimer()
-        self.cleanup_timer.timeout.connect(self.cleanup_temp_files)
-        self.cleanup_timer.start(300000)  # Clean up every 5 minutes
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -51,13 +231,24 @@ class FileAttachmentWidget(QWidget):
         layout.addLayout(header_layout)
         
         # File list
-        self.file_list = QListWidget()
+        self.file_model = _FileListModel(self.attached_files, self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setEditTriggers(QListView.NoEditTriggers)
+        self.file_list.setUniformItemSizes(True)  # Every row is one icon and one line of text
         self.file_list.setMaximumHeight(120)
         self.file_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.file_list.customContextMenuRequested.connect(self.show_context_menu)
-        self.file_list.itemDoubleClicked.connect(self.open_file)  # Double-click to open
+        self.file_list.doubleClicked.connect(self.open_file)  # Double-click to open
         layout.addWidget(self.file_list)
         
+        # Progress of files being read in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumHeight(12)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        
         # Info label
         self.info_label = QLabel("No files attached")
         self.info_label.setStyleSheet("color: #888; font-style: italic;")
@@ -66,68 +257,62 @@ class FileAttachmentWidget(QWidget):
     def add_file(self):
         """Add a new file attachment."""
         file_paths, _ = QFileDialog.getOpenFileNames(
-            self, "Select Files to Attach", "",
-            "All Files (*.*)"
+            self, "Select Files to Attach", "", _ALL_FILES_FILTER
         )
-        
-        for file_path in file_paths:
-            try:
-                # Read file data for storage (will be encrypted)
-                with open(file_path, 'rb') as f:
-                    file_data = f.read()
-                
-                original_name = os.path.basename(file_path)
-                file_extension = os.path.splitext(original_name)[1]
-                file_size = len(file_data)
-                file_type = file_extension if file_extension else ""
-                
-                file_entry = FileEntry(
-                    title=original_name,
-                    file_data=file_data,
-                    file_name=original_name,
-                    file_type=file_type,
-                    file_size=file_size,
-                    category="Attachments"
-                )
-                
-                self.attached_files.append(file_entry)
-                self.add_file_to_list(file_entry)
-                self.files_changed.emit()
-                
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to attach file {os.path.basename(file_path)}: {str(e)}")
-        
-        self.update_info_label()
+        if file_paths:
+            self.attach_paths(file_paths)
     
-    def add_file_to_list(self, file_entry: FileEntry):
-        """Add a file entry to the list widget."""
-        item = QListWidgetItem()
+    def attach_paths(self, file_paths: List[str]):
+        """Read files in the background and attach them as they finish loading."""
+        loader = _AttachmentLoader(file_paths)
+        signals = loader.signals
+        generation = self._load_generation
+        signals.loaded.connect(lambda file_entry: self._on_file_loaded(file_entry, generation))
+        signals.failed.connect(lambda file_path, error: self._on_file_failed(file_path, error, generation))
+        signals.finished.connect(lambda: self._on_loader_finished(signals))
         
-        # Set icon based on file type
-        if file_entry.is_image():
-            item.setText("📷 " + file_entry.title)
-        elif file_entry.is_document():
-            item.setText("📄 " + file_entry.title)
-        elif file_entry.is_archive():
-            item.setText("📦 " + file_entry.title)
+        if generation in self._loaders.values():
+            self.progress_bar.setMaximum(self.progress_bar.maximum() + len(file_paths))
         else:
-            item.setText("📁 " + file_entry.title)
-        
-        # Set tooltip with file info
-        tooltip = f"Name: {file_entry.file_name}\n"
-        tooltip += f"Size: {file_entry.get_file_size_formatted()}\n"
-        tooltip += f"Type: {file_entry.file_type}\n"
-        tooltip += "Double-click to open"
-        item.setToolTip(tooltip)
-        
-        # Store the file entry in the item data
-        item.setData(Qt.UserRole, file_entry)
-        
-        self.file_list.addItem(item)
+            self.progress_bar.setRange(0, len(file_paths))
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+        self._loaders[signals] = generation
+        QThreadPool.globalInstance().start(loader)
+    
+    def _cancel_loaders(self):
+        """Drop the results of running loaders, e.g. when the widget is reused for another entry."""
+        self._load_generation += 1
+        self.progress_bar.hide()
+    
+    def _on_file_loaded(self, file_entry: FileEntry, generation: int):
+        """Attach a file read by a loader started for the current files."""
+        if generation != self._load_generation:
+            return
+        self.add_file_to_list(file_entry)
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        self._files_changed()
+    
+    def _on_file_failed(self, file_path: str, error: str, generation: int):
+        """Report a file a loader started for the current files could not read."""
+        if generation != self._load_generation:
+            return
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        QMessageBox.warning(self, "Error", f"Failed to attach file {os.path.basename(file_path)}: {error}")
+    
+    def _on_loader_finished(self, signals: _AttachmentLoaderSignals):
+        """Hide the progress bar once no loader for the current files is running."""
+        self._loaders.pop(signals, None)
+        if self._load_generation not in self._loaders.values():
+            self.progress_bar.hide()
+    
+    def add_file_to_list(self, file_entry: FileEntry):
+        """Attach a file entry and add it to the list."""
+        self.file_model.append(file_entry)
     
-    def open_file(self, item: QListWidgetItem):
+    def open_file(self, index: QModelIndex):
         """Open a file using the system default application."""
-        file_entry = item.data(Qt.UserRole)
+        file_entry = index.data(Qt.UserRole)
         if not file_entry:
             return
         
@@ -147,20 +332,39 @@ class FileAttachmentWidget(QWidget):
     
     def create_temp_file(self, file_entry: FileEntry) -> Optional[str]:
         """Create a temporary file for opening."""
+        # Reopening an attachment reuses its file while neither the entry's data nor the
+        # file on disk (which the opening application may have edited) has changed
+        temp_path = self.temp_files.get(id(file_entry))
+        if temp_path is not None:
+            written = self._temp_written.get(temp_path)
+            try:
+                stat = os.stat(temp_path)
+            except OSError:
+                stat = None
+            if (written is not None and stat is not None and written[0] is file_entry.file_data
+                    and written[1] == (stat.st_size, stat.st_mtime_ns)):
+                return temp_path
+            # Leave the stale file (it may be open elsewhere); the temp directory's cleanup removes it
+            del self.temp_files[id(file_entry)]
+            self._temp_written.pop(temp_path, None)
+        
         try:
-            # Create temporary file with proper extension
-            temp_fd, temp_path = tempfile.mkstemp(suffix=file_entry.file_type)
-            os.close(temp_fd)
+            if self._temp_dir is None:
+                self._temp_dir = tempfile.TemporaryDirectory(prefix="luckeepass-")
+                # Also removed if the widget is never closed
+                atexit.register(self._temp_dir.cleanup)
             
-            # Write file data to temporary file
-            with open(temp_path, 'wb') as f:
+            # Create temporary file with proper extension and write file data to it
+            with tempfile.NamedTemporaryFile(dir=self._temp_dir.name, suffix=file_entry.file_type,
+                                             delete=False) as f:
                 f.write(file_entry.file_data)
             
             # Store reference to temp file
-            file_id = id(file_entry)
-            self.temp_files[file_id] = temp_path
+            self.temp_files[id(file_entry)] = f.name
+            stat = os.stat(f.name)
+            self._temp_written[f.name] = (file_entry.file_data, (stat.st_size, stat.st_mtime_ns))
             
-            return temp_path
+            return f.name
         except Exception as e:
             print(f"Error creating temp file: {e}")
             return None
@@ -171,42 +375,43 @@ class FileAttachmentWidget(QWidget):
         if file_id in self.temp_files:
             temp_path = self.temp_files[file_id]
             try:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f"Error removing temp file {temp_path}: {e}")
             finally:
                 del self.temp_files[file_id]
+                self._temp_written.pop(temp_path, None)
     
     def cleanup_temp_files(self):
         """Clean up all temporary files."""
-        for file_id, temp_path in list(self.temp_files.items()):
+        self.temp_files.clear()
+        self._temp_written.clear()
+        if self._temp_dir is not None:
             try:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+                self._temp_dir.cleanup()
             except Exception as e:
-                print(f"Error cleaning up temp file {temp_path}: {e}")
-            finally:
-                del self.temp_files[file_id]
+                print(f"Error cleaning up temp directory {self._temp_dir.name}: {e}")
+            atexit.unregister(self._temp_dir.cleanup)
+            self._temp_dir = None
     
     def remove_file(self, index: int):
         """Remove a file attachment."""
         if 0 <= index < len(self.attached_files):
-            removed_file = self.attached_files.pop(index)
+            removed_file = self.file_model.pop(index)
             
             # Remove any associated temporary file
             self.remove_temp_file(removed_file)
             
-            self.file_list.takeItem(index)
-            self.files_changed.emit()
-            self.update_info_label()
+            self._files_changed()
             return removed_file
         return None
     
     def show_context_menu(self, position):
         """Show context menu for file list."""
-        item = self.file_list.itemAt(position)
-        if item:
+        item = self.file_list.indexAt(position)
+        if item.isValid():
             menu = QMenu()
             
             open_action = menu.addAction("Open File")
@@ -222,7 +427,7 @@ class FileAttachmentWidget(QWidget):
             elif action == remove_action:
                 self.remove_file_from_list(item)
     
-    def save_file_as(self, item: QListWidgetItem):
+    def save_file_as(self, item: QModelIndex):
         """Save a file to a new location."""
         file_entry = item.data(Qt.UserRole)
         if not file_entry:
@@ -230,7 +435,7 @@ class FileAttachmentWidget(QWidget):
         
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save File As", file_entry.file_name,
-            f"All Files (*.*);;{file_entry.file_type} Files (*{file_entry.file_type})"
+            f"{_ALL_FILES_FILTER};;{file_entry.file_type} Files (*{file_entry.file_type})"
         )
         
         if file_path:
@@ -241,14 +446,13 @@ class FileAttachmentWidget(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
     
-    def save_file(self, item: QListWidgetItem):
+    def save_file(self, item: QModelIndex):
         """Legacy method - now calls save_file_as."""
         self.save_file_as(item)
     
-    def remove_file_from_list(self, item: QListWidgetItem):
+    def remove_file_from_list(self, item: QModelIndex):
         """Remove a file from the list."""
-        index = self.file_list.row(item)
-        self.remove_file(index)
+        self.remove_file(item.row())
     
     def update_info_label(self):
         """Update the info label based on number of files."""
@@ -268,19 +472,41 @@ class FileAttachmentWidget(QWidget):
         """Get the list of attached files (legacy method)."""
         return self.get_files()
     
+    def _files_changed(self):
+        """Update the info label and emit files_changed, or defer both to the end of _bulk()."""
+        if self._bulk_depth:
+            self._bulk_dirty = True
+            return
+        self.update_info_label()
+        self.files_changed.emit()
+    
+    @contextmanager
+    def _bulk(self):
+        """Group changes so that files_changed is emitted at most once, when the outermost block ends."""
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth and self._bulk_dirty:
+                self._bulk_dirty = False
+                self._files_changed()
+    
     def load_files(self, files: List[FileEntry]):
         """Load files from a list."""
-        # Clean up any existing temp files
-        self.cleanup_temp_files()
-        
-        self.attached_files = files.copy()
-        self.file_list.clear()
+        self._cancel_loaders()  # Files still being read belong to the previous list
+        if files == self.attached_files:
+            return  # Already showing exactly these entries
         
-        for file_entry in self.attached_files:
-            self.add_file_to_list(file_entry)
-        
-        self.update_info_label()
-        self.files_changed.emit()
+        with self._bulk():
+            # Clean up any existing temp files
+            self.cleanup_temp_files()
+            
+            # A single model reset: the view lays out and repaints once for the whole list
+            self.attached_files = files.copy()
+            with QSignalBlocker(self.file_list):
+                self.file_model.set_files(self.attached_files)
+            self._files_changed()
     
     def set_attached_files(self, files: List[FileEntry]):
         """Set the list of attached files (legacy method)."""
@@ -288,13 +514,14 @@ class FileAttachmentWidget(QWidget):
     
     def clear_files(self):
         """Clear all attached files."""
-        # Clean up all temporary files
-        self.cleanup_temp_files()
-        
-        self.attached_files.clear()
-        self.file_list.clear()
-        self.update_info_label()
-        self.files_changed.emit()
+        self._cancel_loaders()
+        with self._bulk():
+            # Clean up all temporary files
+            self.cleanup_temp_files()
+            
+            self.attached_files = []
+            self.file_model.set_files(self.attached_files)
+            self._files_changed()
     
     def closeEvent(self, event):
         """Clean up temporary files when widget is closed."""
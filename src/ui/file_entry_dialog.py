@@ -7,23 +7,173 @@ import os
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QTextEdit, QComboBox, QCheckBox, QFileDialog,
-    QMessageBox, QGroupBox, QFormLayout, QScrollArea
+    QMessageBox, QGroupBox, QFormLayout, QScrollArea, QProgressDialog
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QPixmap, QImage
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, QStringListModel
+)
+from PySide6.QtGui import QFont, QPixmap, QImage, QImageReader, QImageIOHandler
 import io
 
 from ..models import FileEntry
+from ..models.file_entry import IMAGE_EXTENSIONS, DOCUMENT_EXTENSIONS, ARCHIVE_EXTENSIONS, format_file_size
+
+PREVIEW_SIZE = 150
+# Larger images are reduced to this size with fast sampling before the final smooth scale
+_FAST_SCALE_LIMIT = 2 * PREVIEW_SIZE
+# Images above either limit are not decoded for a preview
+_PREVIEW_MAX_BYTES = 25 * 1024 * 1024
+_PREVIEW_MAX_PIXELS = 16_000_000
+_READ_CHUNK_SIZE = 1024 * 1024
+# Files at least this large are read with a progress dialog
+_PROGRESS_THRESHOLD = 8 * 1024 * 1024
+
+# Category suggested for each (dotted, lowercase) file extension; anything else is 'Files'
+EXT_CATEGORY = {
+    **{f".{ext}": "Images" for ext in IMAGE_EXTENSIONS},
+    **{f".{ext}": "Documents" for ext in DOCUMENT_EXTENSIONS},
+    **{f".{ext}": "Archives" for ext in ARCHIVE_EXTENSIONS},
+}
+_CATEGORIES = ("Files", "Documents", "Images", "Archives", "Personal", "Work")
+_category_model = None  # Shared by every dialog's category combo box, created on first use
+
+
+def _get_category_model() -> QStringListModel:
+    """Return the category list model shared by all file dialogs."""
+    global _category_model
+    if _category_model is None:
+        _category_model = QStringListModel(list(_CATEGORIES))
+    return _category_model
+
+
+def _scaled_reader(source) -> QImageReader:
+    """Open an image file path or in-memory image for decoding at preview size.
+    
+    Only formats that can decode at a smaller size (JPEG, SVG) get a scaled size;
+    for the others QImageReader would smooth-scale the full-resolution image.
+    """
+    if isinstance(source, str):
+        reader = QImageReader(source)
+    else:
+        buffer = QBuffer()
+        buffer.setData(QByteArray(bytes(source)))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+        reader._buffer = buffer  # QImageReader does not keep its device alive
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and reader.supportsOption(QImageIOHandler.ScaledSize):
+        # The decoder can then skip most of the full-resolution work
+        size.scale(PREVIEW_SIZE, PREVIEW_SIZE, Qt.KeepAspectRatio)
+        reader.setScaledSize(size)
+    return reader
+
+
+def _exceeds_pixel_budget(reader: QImageReader) -> bool:
+    """Return whether the reader's image, by its header, is too large to decode for a preview."""
+    size = reader.size()
+    return size.isValid() and size.width() * size.height() > _PREVIEW_MAX_PIXELS
+
+
+def _scale_to_preview(image: QImage) -> QImage:
+    """Scale a decoded image to preview size.
+    
+    Large images first get one fast (nearest pixel) pass down to _FAST_SCALE_LIMIT, so the
+    smooth scale works on a few hundred pixels across instead of the whole image.
+    """
+    if image.isNull():
+        return image
+    if max(image.width(), image.height()) > _FAST_SCALE_LIMIT:
+        image = image.scaled(_FAST_SCALE_LIMIT, _FAST_SCALE_LIMIT, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return image.scaled(PREVIEW_SIZE, PREVIEW_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def _read_scaled(reader: QImageReader) -> QImage:
+    """Read an image from a reader made by _scaled_reader, at preview size."""
+    image = reader.read()
+    return image if reader.scaledSize().isValid() else _scale_to_preview(image)
+
+
+def _read_scaled_image(source) -> QImage:
+    """Decode an image file path or in-memory image at preview size (a null QImage if it cannot be read)."""
+    return _read_scaled(_scaled_reader(source))
+
+
+def read_preview_image(data: bytes) -> QImage:
+    """Decode in-memory image data at preview size.
+    
+    Returns a null QImage if the data is not a readable image or is too large to preview.
+    Safe to call off the GUI thread.
+    """
+    if len(data) > _PREVIEW_MAX_BYTES:
+        return QImage()
+    reader = _scaled_reader(data)
+    if _exceeds_pixel_budget(reader):
+        return QImage()
+    return _read_scaled(reader)
+
+
+def encode_png(image) -> bytes:
+    """Return a QImage or QPixmap encoded as PNG."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return data.data()
+
+
+class _ThumbnailSignals(QObject):
+    """Signals emitted by _ThumbnailTask."""
+    
+    finished = Signal(QImage, str)  # Preview image (null on failure), file path
+
+
+class _ThumbnailTask(QRunnable):
+    """Decodes a preview image on a worker thread."""
+    
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = _ThumbnailSignals()
+    
+    def run(self):
+        # QImage (unlike QPixmap) may be created off the GUI thread
+        self.signals.finished.emit(_read_scaled_image(self.file_path), self.file_path)
 
 
 class FileEntryDialog(QDialog):
     """Dialog for adding and editing file entries."""
     
+    # Preview label styles
+    _STYLE_LOADING = "border: 2px dashed #BDC3C7; border-radius: 5px; background-color: #F8F9FA;"
+    _STYLE_OK_IMG = "border: 2px solid #2ECC71; border-radius: 5px;"
+    _STYLE_BAD_IMG = "border: 2px dashed #E74C3C; border-radius: 5px; background-color: #F8F9FA;"
+    _STYLE_ERR = _STYLE_BAD_IMG
+    _STYLE_DOC = "border: 2px solid #3498DB; border-radius: 5px; background-color: #EBF3FD; font-size: 24px;"
+    _STYLE_ARCHIVE = "border: 2px solid #F39C12; border-radius: 5px; background-color: #FEF9E7; font-size: 24px;"
+    _STYLE_GENERIC = "border: 2px solid #95A5A6; border-radius: 5px; background-color: #F8F9FA; font-size: 24px;"
+    # File name label styles before and after a file is chosen
+    _STYLE_NO_FILE = "color: #7F8C8D; font-style: italic;"
+    _STYLE_FILE_SELECTED = "color: #2ECC71; font-weight: bold;"
+    # Preview text and style for each category without an image preview
+    _PLACEHOLDERS = {
+        "Documents": ("📄\nDocument", _STYLE_DOC),
+        "Archives": ("📦\nArchive", _STYLE_ARCHIVE),
+        "Files": ("📁\nFile", _STYLE_GENERIC),
+    }
+    
+    _instances = {}  # Pooled dialog per parent widget, see get_instance
+    
     def __init__(self, file_entry: FileEntry = None, parent=None):
         super().__init__(parent)
         self.file_entry = file_entry
         self.selected_file_path = ""
         self.selected_file_data = b""
+        self._file_to_read = ""  # Selected file whose contents are read on save
+        self._file_data_dirty = False  # Whether selected_file_data holds a newly selected file
+        self._thumbnail_signals = None  # Signals of the running _ThumbnailTask, kept alive until it finishes
+        self._preview_style = None  # Style constant last applied by _set_preview_style
         
         self.setWindowTitle("Add File" if file_entry is None else "Edit File")
         self.setModal(True)
@@ -34,6 +184,43 @@ class FileEntryDialog(QDialog):
         if file_entry:
             self.load_file_data()
     
+    @classmethod
+    def get_instance(cls, file_entry: FileEntry = None, parent=None) -> "FileEntryDialog":
+        """Return the dialog kept for parent, reset to show file_entry.
+        
+        The dialog is created on first use and reused until its parent is destroyed.
+        """
+        dialog = cls._instances.get(parent)
+        if dialog is None:
+            dialog = cls(file_entry, parent)
+            cls._instances[parent] = dialog
+            dialog.destroyed.connect(lambda: cls._instances.pop(parent, None))
+        else:
+            dialog.reset_form(file_entry)
+        return dialog
+    
+    def reset_form(self, file_entry: FileEntry = None):
+        """Clear the form and load file_entry into it, if given."""
+        self.file_entry = file_entry
+        self.selected_file_path = ""
+        self.selected_file_data = b""
+        self._file_to_read = ""  # Also makes any running _ThumbnailTask's result stale
+        self._file_data_dirty = False
+        self.setWindowTitle("Add File" if file_entry is None else "Edit File")
+        
+        self.title_edit.clear()
+        self.file_path_label.setText("No file selected")
+        self.file_path_label.setStyleSheet(self._STYLE_NO_FILE)
+        self.file_details_label.clear()
+        self.preview_label.setText("No preview\navailable")
+        self._set_preview_style(self._STYLE_LOADING)
+        self.category_edit.setCurrentText("Files")
+        self.notes_edit.clear()
+        self.favorite_checkbox.setChecked(False)
+        
+        if file_entry:
+            self.load_file_data()
+    
     def setup_ui(self):
         """Setup the user interface."""
         layout = QVBoxLayout(self)
@@ -54,7 +241,7 @@ class FileEntryDialog(QDialog):
         
         file_info_layout = QHBoxLayout()
         self.file_path_label = QLabel("No file selected")
-        self.file_path_label.setStyleSheet("color: #7F8C8D; font-style: italic;")
+        self.file_path_label.setStyleSheet(self._STYLE_NO_FILE)
         file_info_layout.addWidget(self.file_path_label)
         
         self.select_file_btn = QPushButton("Select File")
@@ -78,13 +265,7 @@ class FileEntryDialog(QDialog):
         
         self.preview_label = QLabel()
         self.preview_label.setFixedSize(150, 150)
-        self.preview_label.setStyleSheet("""
-            QLabel {
-                border: 2px dashed #BDC3C7;
-                border-radius: 5px;
-                background-color: #F8F9FA;
-            }
-        """)
+        self._set_preview_style(self._STYLE_LOADING)
         self.preview_label.setAlignment(Qt.AlignCenter)
         self.preview_label.setText("No preview\navailable")
         self.preview_label.setWordWrap(True)
@@ -97,8 +278,10 @@ class FileEntryDialog(QDialog):
         # Category
         category_label = QLabel("Category:")
         self.category_edit = QComboBox()
+        self.category_edit.setModel(_get_category_model())
         self.category_edit.setEditable(True)
-        self.category_edit.addItems(["Files", "Documents", "Images", "Archives", "Personal", "Work"])
+        # Typed categories must not be added to the shared model
+        self.category_edit.setInsertPolicy(QComboBox.NoInsert)
         self.category_edit.setCurrentText("Files")
         layout.addWidget(category_label)
         layout.addWidget(self.category_edit)
@@ -141,95 +324,160 @@ class FileEntryDialog(QDialog):
         
         if file_path:
             try:
-                with open(file_path, 'rb') as f:
-                    self.selected_file_data = f.read()
+                # Only the size is needed now; the contents are read when the entry is saved
+                file_size = os.path.getsize(file_path)
                 
                 self.selected_file_path = file_path
+                self.selected_file_data = b""
+                self._file_to_read = file_path
+                # Split the path once; the name, stem and extension are all reused below
                 file_name = os.path.basename(file_path)
-                file_size = len(self.selected_file_data)
+                stem, file_ext = os.path.splitext(file_name)
+                file_ext = file_ext.lower()
                 
                 # Update UI
                 self.file_path_label.setText(file_name)
-                self.file_path_label.setStyleSheet("color: #2ECC71; font-weight: bold;")
+                self.file_path_label.setStyleSheet(self._STYLE_FILE_SELECTED)
                 
                 # Show file details
                 size_str = self.format_file_size(file_size)
-                file_ext = os.path.splitext(file_name)[1].lower()
                 self.file_details_label.setText(f"Size: {size_str} | Type: {file_ext or 'Unknown'}")
                 
                 # Generate thumbnail preview
-                self.generate_thumbnail(file_name, file_ext)
+                self.generate_thumbnail(file_name, file_ext, file_size)
                 
                 # Auto-set title if empty
                 if not self.title_edit.text():
-                    self.title_edit.setText(os.path.splitext(file_name)[0])
+                    self.title_edit.setText(stem)
                 
                 # Auto-set category based on file type
-                if file_ext in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg'}:
-                    self.category_edit.setCurrentText("Images")
-                elif file_ext in {'.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages'}:
-                    self.category_edit.setCurrentText("Documents")
-                elif file_ext in {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'}:
-                    self.category_edit.setCurrentText("Archives")
+                category = EXT_CATEGORY.get(file_ext)
+                if category:
+                    self.category_edit.setCurrentText(category)
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not read file: {str(e)}")
     
-    def generate_thumbnail(self, file_name: str, file_ext: str):
-        """Generate thumbnail preview for supported file types."""
+    def generate_thumbnail(self, file_name: str, file_ext: str, file_size: int = None):
+        """Generate thumbnail preview for supported file types.
+        
+        file_size is the size of the selected file, if the caller already has it.
+        """
         try:
-            if file_ext in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}:
-                # Image thumbnail
-                image = QImage()
-                if image.loadFromData(self.selected_file_data):
-                    pixmap = QPixmap.fromImage(image)
-                    scaled_pixmap = pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.preview_label.setPixmap(scaled_pixmap)
-                    self.preview_label.setStyleSheet("border: 2px solid #2ECC71; border-radius: 5px;")
-                else:
-                    self.preview_label.setText("Invalid\nimage file")
-                    self.preview_label.setStyleSheet("border: 2px dashed #E74C3C; border-radius: 5px; background-color: #F8F9FA;")
+            category = EXT_CATEGORY.get(file_ext, "Files")
+            if category == "Images" and self._file_to_read:
+                if file_size is None:
+                    file_size = os.path.getsize(self._file_to_read)
+                if file_size > _PREVIEW_MAX_BYTES or _exceeds_pixel_budget(QImageReader(self._file_to_read)):
+                    self._show_size_only_preview(file_size)
+                    return
+                # Image thumbnail, decoded from the file at preview size on a worker thread
+                self.preview_label.setText("Loading\npreview...")
+                self._set_preview_style(self._STYLE_LOADING)
+                task = _ThumbnailTask(self._file_to_read)
+                task.signals.finished.connect(self._show_thumbnail)
+                self._thumbnail_signals = task.signals
+                QThreadPool.globalInstance().start(task)
             
-            elif file_ext == '.svg':
-                # SVG thumbnail
+            elif category == "Images":
+                # Image thumbnail from the entry's data, decoded at preview size once per file_data
                 pixmap = QPixmap()
-                if pixmap.loadFromData(self.selected_file_data):
-                    scaled_pixmap = pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.preview_label.setPixmap(scaled_pixmap)
-                    self.preview_label.setStyleSheet("border: 2px solid #2ECC71; border-radius: 5px;")
+                cached = self.file_entry.thumbnail_png if self.file_entry else None
+                if cached is not None and self.selected_file_data is self.file_entry.file_data:
+                    pixmap.loadFromData(cached)
+                elif len(self.selected_file_data) > _PREVIEW_MAX_BYTES:
+                    self._show_size_only_preview(len(self.selected_file_data))
+                    return
                 else:
-                    self.preview_label.setText("Invalid\nSVG file")
-                    self.preview_label.setStyleSheet("border: 2px dashed #E74C3C; border-radius: 5px; background-color: #F8F9FA;")
-            
-            elif file_ext in {'.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages'}:
-                # Document icon
-                self.preview_label.setText("📄\nDocument")
-                self.preview_label.setStyleSheet("border: 2px solid #3498DB; border-radius: 5px; background-color: #EBF3FD; font-size: 24px;")
-            
-            elif file_ext in {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'}:
-                # Archive icon
-                self.preview_label.setText("📦\nArchive")
-                self.preview_label.setStyleSheet("border: 2px solid #F39C12; border-radius: 5px; background-color: #FEF9E7; font-size: 24px;")
+                    reader = _scaled_reader(self.selected_file_data)
+                    if _exceeds_pixel_budget(reader):
+                        self._show_size_only_preview(len(self.selected_file_data))
+                        return
+                    if reader.scaledSize().isValid():
+                        # Decoded straight into the pixmap, without a QImage copy in between
+                        pixmap = QPixmap.fromImageReader(reader)
+                    else:
+                        pixmap = QPixmap.fromImage(_scale_to_preview(reader.read()))
+                    if not pixmap.isNull() and self.file_entry and self.selected_file_data is self.file_entry.file_data:
+                        self.file_entry.thumbnail_png = encode_png(pixmap)
+                if not pixmap.isNull():
+                    self.preview_label.setPixmap(pixmap)
+                    self._set_preview_style(self._STYLE_OK_IMG)
+                else:
+                    kind = "SVG" if file_ext == '.svg' else "image"
+                    self.preview_label.setText(f"Invalid\n{kind} file")
+                    self._set_preview_style(self._STYLE_BAD_IMG)
             
             else:
-                # Generic file icon
-                self.preview_label.setText("📁\nFile")
-                self.preview_label.setStyleSheet("border: 2px solid #95A5A6; border-radius: 5px; background-color: #F8F9FA; font-size: 24px;")
+                # Document, archive or generic file icon
+                text, style = self._PLACEHOLDERS[category]
+                self.preview_label.setText(text)
+                self._set_preview_style(style)
                 
         except Exception as e:
             self.preview_label.setText("Preview\nerror")
-            self.preview_label.setStyleSheet("border: 2px dashed #E74C3C; border-radius: 5px; background-color: #F8F9FA;")
+            self._set_preview_style(self._STYLE_ERR)
+    
+    def _show_size_only_preview(self, size_bytes: int):
+        """Show an image icon with the file size instead of decoding a very large image."""
+        self.preview_label.setText(f"🖼️\n{format_file_size(size_bytes)}")
+        self._set_preview_style(self._STYLE_GENERIC)
+    
+    def _set_preview_style(self, style: str):
+        """Apply one of the preview styles, skipping the re-polish if it is already applied."""
+        if self._preview_style is not style:
+            self._preview_style = style
+            self.preview_label.setStyleSheet(style)
+    
+    def _show_thumbnail(self, image: QImage, file_path: str):
+        """Show a preview decoded by a _ThumbnailTask, unless another file was selected since."""
+        if file_path != self._file_to_read:
+            return
+        self._thumbnail_signals = None
+        if not image.isNull():
+            self.preview_label.setPixmap(QPixmap.fromImage(image))
+            self._set_preview_style(self._STYLE_OK_IMG)
+        else:
+            kind = "SVG" if file_path.lower().endswith('.svg') else "image"
+            self.preview_label.setText(f"Invalid\n{kind} file")
+            self._set_preview_style(self._STYLE_BAD_IMG)
+    
+    def read_selected_file(self):
+        """Read the selected file in chunks into a buffer of its size.
+        
+        Shows a progress dialog for large files. Returns None if reading failed or was canceled.
+        """
+        progress = None
+        try:
+            with open(self._file_to_read, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                data = bytearray(size)
+                if size >= _PROGRESS_THRESHOLD:
+                    progress = QProgressDialog("Reading file...", "Cancel", 0, -(-size // _READ_CHUNK_SIZE), self)
+                    progress.setWindowModality(Qt.WindowModal)
+                offset = 0
+                with memoryview(data) as view:
+                    while offset < size:
+                        count = f.readinto(view[offset:offset + _READ_CHUNK_SIZE])
+                        if not count:
+                            break
+                        offset += count
+                        if progress is not None:
+                            progress.setValue(-(-offset // _READ_CHUNK_SIZE))
+                            if progress.wasCanceled():
+                                return None
+                del data[offset:]  # In case the file shrank since it was selected
+                return data
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read file: {str(e)}")
+            return None
+        finally:
+            if progress is not None:
+                progress.close()
     
     def format_file_size(self, size_bytes):
         """Format file size in human readable format."""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return format_file_size(size_bytes)
     
     def load_file_data(self):
         """Load existing file data into the form."""
@@ -241,7 +489,7 @@ class FileEntryDialog(QDialog):
             
             # Show existing file info
             self.file_path_label.setText(self.file_entry.file_name)
-            self.file_path_label.setStyleSheet("color: #2ECC71; font-weight: bold;")
+            self.file_path_label.setStyleSheet(self._STYLE_FILE_SELECTED)
             
             size_str = self.file_entry.get_file_size_formatted()
             file_ext = self.file_entry.get_file_extension()
@@ -251,8 +499,8 @@ class FileEntryDialog(QDialog):
             self.selected_file_data = self.file_entry.file_data
             self.selected_file_path = self.file_entry.file_name
             
-            # Generate thumbnail for existing file
-            self.generate_thumbnail(self.file_entry.file_name, file_ext)
+            # Generate thumbnail for existing file (generate_thumbnail expects a dotted extension)
+            self.generate_thumbnail(self.file_entry.file_name, f".{file_ext}" if file_ext else "")
     
     def handle_save(self):
         """Handle save button click."""
@@ -266,6 +514,14 @@ class FileEntryDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Please enter a title.")
             return
         
+        if self._file_to_read:
+            file_data = self.read_selected_file()
+            if file_data is None:
+                return
+            self.selected_file_data = file_data
+            self._file_to_read = ""
+            self._file_data_dirty = True
+        
         if not self.selected_file_data and not self.file_entry:
             QMessageBox.warning(self, "Validation Error", "Please select a file.")
             return
@@ -278,8 +534,8 @@ class FileEntryDialog(QDialog):
             self.file_entry.notes = notes
             self.file_entry.is_favorite = is_favorite
             
-            # Update file data if new file was selected
-            if self.selected_file_data:
+            # Update file data only if a new file was selected, so metadata-only edits leave it untouched
+            if self._file_data_dirty:
                 self.file_entry.file_data = self.selected_file_data
                 self.file_entry.file_name = os.path.basename(self.selected_file_path)
                 self.file_entry.file_type = os.path.splitext(self.file_entry.file_name)[1]
@@ -303,6 +559,21 @@ class FileEntryDialog(QDialog):
         
         self.accept()
     
+    def done(self, result: int):
+        """Close the dialog and clear the form, so the pooled instance keeps no file data while hidden.
+        
+        A saved entry is kept until the caller collects it with take_entry().
+        """
+        super().done(result)
+        saved = self.file_entry if result == QDialog.Accepted else None
+        self.reset_form(None)
+        self.file_entry = saved
+    
     def get_entry(self) -> FileEntry:
         """Get the file entry."""
-        return self.file_entry 
\ No newline at end of file
+        return self.file_entry
+    
+    def take_entry(self) -> FileEntry:
+        """Return the saved file entry and drop the dialog's reference to it."""
+        entry, self.file_entry = self.file_entry, None
+        return entry 
\ No newline at end of file
@@ -3,29 +3,128 @@ Identity Entry Dialog
 Dialog for adding and editing identity entries.
 """
 
+from contextlib import ExitStack
+
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-    QPushButton, QMessageBox, QFormLayout, QTextEdit, QScrollArea, QWidget, QCheckBox
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, 
+    QPushButton, QMessageBox, QFormLayout, QTextEdit, QScrollArea, QWidget, QCheckBox,
+    QGroupBox
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QSignalBlocker
 
 from ..models import IdentityEntry
 from .file_attachment_widget import FileAttachmentWidget
 from ..utils import apply_custom_title_bar
 
 
+class _CollapsibleSection(QGroupBox):
+    """A checkable group box that starts collapsed and builds its contents on first expand."""
+    
+    def __init__(self, title: str, build, parent=None):
+        super().__init__(title, parent)
+        self.setCheckable(True)
+        self.setChecked(False)
+        self._build = build
+        self._content = None
+        QVBoxLayout(self)
+        self.toggled.connect(self._on_toggled)
+    
+    def _on_toggled(self, checked: bool):
+        if checked:
+            self._populate()
+        if self._content is not None:
+            self._content.setVisible(checked)
+    
+    def _populate(self):
+        """Create the section's widgets; only runs once."""
+        if self._content is None:
+            self._content = QWidget()
+            self._build(self._content)
+            self.layout().addWidget(self._content)
+    
+    def is_populated(self) -> bool:
+        """Return whether the section's widgets have been created."""
+        return self._content is not None
+
+
 class IdentityEntryDialog(QDialog):
     """Dialog for adding and editing identity entries."""
     
+    _instances = {}  # Pooled dialog per parent widget, see get_instance
+    
+    # (line edit attribute, IdentityEntry field) for each section's single-line fields
+    _PERSONAL_FIELDS = (
+        ('title_edit', 'title'),
+        ('first_name_edit', 'first_name'),
+        ('last_name_edit', 'last_name'),
+        ('email_edit', 'email'),
+        ('phone_edit', 'phone'),
+        ('dob_edit', 'date_of_birth'),
+        ('category_edit', 'category'),
+    )
+    _ADDRESS_FIELDS = (
+        ('address_edit', 'address'),
+        ('city_edit', 'city'),
+        ('state_edit', 'state'),
+        ('zip_code_edit', 'zip_code'),
+        ('country_edit', 'country'),
+    )
+    _GOV_ID_FIELDS = (
+        ('ssn_edit', 'social_security_number'),
+        ('driver_license_edit', 'driver_license'),
+        ('passport_edit', 'passport_number'),
+    )
+    _IDENT_FIELDS = _PERSONAL_FIELDS + _ADDRESS_FIELDS + _GOV_ID_FIELDS
+    # Field values of a new identity; other fields start empty
+    _FIELD_DEFAULTS = {'category': "Identity", 'country': "United States"}
+    
     def __init__(self, identity_entry: IdentityEntry = None, parent=None):
         super().__init__(parent)
         self.identity_entry = identity_entry
+        self._title_bar_applied = False
         self.setup_ui()
         if identity_entry:
             self.load_identity_data()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
+    
+    @classmethod
+    def get_instance(cls, identity_entry: IdentityEntry = None, parent=None) -> "IdentityEntryDialog":
+        """Return the dialog kept for parent, reset to show identity_entry.
+        
+        The dialog is created on first use and reused until its parent is destroyed.
+        """
+        dialog = cls._instances.get(parent)
+        if dialog is None:
+            dialog = cls(identity_entry, parent)
+            cls._instances[parent] = dialog
+            dialog.destroyed.connect(lambda: cls._instances.pop(parent, None))
+        else:
+            dialog.reset_form(identity_entry)
+        return dialog
+    
+    def reset_form(self, identity_entry: IdentityEntry = None):
+        """Clear the form and load identity_entry into it, if given.
+        
+        Sections that were already built are refilled; all of them are collapsed again.
+        """
+        self.identity_entry = identity_entry
+        self.setWindowTitle("Add Identity" if not identity_entry else "Edit Identity")
+        
+        self._load_fields(self._PERSONAL_FIELDS, None)
+        self.notes_edit.clear()
+        self.favorite_checkbox.setChecked(False)
+        
+        if self.address_edit is not None:
+            self._load_fields(self._ADDRESS_FIELDS, identity_entry)
+        if self.ssn_edit is not None:
+            self._load_fields(self._GOV_ID_FIELDS, identity_entry)
+        if self.file_attachment_widget is not None:
+            self.file_attachment_widget.load_files(getattr(identity_entry, 'attached_files', None) or [])
+        self.attachments_section.setTitle(self._attachments_title())
+        for section in (self.address_section, self.gov_ids_section, self.attachments_section):
+            section.setChecked(False)
+        
+        if identity_entry:
+            self.load_identity_data()
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -43,19 +142,16 @@ class IdentityEntryDialog(QDialog):
         form_widget = QWidget()
         layout = QVBoxLayout(form_widget)
         
-        # Form layout
-        form_layout = QFormLayout()
-        
         # Title
+        title_layout = QFormLayout()
         self.title_edit = QLineEdit()
         self.title_edit.setPlaceholderText("e.g., Personal Identity, Work Identity")
-        form_layout.addRow("Title:", self.title_edit)
+        title_layout.addRow("Title:", self.title_edit)
+        layout.addLayout(title_layout)
         
         # Personal Information Section
-        personal_label = QLabel("Personal Information")
-        personal_label.setFont(QFont("Arial", 12, QFont.Bold))
-        personal_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
-        form_layout.addRow(personal_label)
+        personal_group = QGroupBox("Personal Information")
+        form_layout = QFormLayout(personal_group)
         
         # First Name
         self.first_name_edit = QLineEdit()
@@ -82,11 +178,74 @@ class IdentityEntryDialog(QDialog):
         self.dob_edit.setPlaceholderText("MM/DD/YYYY")
         form_layout.addRow("Date of Birth:", self.dob_edit)
         
-        # Address Section
-        address_label = QLabel("Address Information")
-        address_label.setFont(QFont("Arial", 12, QFont.Bold))
-        address_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
-        form_layout.addRow(address_label)
+        layout.addWidget(personal_group)
+        
+        # The remaining sections start collapsed and build their widgets on first expand
+        self.address_edit = self.city_edit = self.state_edit = None
+        self.zip_code_edit = self.country_edit = None
+        self.ssn_edit = self.driver_license_edit = self.passport_edit = None
+        self.file_attachment_widget = None
+        
+        self.address_section = _CollapsibleSection("Address Information", self._build_address_section)
+        layout.addWidget(self.address_section)
+        
+        self.gov_ids_section = _CollapsibleSection("Government IDs", self._build_gov_ids_section)
+        layout.addWidget(self.gov_ids_section)
+        
+        # Category and notes
+        details_layout = QFormLayout()
+        
+        # Category
+        self.category_edit = QLineEdit()
+        self.category_edit.setPlaceholderText("Identity")
+        self.category_edit.setText("Identity")
+        details_layout.addRow("Category:", self.category_edit)
+        
+        # Notes
+        self.notes_edit = QTextEdit()
+        self.notes_edit.setMaximumHeight(100)
+        self.notes_edit.setPlaceholderText("Additional notes about this identity...")
+        details_layout.addRow("Notes:", self.notes_edit)
+        
+        layout.addLayout(details_layout)
+        
+        # File Attachments Section
+        self.attachments_section = _CollapsibleSection(self._attachments_title(), self._build_attachments_section)
+        layout.addWidget(self.attachments_section)
+        
+        # Favorite Checkbox (moved below file attachments)
+        self.favorite_checkbox = QCheckBox("Favorite")
+        layout.addWidget(self.favorite_checkbox)
+        layout.addStretch()
+        
+        # Set the form widget as the scroll area's widget
+        scroll_area.setWidget(form_widget)
+        
+        # Main layout
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(scroll_area)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        
+        self.save_btn = QPushButton("Save")
+        self.save_btn.clicked.connect(self.handle_save)
+        self.save_btn.setObjectName("primaryBtn")
+        
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn.setObjectName("secondaryBtn")
+        
+        button_layout.addWidget(self.save_btn)
+        button_layout.addWidget(self.cancel_btn)
+        
+        main_layout.addLayout(button_layout)
+        self.setLayout(main_layout)
+    
+    def _build_address_section(self, container: QWidget):
+        """Create the address fields, filled from the entry being edited."""
+        form_layout = QFormLayout(container)
+        form_layout.setContentsMargins(0, 0, 0, 0)
         
         # Address
         self.address_edit = QLineEdit()
@@ -111,14 +270,14 @@ class IdentityEntryDialog(QDialog):
         # Country
         self.country_edit = QLineEdit()
         self.country_edit.setPlaceholderText("United States")
-        self.country_edit.setText("United States")
         form_layout.addRow("Country:", self.country_edit)
         
-        # Government IDs Section
-        gov_label = QLabel("Government IDs")
-        gov_label.setFont(QFont("Arial", 12, QFont.Bold))
-        gov_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
-        form_layout.addRow(gov_label)
+        self._load_fields(self._ADDRESS_FIELDS, self.identity_entry)
+    
+    def _build_gov_ids_section(self, container: QWidget):
+        """Create the government ID fields, filled from the entry being edited."""
+        form_layout = QFormLayout(container)
+        form_layout.setContentsMargins(0, 0, 0, 0)
         
         # Social Security Number
         self.ssn_edit = QLineEdit()
@@ -136,170 +295,108 @@ class IdentityEntryDialog(QDialog):
         self.passport_edit.setPlaceholderText("P123456789")
         form_layout.addRow("Passport Number:", self.passport_edit)
         
-        # Category
-        self.category_edit = QLineEdit()
-        self.category_edit.setPlaceholderText("Identity")
-        self.category_edit.setText("Identity")
-        form_layout.addRow("Category:", self.category_edit)
-        
-        # Notes
-        self.notes_edit = QTextEdit()
-        self.notes_edit.setMaximumHeight(100)
-        self.notes_edit.setPlaceholderText("Additional notes about this identity...")
-        form_layout.addRow("Notes:", self.notes_edit)
-        
-        layout.addLayout(form_layout)
-        
-        # File Attachments Section
-        file_label = QLabel("File Attachments")
-        file_label.setFont(QFont("Arial", 12, QFont.Bold))
-        file_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
-        layout.addWidget(file_label)
-        
-        # File attachment widget
+        self._load_fields(self._GOV_ID_FIELDS, self.identity_entry)
+    
+    def _load_fields(self, fields, entry):
+        """Fill (line edit attribute, field) pairs from entry, or with the defaults of a new identity."""
+        for edit_name, field in fields:
+            value = getattr(entry, field) if entry else self._FIELD_DEFAULTS.get(field, "")
+            getattr(self, edit_name).setText(value or "")
+    
+    def _build_attachments_section(self, container: QWidget):
+        """Create the file attachment widget and load the entry's attachments."""
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
         self.file_attachment_widget = FileAttachmentWidget()
-        layout.addWidget(self.file_attachment_widget)
-        
-        # Favorite Checkbox (moved below file attachments)
-        self.favorite_checkbox = QCheckBox("Favorite")
-        layout.addWidget(self.favorite_checkbox)
-        
-        # Set the form widget as the scroll area's widget
-        scroll_area.setWidget(form_widget)
-        
-        # Main layout
-        main_layout = QVBoxLayout()
-        main_layout.addWidget(scroll_area)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        self.save_btn = QPushButton("Save")
-        self.save_btn.clicked.connect(self.handle_save)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078D7; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #005B9C; }
-        """)
-        
-        self.cancel_btn = QPushButton("Cancel")
-        self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6C757D; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #545B62; }
-        """)
+        container_layout.addWidget(self.file_attachment_widget)
+        if getattr(self.identity_entry, 'attached_files', None):
+            self.file_attachment_widget.load_files(self.identity_entry.attached_files)
+    
+    def _attachments_title(self) -> str:
+        """Title of the attachments section, with the entry's attachment count."""
+        count = len(getattr(self.identity_entry, 'attached_files', None) or [])
+        return f"File Attachments ({count})" if count else "File Attachments"
+    
+    def load_identity_data(self):
+        """Load existing identity data into the form.
         
-        button_layout.addWidget(self.save_btn)
-        button_layout.addWidget(self.cancel_btn)
+        Address, government ID and attachment fields are filled when their
+        section is first expanded.
+        """
+        if not self.identity_entry:
+            return
         
-        main_layout.addLayout(button_layout)
-        self.setLayout(main_layout)
+        # Nothing is listening for edits while the form is filled in, and it is repainted once at the end
+        fields = (self.title_edit, self.first_name_edit, self.last_name_edit, self.email_edit,
+                  self.phone_edit, self.dob_edit, self.category_edit, self.notes_edit,
+                  self.favorite_checkbox)
+        self.setUpdatesEnabled(False)
+        try:
+            with ExitStack() as stack:
+                for widget in fields:
+                    stack.enter_context(QSignalBlocker(widget))
+                self._load_fields(self._PERSONAL_FIELDS, self.identity_entry)
+                self.notes_edit.setPlainText(self.identity_entry.notes)
+                self.favorite_checkbox.setChecked(self.identity_entry.is_favorite)
+        finally:
+            self.setUpdatesEnabled(True)
     
-    def load_identity_data(self):
-        """Load existing identity data into the form."""
-        if self.identity_entry:
-            self.title_edit.setText(self.identity_entry.title)
-            self.first_name_edit.setText(self.identity_entry.first_name)
-            self.last_name_edit.setText(self.identity_entry.last_name)
-            self.email_edit.setText(self.identity_entry.email)
-            self.phone_edit.setText(self.identity_entry.phone)
-            self.dob_edit.setText(self.identity_entry.date_of_birth)
-            self.address_edit.setText(self.identity_entry.address)
-            self.city_edit.setText(self.identity_entry.city)
-            self.state_edit.setText(self.identity_entry.state)
-            self.zip_code_edit.setText(self.identity_entry.zip_code)
-            self.country_edit.setText(self.identity_entry.country)
-            self.ssn_edit.setText(self.identity_entry.social_security_number)
-            self.driver_license_edit.setText(self.identity_entry.driver_license)
-            self.passport_edit.setText(self.identity_entry.passport_number)
-            self.category_edit.setText(self.identity_entry.category)
-            self.notes_edit.setPlainText(self.identity_entry.notes)
-            self.favorite_checkbox.setChecked(self.identity_entry.is_favorite)
-            
-            # Load file attachments
-            if hasattr(self.identity_entry, 'attached_files'):
-                self.file_attachment_widget.load_files(self.identity_entry.attached_files)
+    def _field_values(self) -> dict:
+        """Return the form's single-line fields by IdentityEntry field name.
+        
+        Fields in a section that was never built keep the entry's value (or the default of a new identity).
+        """
+        values = {}
+        for edit_name, field in self._IDENT_FIELDS:
+            edit = getattr(self, edit_name)
+            if edit is not None:
+                values[field] = edit.text().strip()
+            elif self.identity_entry:
+                values[field] = getattr(self.identity_entry, field)
+            else:
+                values[field] = self._FIELD_DEFAULTS.get(field, "")
+        return values
+    
+    def get_attached_files(self):
+        """Return the dialog's attachments, without building the widget if it was never needed."""
+        if self.file_attachment_widget is not None:
+            return self.file_attachment_widget.get_files()
+        return list(getattr(self.identity_entry, 'attached_files', None) or [])
     
     def handle_save(self):
         """Handle saving the identity entry."""
-        title = self.title_edit.text().strip()
-        first_name = self.first_name_edit.text().strip()
-        last_name = self.last_name_edit.text().strip()
-        email = self.email_edit.text().strip()
-        phone = self.phone_edit.text().strip()
-        dob = self.dob_edit.text().strip()
-        address = self.address_edit.text().strip()
-        city = self.city_edit.text().strip()
-        state = self.state_edit.text().strip()
-        zip_code = self.zip_code_edit.text().strip()
-        country = self.country_edit.text().strip()
-        ssn = self.ssn_edit.text().strip()
-        driver_license = self.driver_license_edit.text().strip()
-        passport = self.passport_edit.text().strip()
-        category = self.category_edit.text().strip()
+        values = self._field_values()
         notes = self.notes_edit.toPlainText().strip()
         is_favorite = self.favorite_checkbox.isChecked()
         
         # Get file attachments
-        attached_files = self.file_attachment_widget.get_files()
+        attached_files = self.get_attached_files()
         
         # Validation
-        if not title:
+        if not values['title']:
             QMessageBox.warning(self, "Missing Information", "Please enter a title for the identity.")
             return
         
-        if not first_name:
+        if not values['first_name']:
             QMessageBox.warning(self, "Missing Information", "Please enter the first name.")
             return
         
-        if not last_name:
+        if not values['last_name']:
             QMessageBox.warning(self, "Missing Information", "Please enter the last name.")
             return
         
         # Create or update identity entry
         if self.identity_entry:
             # Update existing entry
-            self.identity_entry.title = title
-            self.identity_entry.first_name = first_name
-            self.identity_entry.last_name = last_name
-            self.identity_entry.email = email
-            self.identity_entry.phone = phone
-            self.identity_entry.date_of_birth = dob
-            self.identity_entry.address = address
-            self.identity_entry.city = city
-            self.identity_entry.state = state
-            self.identity_entry.zip_code = zip_code
-            self.identity_entry.country = country
-            self.identity_entry.social_security_number = ssn
-            self.identity_entry.driver_license = driver_license
-            self.identity_entry.passport_number = passport
-            self.identity_entry.category = category
+            for field, value in values.items():
+                setattr(self.identity_entry, field, value)
             self.identity_entry.notes = notes
             self.identity_entry.is_favorite = is_favorite
             self.identity_entry.attached_files = attached_files
         else:
             # Create new entry
             self.identity_entry = IdentityEntry(
-                title=title,
-                first_name=first_name,
-                last_name=last_name,
-                email=email,
-                phone=phone,
-                address=address,
-                city=city,
-                state=state,
-                zip_code=zip_code,
-                country=country,
-                date_of_birth=dob,
-                social_security_number=ssn,
-                driver_license=driver_license,
-                passport_number=passport,
-                category=category,
+                **values,
                 notes=notes,
                 is_favorite=is_favorite,
                 attached_files=attached_files
@@ -307,11 +404,28 @@ class IdentityEntryDialog(QDialog):
         
         self.accept() 
 
+    def done(self, result: int):
+        """Close the dialog and clear the form, so the pooled instance keeps no identity data while hidden.
+        
+        A saved entry is kept until the caller collects it with take_entry().
+        """
+        super().done(result)
+        saved = self.identity_entry if result == QDialog.Accepted else None
+        self.reset_form(None)
+        self.identity_entry = saved
+    
+    def take_entry(self) -> IdentityEntry:
+        """Return the saved identity entry and drop the dialog's reference to it."""
+        entry, self.identity_entry = self.identity_entry, None
+        return entry
+
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
         apply_custom_title_bar(self)
 
     def showEvent(self, event):
         super().showEvent(event)
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(100, self.customize_title_bar) 
\ No newline at end of file
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar() 
\ No newline at end of file
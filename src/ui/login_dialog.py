@@ -3,50 +3,121 @@ Login Dialog
 Dialog for user login and registration.
 """
 
-import sys
 import random
 from datetime import datetime
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-    QPushButton, QMessageBox, QInputDialog
+    QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
 )
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QCursor, QPixmap, QFontDatabase, QPalette, QColor
-from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QFont, QPixmap, QFontDatabase, QPalette, QColor
 
 from ..core import UserManager
-from .welcome_dialog import WelcomeDialog
+from ..utils import apply_custom_title_bar
 from src.utils.resource_path import resource_path
 
+_greeting_font_loaded = False  # Whether Jua-Regular.ttf has been registered with QFontDatabase
+
+# Greetings for each time of day, indexed by _time_of_day()
+_MORNING, _AFTERNOON, _EVENING = range(3)
+_GREETINGS = (
+    (
+        "Good morning! ☀️",
+        "Rise and shine! 🌅",
+        "Morning vibes! 🌞",
+        "Good morning, ready to secure your day? 🔐",
+        "Welcome to a new day! ✨",
+        "Morning security check! 🛡️",
+        "Good morning, let's keep it safe! 🔒",
+        "Rise and secure! 🌅",
+    ),
+    (
+        "Good afternoon! 🌤️",
+        "Afternoon security! 🛡️",
+        "Good afternoon, staying secure? 🔐",
+        "Afternoon vibes! ☀️",
+        "Welcome back! 🔒",
+        "Afternoon check-in! ✨",
+        "Good afternoon, ready to protect? 🛡️",
+        "Secure afternoon! 🔐",
+    ),
+    (
+        "Good evening! 🌙",
+        "Evening security! 🛡️",
+        "Good evening, time to secure! 🔐",
+        "Evening vibes! 🌆",
+        "Welcome to the evening! ✨",
+        "Evening check-in! 🔒",
+        "Good evening, staying protected? 🛡️",
+        "Secure evening! 🌙",
+    ),
+)
+
+
+def _load_greeting_font():
+    """Register the bundled Jua font with the application, once per process."""
+    global _greeting_font_loaded
+    if not _greeting_font_loaded:
+        _greeting_font_loaded = True
+        QFontDatabase.addApplicationFont(resource_path("Jua-Regular.ttf"))
+
+
+def _time_of_day(hour: int) -> int:
+    """Return _MORNING, _AFTERNOON or _EVENING for an hour of the day."""
+    if 5 <= hour < 12:
+        return _MORNING
+    if 12 <= hour < 18:
+        return _AFTERNOON
+    return _EVENING
+
 
 class LoginDialog(QDialog):
     """Dialog for user login and registration."""
     
+    _STYLE_STATUS = "color: red;"
+    _STYLE_GREETING = "color: #60A3D9; margin: 0 10px 10px 10px;"
+    
+    _logo_pixmap = None  # Logo scaled for the dialog, shared by all instances once loaded
+    _dark_palette = None  # Dialog palette, shared by all instances once built
+    _instances = {}  # Pooled dialog per parent widget, see get_instance
+    
     def __init__(self, user_manager: UserManager, parent=None):
         super().__init__(parent)
         self.user_manager = user_manager
-        self.master_password = ""
+        self.master_password = None  # Verified password as a UTF-8 bytearray, taken by the caller
         self.is_new_user = False
+        self._title_bar_applied = False
+        self._centered = False
+        self._greeting_time_of_day = None  # Time of day of the greeting shown, see update_greeting
         # Ensure the dialog is a top-level window
         self.setWindowFlags(self.windowFlags() | Qt.Window)
-        # Set a dark palette for the dialog
-        palette = QPalette()
-        palette.setColor(QPalette.Window, QColor(20, 30, 48))
-        palette.setColor(QPalette.WindowText, QColor(236, 240, 241))
-        self.setPalette(palette)
-        # Use the Fusion style for better dark mode support
-        QApplication.setStyle("Fusion")
+        # Set a dark palette for the dialog (main() already applies the Fusion style app-wide)
+        self.setPalette(self._get_dark_palette())
         # Initialize status_label here to guarantee its existence
         self.status_label = QLabel("")
         
         self.setup_ui()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
-        # Center the dialog on the screen
-        qr = self.frameGeometry()
-        cp = QApplication.primaryScreen().availableGeometry().center()
-        qr.moveCenter(cp)
-        self.move(qr.topLeft())
+    
+    @classmethod
+    def get_instance(cls, user_manager: UserManager, parent=None) -> "LoginDialog":
+        """Return the dialog kept for parent, reset for a new login.
+        
+        The dialog is created on first use and reused until its parent is destroyed.
+        """
+        dialog = cls._instances.get(parent)
+        if dialog is None:
+            dialog = cls(user_manager, parent)
+            cls._instances[parent] = dialog
+            dialog.destroyed.connect(lambda: cls._instances.pop(parent, None))
+        else:
+            dialog.reset_form(user_manager)
+        return dialog
+    
+    def reset_form(self, user_manager: UserManager):
+        """Forget the previous login and clear the password field."""
+        self.user_manager = user_manager
+        self.master_password = None
+        self.password_edit.clear()
+        self.update_greeting()
     
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
@@ -54,33 +125,43 @@ class LoginDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown and ensure initial state is set after UI is visible
-        QTimer.singleShot(100, self.customize_title_bar)
-        QTimer.singleShot(100, self.show_login_state) # Call after short delay to ensure UI is ready
+        if not self._centered:
+            # Center the dialog on the screen; its size is final by now, and the native
+            # window is only shown after this event, so it appears in place
+            self._centered = True
+            self.move(QApplication.primaryScreen().availableGeometry().center() - self.rect().center())
+        # Runs once the show has been processed, without a fixed delay
+        QTimer.singleShot(0, self._post_show)
+    
+    def _post_show(self):
+        """Style the title bar on the first show and reset the dialog to its login state."""
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
+        self.show_login_state()
     
     def setup_ui(self):
         """Setup the user interface."""
         # Add font to QFontDatabase
-        QFontDatabase.addApplicationFont("Jua-Regular.ttf")
+        _load_greeting_font()
 
         self.setWindowTitle("LuckeePass - Login")
         self.setModal(True)
         self.setFixedWidth(400)
-        self.resize(400, 300)
         
         layout = QVBoxLayout()
         
         # Configure status_label (already initialized in __init__)
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet("color: red;")
+        self.status_label.setStyleSheet(self._STYLE_STATUS)
         layout.addWidget(self.status_label)
         
         # Logo
         self.logo_label = QLabel()
         self.logo_label.setMinimumHeight(110)
-        pixmap = QPixmap(resource_path("images/luckeepasslogo.png"))
+        pixmap = self._get_logo_pixmap()
         if not pixmap.isNull():
-            self.logo_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.logo_label.setPixmap(pixmap)
             self.logo_label.setAlignment(Qt.AlignCenter)
             layout.addWidget(self.logo_label)
 
@@ -91,7 +172,7 @@ class LoginDialog(QDialog):
         self.greeting_label.setAlignment(Qt.AlignCenter)
         self.greeting_label.setWordWrap(True)
         self.greeting_label.setFont(QFont("Jua", 16, QFont.Bold))
-        self.greeting_label.setStyleSheet("color: #60A3D9; margin: 0 10px 10px 10px;")
+        self.greeting_label.setStyleSheet(self._STYLE_GREETING)
         self.update_greeting()
         layout.addWidget(self.greeting_label)
 
@@ -116,83 +197,63 @@ class LoginDialog(QDialog):
         # Connect enter key
         self.password_edit.returnPressed.connect(self.try_login)
 
+    @classmethod
+    def _get_dark_palette(cls) -> QPalette:
+        """Return the dialog's dark palette, building it only once per process."""
+        if cls._dark_palette is None:
+            palette = QPalette()
+            palette.setColor(QPalette.Window, QColor(20, 30, 48))
+            palette.setColor(QPalette.WindowText, QColor(236, 240, 241))
+            cls._dark_palette = palette
+        return cls._dark_palette
+    
+    @classmethod
+    def _get_logo_pixmap(cls) -> QPixmap:
+        """Return the logo scaled to 100x100, loading and scaling it only once per process."""
+        if cls._logo_pixmap is None:
+            pixmap = QPixmap(resource_path("images/luckeepasslogo.png"))
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            cls._logo_pixmap = pixmap
+        return cls._logo_pixmap
+    
     def show_login_state(self):
         """Configure dialog for login (master password already set)."""
         self.setWindowTitle("LuckeePass - Login")
         self.status_label.setText("")
         
         self.login_btn.setText("Login")
-        try: self.login_btn.clicked.disconnect() 
-        except TypeError: pass # Ignore if no connection exists
-        self.login_btn.clicked.connect(self.try_login)
 
     def try_login(self):
         """Attempt to login with current master password."""
-        master_password = self.password_edit.text()
+        password_bytes = bytearray(self.password_edit.text(), "utf-8")
         
-        if not master_password:
+        if not password_bytes:
             self.status_label.setText("Please enter your master password")
             return
         
-        if self.user_manager.verify_master_password(master_password):
-            self.master_password = master_password
+        verified = False
+        try:
+            verified = self.user_manager.verify_master_password(password_bytes)
+        finally:
+            if verified:
+                # Handed over as bytes, so the caller can zero it once it is used
+                self.master_password = password_bytes
+            else:
+                password_bytes[:] = bytes(len(password_bytes))  # Zero the encoded copy
+        # Clear the field either way, so the pooled dialog does not keep the password
+        self.password_edit.clear()
+        if verified:
             self.accept()
         else:
             self.status_label.setText("Invalid master password")
-            self.password_edit.clear()  # Clear for security 
 
     def update_greeting(self):
-        """Update the greeting label with a time-appropriate message."""
-        current_time = datetime.now().strftime('%H:%M')
-        greeting = self.get_random_greeting(current_time)
-        self.greeting_label.setText(greeting)
-
-    def get_greeting_based_on_time(self, current_time):
-        """Determine a greeting based on the current time."""
-        hour = int(current_time.split(':')[0])
-        if 5 <= hour < 12:
-            return "morning"
-        elif 12 <= hour < 18:
-            return "afternoon"
-        else:
-            return "evening"
-    
-    def get_random_greeting(self, current_time):
-        """Get a random greeting based on the time of day."""
-        hour = int(current_time.split(':')[0])
-        
-        if 5 <= hour < 12:
-            greetings = [
-                "Good morning! ☀️",
-                "Rise and shine! 🌅",
-                "Morning vibes! 🌞",
-                "Good morning, ready to secure your day? 🔐",
-                "Welcome to a new day! ✨",
-                "Morning security check! 🛡️",
-                "Good morning, let's keep it safe! 🔒",
-                "Rise and secure! 🌅"
-            ]
-        elif 12 <= hour < 18:
-            greetings = [
-                "Good afternoon! 🌤️",
-                "Afternoon security! 🛡️",
-                "Good afternoon, staying secure? 🔐",
-                "Afternoon vibes! ☀️",
-                "Welcome back! 🔒",
-                "Afternoon check-in! ✨",
-                "Good afternoon, ready to protect? 🛡️",
-                "Secure afternoon! 🔐"
-            ]
-        else:
-            greetings = [
-                "Good evening! 🌙",
-                "Evening security! 🛡️",
-                "Good evening, time to secure! 🔐",
-                "Evening vibes! 🌆",
-                "Welcome to the evening! ✨",
-                "Evening check-in! 🔒",
-                "Good evening, staying protected? 🛡️",
-                "Secure evening! 🌙"
-            ]
+        """Update the greeting label with a time-appropriate message.
         
-        return random.choice(greetings) 
\ No newline at end of file
+        The greeting is only picked again when the time of day has changed since the last one.
+        """
+        time_of_day = _time_of_day(datetime.now().hour)
+        if time_of_day != self._greeting_time_of_day:
+            self._greeting_time_of_day = time_of_day
+            self.greeting_label.setText(random.choice(_GREETINGS[time_of_day]))
@@ -9,7 +9,7 @@ from datetime import datetime
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-    QPushButton, QTabWidget, QTableWidget, QTableWidgetItem,
+    QPushButton, QTabWidget, QTableView,
     QMessageBox, QFileDialog, QGroupBox, QApplication, QDialog,
     QListWidget, QListWidgetItem, QStackedWidget, QMenu, QInputDialog,
     QCheckBox, QSizePolicy, QHeaderView, QMainWindow
@@ -17,7 +17,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QIcon, QFont, QPixmap, QImage
 from PySide6.QtCore import Qt, QTimer, QSettings
 
-from ..core import UserManager, PasswordManager
+from ..core import UserManager, PasswordManager, EncryptionManager, UnsupportedVaultError
 from ..models import PasswordEntry, SecureNote, CardEntry, IdentityEntry
 from .login_dialog import LoginDialog
 from .password_entry_dialog import PasswordEntryDialog
@@ -28,8 +28,27 @@ from .welcome_dialog import WelcomeDialog
 from .startup_choice_dialog import StartupChoiceDialog
 from .welcome_back_dialog import WelcomeBackDialog
 from .custom_message_box import CustomMessageBox
+from .entry_table_models import (
+    PasswordTableModel, NotesTableModel, CardsTableModel, IdentitiesTableModel, FavoritesTableModel
+)
 from src.utils.resource_path import resource_path, get_appdata_path
-from src.utils.formatting import format_card_number, format_phone_number
+
+# Entries converted from a legacy JSON file between two runs of the event loop
+_CONVERT_EVENTS_INTERVAL = 500
+
+
+def _consume_json_items(items: list):
+    """Yield the items of a list parsed from a legacy JSON file, dropping each once converted.
+    
+    The event loop runs every _CONVERT_EVENTS_INTERVAL items so that the application keeps
+    responding while a large file is converted.
+    """
+    for index in range(len(items)):
+        item = items[index]
+        items[index] = None  # The converted entry replaces the parsed item in memory
+        yield item
+        if (index + 1) % _CONVERT_EVENTS_INTERVAL == 0:
+            QApplication.processEvents()
 
 
 class MainWindow(QMainWindow):
@@ -49,6 +68,12 @@ class MainWindow(QMainWindow):
 
         # Initialize settings for saving column widths
         self.settings = QSettings("LuckeePass", "ColumnSizes")
+        # Column widths not yet written to settings, flushed once resizing pauses
+        self._pending_column_widths = {}
+        self._column_flush_timer = QTimer(self)
+        self._column_flush_timer.setSingleShot(True)
+        self._column_flush_timer.setInterval(500)
+        self._column_flush_timer.timeout.connect(self._flush_column_widths)
 
         self.setup_ui()
         # Center the main window on the screen
@@ -102,7 +127,13 @@ class MainWindow(QMainWindow):
         # Global Search Bar in sidebar
         self.global_search_edit = QLineEdit()
         self.global_search_edit.setPlaceholderText("Search Vault")
-        self.global_search_edit.textChanged.connect(self.global_search)
+        # Search once typing pauses instead of on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.global_search)
+        self._last_search = None  # (tab index, text) of the last search run, see global_search
+        self.global_search_edit.textChanged.connect(lambda _text: self._search_timer.start())
         self.global_search_edit.setStyleSheet("padding: 5px; border-radius: 3px; border: 1px solid #3A4C60; background-color: #1E2B38; color: white;") # Added stylesheet for padding and styling
         sidebar_layout.addWidget(self.global_search_edit)
         
@@ -207,14 +238,25 @@ class MainWindow(QMainWindow):
                         self.save_column_widths(table_obj, table_key)
                 )
 
-    def save_column_widths(self, table: QTableWidget, settings_key: str):
-        """Save the current column widths of a QTableWidget."""
+    def save_column_widths(self, table: QTableView, settings_key: str):
+        """Save the current column widths of a table.
+        
+        Widths are written to settings 500 ms after the last call, so dragging a column
+        border does not write them once per pixel.
+        """
         header = table.horizontalHeader()
-        column_widths = [header.sectionSize(i) for i in range(header.count())]
-        self.settings.setValue(settings_key, column_widths)
-
-    def load_column_widths(self, table: QTableWidget, settings_key: str):
-        """Load and apply saved column widths to a QTableWidget."""
+        self._pending_column_widths[settings_key] = [header.sectionSize(i) for i in range(header.count())]
+        self._column_flush_timer.start()
+    
+    def _flush_column_widths(self):
+        """Write the column widths queued by save_column_widths to settings."""
+        self._column_flush_timer.stop()
+        for settings_key, column_widths in self._pending_column_widths.items():
+            self.settings.setValue(settings_key, column_widths)
+        self._pending_column_widths.clear()
+
+    def load_column_widths(self, table: QTableView, settings_key: str):
+        """Load and apply saved column widths to a table."""
         column_widths = self.settings.value(settings_key)
         if column_widths and isinstance(column_widths, list):
             header = table.horizontalHeader()
@@ -222,21 +264,6 @@ class MainWindow(QMainWindow):
                 if i < header.count():
                     header.resizeSection(i, int(width))
 
-    def closeEvent(self, event):
-        """Override close event to save column widths."""
-        table_keys = [
-            "password_table",
-            "notes_table",
-            "cards_table",
-            "identities_table",
-            "favorites_table",
-        ]
-        for key_str in table_keys:
-            table = getattr(self, key_str)
-            if table is not None:
-                self.save_column_widths(table, key_str)
-        super().closeEvent(event)
-
     def create_new_button(self, action_function):
         """Create a + New button with the specified action."""
         new_button = QPushButton("+ New")
@@ -289,10 +316,16 @@ class MainWindow(QMainWindow):
                 sys.exit()
         else:
             # Show login dialog for existing users
-            dialog = LoginDialog(self.user_manager, self)
+            dialog = LoginDialog.get_instance(self.user_manager, self)
             
             if dialog.exec() == QDialog.Accepted:
-                self.password_manager = PasswordManager(dialog.master_password, self.user_manager)
+                # Take the password off the pooled dialog and zero its bytes once used
+                password_bytes, dialog.master_password = dialog.master_password, None
+                try:
+                    # PasswordManager takes the password as text
+                    self.password_manager = PasswordManager(password_bytes.decode("utf-8"), self.user_manager)
+                finally:
+                    password_bytes[:] = bytes(len(password_bytes))
                 self.password_manager.data_file = get_appdata_path("luckeepass_data.lp")
                 self.setWindowTitle("LuckeePass")
                 
@@ -307,6 +340,8 @@ class MainWindow(QMainWindow):
                         self.statusBar().showMessage("Ready to add logins, notes, cards, and identities")
                     else:
                         self.statusBar().showMessage(f"Loaded {len(self.password_manager.passwords)} logins, {len(self.password_manager.notes)} notes, {len(self.password_manager.cards)} cards, and {len(self.password_manager.identities)} identities")
+                except UnsupportedVaultError as e:
+                    self.handle_unsupported_vault(e)
                 except Exception as e:
                     print(f"Error loading data: {str(e)}")
                     self.handle_data_loading_issue()
@@ -328,6 +363,8 @@ class MainWindow(QMainWindow):
                 self.password_manager.load_data()
                 self.refresh_data()
                 self.statusBar().showMessage("Welcome! Ready to add your first logins, notes, cards, and identities")
+            except UnsupportedVaultError as e:
+                self.handle_unsupported_vault(e)
             except Exception as e:
                 print(f"Error loading data: {str(e)}")
                 self.handle_data_loading_issue()
@@ -361,7 +398,6 @@ class MainWindow(QMainWindow):
 
     def convert_old_json_data(self):
         """Convert old JSON data files to the new LP format if they exist."""
-        import json
         import os
         
         # Check for old JSON data files
@@ -371,8 +407,8 @@ class MainWindow(QMainWindow):
         for json_file in json_files:
             if os.path.exists(json_file):
                 try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
+                    with open(json_file, 'rb') as f:
+                        data = PasswordManager._load_json(f.read())
                     
                     # Check if this is a valid LuckeePass data file
                     if data.get('app_name') == 'LuckeePass':
@@ -380,7 +416,7 @@ class MainWindow(QMainWindow):
                         
                         # Convert the data to the new format
                         if 'passwords' in data and data['passwords']:
-                            for entry_data in data['passwords']:
+                            for entry_data in _consume_json_items(data['passwords']):
                                 # Create PasswordEntry objects from the JSON data
                                 from ..models import PasswordEntry
                                 entry = PasswordEntry(
@@ -399,10 +435,9 @@ class MainWindow(QMainWindow):
                                     entry.modified = entry_data['modified']
                                 
                                 self.password_manager.passwords.append(entry)
-                                self.password_manager.categories.add(entry.category)
                         
                         if 'notes' in data and data['notes']:
-                            for note_data in data['notes']:
+                            for note_data in _consume_json_items(data['notes']):
                                 # Create SecureNote objects from the JSON data
                                 from ..models import SecureNote
                                 note = SecureNote(
@@ -418,10 +453,9 @@ class MainWindow(QMainWindow):
                                     note.modified = note_data['modified']
                                 
                                 self.password_manager.notes.append(note)
-                                self.password_manager.categories.add(note.category)
                         
                         if 'cards' in data and data['cards']:
-                            for card_data in data['cards']:
+                            for card_data in _consume_json_items(data['cards']):
                                 # Create CardEntry objects from the JSON data
                                 from ..models import CardEntry
                                 card = CardEntry(
@@ -443,10 +477,9 @@ class MainWindow(QMainWindow):
                                     card.modified = card_data['modified']
                                 
                                 self.password_manager.cards.append(card)
-                                self.password_manager.categories.add(card.category)
                         
                         if 'identities' in data and data['identities']:
-                            for identity_data in data['identities']:
+                            for identity_data in _consume_json_items(data['identities']):
                                 # Create IdentityEntry objects from the JSON data
                                 from ..models import IdentityEntry
                                 identity = IdentityEntry(
@@ -475,16 +508,15 @@ class MainWindow(QMainWindow):
                                     identity.modified = identity_data['modified']
                                 
                                 self.password_manager.identities.append(identity)
-                                self.password_manager.categories.add(identity.category)
                         
                         if 'files' in data and data['files']:
-                            for file_data in data['files']:
+                            for file_data in _consume_json_items(data['files']):
                                 # Create FileEntry objects from the JSON data
                                 from ..models import FileEntry
                                 import base64
                                 
-                                # Decode base64 file data
-                                file_bytes = base64.b64decode(file_data.get('file_data', ''))
+                                # Decode base64 file data, releasing the encoded text right away
+                                file_bytes = base64.b64decode(file_data.pop('file_data', ''))
                                 
                                 file_entry = FileEntry(
                                     title=file_data.get('title', ''),
@@ -503,8 +535,9 @@ class MainWindow(QMainWindow):
                                     file_entry.modified = file_data['modified']
                                 
                                 self.password_manager.files.append(file_entry)
-                                self.password_manager.categories.add(file_entry.category)
                         
+                        self.password_manager.rebuild_categories()
+                        self.password_manager.rebuild_favorites()
                         converted_data = True
                         print(f"Successfully converted data from {json_file}")
                         
@@ -532,6 +565,15 @@ class MainWindow(QMainWindow):
         if converted_data:
             self.statusBar().showMessage("Successfully converted old data format to new format", 5000)
 
+    def handle_unsupported_vault(self, error: UnsupportedVaultError):
+        """Explain why the vault cannot be opened and exit without touching it."""
+        QMessageBox.critical(
+            self, "Unsupported Vault",
+            f"Your vault could not be opened:\n{str(error)}\n\n"
+            "Your data has not been changed. Install the missing package and start LuckeePass again."
+        )
+        sys.exit()
+    
     def handle_data_loading_issue(self):
         """Handle data loading issues gracefully."""
         reply = QMessageBox.question(
@@ -552,6 +594,7 @@ class MainWindow(QMainWindow):
             self.password_manager.identities = []
             self.password_manager.files = []
             self.password_manager.categories = set()
+            self.password_manager.rebuild_favorites()
             self.refresh_data()
             self.statusBar().showMessage("Started with fresh data")
         else:
@@ -568,155 +611,67 @@ class MainWindow(QMainWindow):
     
     def refresh_passwords(self):
         """Refresh password table."""
-        self.password_table.setRowCount(len(self.password_manager.passwords))
-        col_count = self.password_table.columnCount()
-        for i, entry in enumerate(self.password_manager.passwords):
-            self.password_table.setItem(i, 0, QTableWidgetItem(entry.title))
-            self.password_table.setItem(i, 1, QTableWidgetItem(entry.username))
-            self.password_table.setItem(i, 2, QTableWidgetItem("*" * len(entry.password)))
-            self.password_table.setItem(i, 3, QTableWidgetItem(entry.url))
-            self.password_table.setItem(i, 4, QTableWidgetItem(entry.category))
-            self.password_table.setItem(i, 5, QTableWidgetItem(entry.modified[:10]))
-        # No per-item styling
+        self.password_model.set_entries(self.password_manager.passwords)
+        if self.global_search_edit.text():
+            self.filter_passwords()  # Resetting the model shows all rows again
     
     def refresh_notes(self):
         """Refresh notes table."""
-        self.notes_table.setRowCount(len(self.password_manager.notes))
-        col_count = self.notes_table.columnCount()
-        for i, note in enumerate(self.password_manager.notes):
-            self.notes_table.setItem(i, 0, QTableWidgetItem(note.title))
-            self.notes_table.setItem(i, 1, QTableWidgetItem(note.category))
-            self.notes_table.setItem(i, 2, QTableWidgetItem(note.modified[:10]))
-        # No per-item styling
+        self.notes_model.set_entries(self.password_manager.notes)
+        if self.global_search_edit.text():
+            self.filter_notes()  # Resetting the model shows all rows again
     
     def refresh_cards(self):
         """Refresh cards table."""
-        self.cards_table.setRowCount(len(self.password_manager.cards))
-        col_count = self.cards_table.columnCount()
-        for i, card in enumerate(self.password_manager.cards):
-            self.cards_table.setItem(i, 0, QTableWidgetItem(card.title))
-            self.cards_table.setItem(i, 1, QTableWidgetItem(card.card_type))
-            # Mask card number except last 4 digits, but format the visible part
-            if card.card_number and len(card.card_number) >= 4:
-                digits = ''.join(filter(str.isdigit, card.card_number))
-                if len(digits) > 4:
-                    masked = '**** ' * ((len(digits) - 1) // 4)
-                    last4 = digits[-4:]
-                    display_number = f"{masked}{last4}".strip()
-                else:
-                    display_number = digits
-                display_number = format_card_number(display_number)
-            else:
-                display_number = card.card_number
-            self.cards_table.setItem(i, 2, QTableWidgetItem(display_number))
-            self.cards_table.setItem(i, 3, QTableWidgetItem(card.cardholder_name))
-            self.cards_table.setItem(i, 4, QTableWidgetItem(f"{card.expiry_month}/{card.expiry_year}"))
-            self.cards_table.setItem(i, 5, QTableWidgetItem(card.category))
-            self.cards_table.setItem(i, 6, QTableWidgetItem(card.modified[:10]))
-        # No per-item styling
+        self.cards_model.set_entries(self.password_manager.cards)
+        if self.global_search_edit.text():
+            self.filter_cards()  # Resetting the model shows all rows again
     
     def refresh_identities(self):
         """Refresh identities table."""
-        self.identities_table.setRowCount(len(self.password_manager.identities))
-        col_count = self.identities_table.columnCount()
-        for i, identity in enumerate(self.password_manager.identities):
-            self.identities_table.setItem(i, 0, QTableWidgetItem(identity.title))
-            full_name = f"{identity.first_name} {identity.last_name}".strip()
-            self.identities_table.setItem(i, 1, QTableWidgetItem(full_name))
-            self.identities_table.setItem(i, 2, QTableWidgetItem(identity.email))
-            # Mask phone number except last 4 digits, but format the visible part
-            if identity.phone and len(identity.phone) >= 4:
-                digits = ''.join(filter(str.isdigit, identity.phone))
-                if len(digits) > 4:
-                    masked = '*' * (len(digits) - 4) + digits[-4:]
-                    # Format as ***-***-1234 if possible
-                    if len(masked) == 10:
-                        display_phone = f"***-***-{masked[-4:]}"
-                    else:
-                        display_phone = masked
-                else:
-                    display_phone = digits
-                display_phone = format_phone_number(display_phone)
-            else:
-                display_phone = identity.phone
-            self.identities_table.setItem(i, 3, QTableWidgetItem(display_phone))
-            self.identities_table.setItem(i, 4, QTableWidgetItem(identity.category))
-            self.identities_table.setItem(i, 5, QTableWidgetItem(identity.modified[:10]))
-        # No per-item styling
+        self.identities_model.set_entries(self.password_manager.identities)
+        if self.global_search_edit.text():
+            self.filter_identities()  # Resetting the model shows all rows again
     
     def refresh_favorites(self):
         """Refresh favorites table."""
-        self.favorites_table.setRowCount(len(self.password_manager.favorites))
-        col_count = self.favorites_table.columnCount()
-        for i, fav in enumerate(self.password_manager.favorites):
-            self.favorites_table.setItem(i, 0, QTableWidgetItem(fav.title))
-            self.favorites_table.setItem(i, 1, QTableWidgetItem(fav.type))
-            self.favorites_table.setItem(i, 2, QTableWidgetItem(fav.category))
-            self.favorites_table.setItem(i, 3, QTableWidgetItem(fav.modified[:10]))
-        # No per-item styling
+        self.favorites_model.set_entries(self.password_manager.favorites)
+        if self.global_search_edit.text():
+            self.filter_favorites()  # Resetting the model shows all rows again
+    
+    def apply_row_filter(self, table: QTableView, matches):
+        """Show the rows of table whose entry matches and hide the others.
+        
+        Only rows whose visibility changes are touched, and the table is repainted once
+        afterwards instead of after every row.
+        """
+        table.setUpdatesEnabled(False)
+        try:
+            for i, match in enumerate(matches):
+                if table.isRowHidden(i) == match:
+                    table.setRowHidden(i, not match)
+        finally:
+            table.setUpdatesEnabled(True)
     
     def filter_passwords(self):
         """Filter passwords based on search text."""
-        search_text = self.global_search_edit.text().lower()
-        
-        for i in range(self.password_table.rowCount()):
-            title = self.password_table.item(i, 0).text().lower()
-            username = self.password_table.item(i, 1).text().lower()
-            url = self.password_table.item(i, 3).text().lower()
-            category = self.password_table.item(i, 4).text().lower()
-            
-            if (search_text in title or search_text in username or 
-                search_text in url or search_text in category):
-                self.password_table.setRowHidden(i, False)
-            else:
-                self.password_table.setRowHidden(i, True)
+        matches = self.password_manager.search('passwords', self.global_search_edit.text())
+        self.apply_row_filter(self.password_table, matches)
     
     def filter_notes(self):
         """Filter notes based on search text."""
-        search_text = self.global_search_edit.text().lower()
-        
-        for i in range(self.notes_table.rowCount()):
-            title = self.notes_table.item(i, 0).text().lower()
-            category = self.notes_table.item(i, 1).text().lower()
-            
-            if search_text in title or search_text in category:
-                self.notes_table.setRowHidden(i, False)
-            else:
-                self.notes_table.setRowHidden(i, True)
+        matches = self.password_manager.search('notes', self.global_search_edit.text())
+        self.apply_row_filter(self.notes_table, matches)
     
     def filter_cards(self):
         """Filter cards based on search text."""
-        search_text = self.global_search_edit.text().lower()
-        
-        for i in range(self.cards_table.rowCount()):
-            title = self.cards_table.item(i, 0).text().lower()
-            card_type = self.cards_table.item(i, 1).text().lower()
-            cardholder = self.cards_table.item(i, 3).text().lower()
-            category = self.cards_table.item(i, 5).text().lower()
-            
-            if (search_text in title or search_text in card_type or 
-                search_text in cardholder or search_text in category):
-                self.cards_table.setRowHidden(i, False)
-            else:
-                self.cards_table.setRowHidden(i, True)
+        matches = self.password_manager.search('cards', self.global_search_edit.text())
+        self.apply_row_filter(self.cards_table, matches)
     
     def filter_identities(self):
         """Filter identities based on search text."""
-        search_text = self.global_search_edit.text().lower()
-        
-        for i in range(self.identities_table.rowCount()):
-            title = self.identities_table.item(i, 0).text().lower()
-            name = self.identities_table.item(i, 1).text().lower()
-            email = self.identities_table.item(i, 2).text().lower()
-            phone = self.identities_table.item(i, 3).text().lower()
-            category = self.identities_table.item(i, 4).text().lower()
-            
-            if (search_text in title or search_text in name or 
-                search_text in email or search_text in phone or 
-                search_text in category):
-                self.identities_table.setRowHidden(i, False)
-            else:
-                self.identities_table.setRowHidden(i, True)
+        matches = self.password_manager.search('identities', self.global_search_edit.text())
+        self.apply_row_filter(self.identities_table, matches)
     
     def add_password(self):
         """Add a new password entry."""
@@ -729,7 +684,7 @@ class MainWindow(QMainWindow):
     
     def edit_password(self):
         """Edit the selected password entry."""
-        current_row = self.password_table.currentRow()
+        current_row = self.password_table.currentIndex().row()
         if current_row >= 0:
             password = self.password_manager.passwords[current_row]
             dialog = PasswordEntryDialog(password, parent=self)
@@ -743,7 +698,7 @@ class MainWindow(QMainWindow):
     
     def delete_password(self):
         """Delete the selected password entry."""
-        current_row = self.password_table.currentRow()
+        current_row = self.password_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Delete Login",
@@ -761,7 +716,7 @@ class MainWindow(QMainWindow):
     
     def copy_password(self):
         """Copy the selected password to clipboard."""
-        current_row = self.password_table.currentRow()
+        current_row = self.password_table.currentIndex().row()
         if current_row >= 0:
             password = self.password_manager.passwords[current_row]
             clipboard = QApplication.clipboard()
@@ -781,7 +736,7 @@ class MainWindow(QMainWindow):
     
     def edit_note(self):
         """Edit the selected secure note entry."""
-        current_row = self.notes_table.currentRow()
+        current_row = self.notes_table.currentIndex().row()
         if current_row >= 0:
             note = self.password_manager.notes[current_row]
             dialog = SecureNoteDialog(note, parent=self)
@@ -795,7 +750,7 @@ class MainWindow(QMainWindow):
     
     def delete_note(self):
         """Delete the selected secure note entry."""
-        current_row = self.notes_table.currentRow()
+        current_row = self.notes_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Delete Secure Note",
@@ -813,7 +768,7 @@ class MainWindow(QMainWindow):
     
     def copy_note(self):
         """Copy the selected note content to clipboard."""
-        current_row = self.notes_table.currentRow()
+        current_row = self.notes_table.currentIndex().row()
         if current_row >= 0:
             note = self.password_manager.notes[current_row]
             clipboard = QApplication.clipboard()
@@ -847,6 +802,7 @@ class MainWindow(QMainWindow):
                     self.password_manager.identities = []
                     self.password_manager.files = []
                     self.password_manager.categories = set()
+                    self.password_manager.rebuild_favorites()
 
                     self.refresh_data()
                     self.statusBar().showMessage("Corrupted data simulated and cleared.", 3000)
@@ -928,7 +884,7 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.information(self, "Cancelled", "Account deletion cancelled.")
 
-    def configure_table_resizing(self, table: QTableWidget):
+    def configure_table_resizing(self, table: QTableView):
         """Configure table column resizing behavior."""
         # Set the table to resize columns to content by default
         table.horizontalHeader().setStretchLastSection(True)
@@ -940,6 +896,11 @@ class MainWindow(QMainWindow):
         # For other columns, use ResizeToContents initially, then allow user to resize
         for i in range(table.horizontalHeader().count() - 1):
             table.horizontalHeader().setSectionResizeMode(i, QHeaderView.Interactive)
+        
+        # Every row has the same height and shows a single line, so nothing is measured per row
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.setWordWrap(False)
+        table.setHorizontalScrollMode(QTableView.ScrollPerPixel)
 
     def setup_passwords_tab(self):
         """Setup the passwords tab."""
@@ -971,15 +932,13 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar_layout)
         
         # Password table
-        self.password_table = QTableWidget()
+        self.password_model = PasswordTableModel(parent=self)
+        self.password_table = QTableView()
         self.password_table.setShowGrid(True)
-        self.password_table.setColumnCount(6)
-        self.password_table.setHorizontalHeaderLabels([
-            "Title", "Username", "Password", "URL", "Category", "Last Modified"
-        ])
-        self.password_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.password_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.password_table.itemDoubleClicked.connect(self.edit_password)
+        self.password_table.setModel(self.password_model)
+        self.password_table.setSelectionBehavior(QTableView.SelectRows)
+        self.password_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.password_table.doubleClicked.connect(self.edit_password)
         self.password_table.verticalHeader().setVisible(False)
         
         # Configure table resizing behavior
@@ -1026,12 +985,12 @@ class MainWindow(QMainWindow):
         toolbar_layout.addWidget(self.create_new_button(self.add_note))
         notes_tab_layout.addLayout(toolbar_layout)
         
-        self.notes_table = QTableWidget()
+        self.notes_model = NotesTableModel(parent=self)
+        self.notes_table = QTableView()
         self.notes_table.setShowGrid(True)
-        self.notes_table.setColumnCount(3)
-        self.notes_table.setHorizontalHeaderLabels(["Title", "Category", "Last Modified"])
-        self.notes_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.notes_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.notes_table.setModel(self.notes_model)
+        self.notes_table.setSelectionBehavior(QTableView.SelectRows)
+        self.notes_table.setEditTriggers(QTableView.NoEditTriggers)
         self.notes_table.verticalHeader().setVisible(False)
         
         # Configure table resizing behavior
@@ -1042,7 +1001,7 @@ class MainWindow(QMainWindow):
         
         notes_tab_layout.addWidget(self.notes_table)
 
-        self.notes_table.itemDoubleClicked.connect(self.edit_note)
+        self.notes_table.doubleClicked.connect(self.edit_note)
         self.notes_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.notes_table.customContextMenuRequested.connect(self.show_note_context_menu)
         
@@ -1077,15 +1036,13 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar_layout)
         
         # Cards table
-        self.cards_table = QTableWidget()
+        self.cards_model = CardsTableModel(parent=self)
+        self.cards_table = QTableView()
         self.cards_table.setShowGrid(True)
-        self.cards_table.setColumnCount(7)
-        self.cards_table.setHorizontalHeaderLabels([
-            "Title", "Card Type", "Card Number", "Cardholder", "Expiry", "Category", "Last Modified"
-        ])
-        self.cards_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.cards_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.cards_table.itemDoubleClicked.connect(self.edit_card)
+        self.cards_table.setModel(self.cards_model)
+        self.cards_table.setSelectionBehavior(QTableView.SelectRows)
+        self.cards_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.cards_table.doubleClicked.connect(self.edit_card)
         self.cards_table.verticalHeader().setVisible(False)
         
         # Configure table resizing behavior
@@ -1131,15 +1088,13 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar_layout)
         
         # Identities table
-        self.identities_table = QTableWidget()
+        self.identities_model = IdentitiesTableModel(parent=self)
+        self.identities_table = QTableView()
         self.identities_table.setShowGrid(True)
-        self.identities_table.setColumnCount(6)
-        self.identities_table.setHorizontalHeaderLabels([
-            "Title", "Name", "Email", "Phone", "Category", "Last Modified"
-        ])
-        self.identities_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.identities_table.itemDoubleClicked.connect(self.edit_identity)
-        self.identities_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.identities_table.setModel(self.identities_model)
+        self.identities_table.setSelectionBehavior(QTableView.SelectRows)
+        self.identities_table.doubleClicked.connect(self.edit_identity)
+        self.identities_table.setEditTriggers(QTableView.NoEditTriggers)
         self.identities_table.verticalHeader().setVisible(False)
         
         # Configure table resizing behavior
@@ -1186,15 +1141,13 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar_layout)
         
         # Favorites table
-        self.favorites_table = QTableWidget()
+        self.favorites_model = FavoritesTableModel(parent=self)
+        self.favorites_table = QTableView()
         self.favorites_table.setShowGrid(True)
-        self.favorites_table.setColumnCount(4)
-        self.favorites_table.setHorizontalHeaderLabels([
-            "Title", "Type", "Category", "Last Modified"
-        ])
-        self.favorites_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.favorites_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.favorites_table.itemDoubleClicked.connect(self.edit_favorite)
+        self.favorites_table.setModel(self.favorites_model)
+        self.favorites_table.setSelectionBehavior(QTableView.SelectRows)
+        self.favorites_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.favorites_table.doubleClicked.connect(self.edit_favorite)
         self.favorites_table.verticalHeader().setVisible(False)
         
         # Configure table resizing behavior
@@ -1484,10 +1437,6 @@ class MainWindow(QMainWindow):
                     )
                     return
                 
-                # Read the backup file
-                with open(file_path, 'rb') as f:
-                    lp_data = f.read()
-                
                 # Check if there's existing data and ask user what to do
                 existing_items = (len(self.password_manager.passwords) + 
                                 len(self.password_manager.notes) + 
@@ -1524,9 +1473,10 @@ class MainWindow(QMainWindow):
                         self.password_manager.identities = []
                         self.password_manager.files = []
                         self.password_manager.categories = set()
+                        self.password_manager.rebuild_favorites()
                 
                 # Import the data
-                self.password_manager.import_data(lp_data)
+                self.password_manager.import_file(file_path)
                 
                 # Refresh the UI
                 self.refresh_data()
@@ -1566,6 +1516,8 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle application close event."""
+        # Write column widths still waiting for the flush timer
+        self._flush_column_widths()
         if self.password_manager:
             try:
                 self.password_manager.save_data()
@@ -1575,6 +1527,8 @@ class MainWindow(QMainWindow):
                     self, "Save Warning",
                     f"Could not save data before closing:\n{str(e)}"
                 )
+        # Drop cached vault keys once the session ends
+        EncryptionManager.clear_cache()
         event.accept()
 
     def add_card(self):
@@ -1588,7 +1542,7 @@ class MainWindow(QMainWindow):
     
     def edit_card(self):
         """Edit the selected card entry."""
-        current_row = self.cards_table.currentRow()
+        current_row = self.cards_table.currentIndex().row()
         if current_row >= 0:
             card = self.password_manager.cards[current_row]
             dialog = CardEntryDialog(card, parent=self)
@@ -1602,7 +1556,7 @@ class MainWindow(QMainWindow):
     
     def delete_card(self):
         """Delete the selected card entry."""
-        current_row = self.cards_table.currentRow()
+        current_row = self.cards_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Delete Card",
@@ -1619,7 +1573,7 @@ class MainWindow(QMainWindow):
     
     def copy_card_number(self):
         """Copy the selected card number to clipboard."""
-        current_row = self.cards_table.currentRow()
+        current_row = self.cards_table.currentIndex().row()
         if current_row >= 0:
             card = self.password_manager.cards[current_row]
             clipboard = QApplication.clipboard()
@@ -1630,21 +1584,21 @@ class MainWindow(QMainWindow):
     
     def add_identity(self):
         """Add a new identity entry."""
-        dialog = IdentityEntryDialog(parent=self)
+        dialog = IdentityEntryDialog.get_instance(parent=self)
         if dialog.exec() == QDialog.Accepted:
-            self.password_manager.add_identity(dialog.identity_entry)
+            self.password_manager.add_identity(dialog.take_entry())
             self.refresh_identities()
             self.refresh_favorites()  # Refresh favorites in case new item is favorited
             self.save_data_with_status()
     
     def edit_identity(self):
         """Edit the selected identity entry."""
-        current_row = self.identities_table.currentRow()
+        current_row = self.identities_table.currentIndex().row()
         if current_row >= 0:
             identity = self.password_manager.identities[current_row]
-            dialog = IdentityEntryDialog(identity, parent=self)
+            dialog = IdentityEntryDialog.get_instance(identity, parent=self)
             if dialog.exec() == QDialog.Accepted:
-                self.password_manager.update_identity(current_row, dialog.identity_entry)
+                self.password_manager.update_identity(current_row, dialog.take_entry())
                 self.refresh_identities()
                 self.refresh_favorites()  # Refresh favorites in case favorite status changed
                 self.save_data_with_status()
@@ -1653,7 +1607,7 @@ class MainWindow(QMainWindow):
     
     def delete_identity(self):
         """Delete the selected identity entry."""
-        current_row = self.identities_table.currentRow()
+        current_row = self.identities_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Delete Identity",
@@ -1670,7 +1624,7 @@ class MainWindow(QMainWindow):
     
     def copy_identity_name(self):
         """Copy the selected identity name to clipboard."""
-        current_row = self.identities_table.currentRow()
+        current_row = self.identities_table.currentIndex().row()
         if current_row >= 0:
             identity = self.password_manager.identities[current_row]
             full_name = f"{identity.first_name} {identity.last_name}".strip()
@@ -1682,21 +1636,21 @@ class MainWindow(QMainWindow):
 
     def add_file(self):
         """Add a new file entry."""
-        dialog = FileEntryDialog(parent=self)
+        dialog = FileEntryDialog.get_instance(parent=self)
         if dialog.exec() == QDialog.Accepted:
-            self.password_manager.add_file(dialog.file_entry)
+            self.password_manager.add_file(dialog.take_entry())
             self.refresh_files()
             self.refresh_favorites()  # Refresh favorites in case new item is favorited
             self.save_data_with_status()
     
     def edit_file(self):
         """Edit the selected file entry."""
-        current_row = self.files_table.currentRow()
+        current_row = self.files_table.currentIndex().row()
         if current_row >= 0:
             file_entry = self.password_manager.files[current_row]
-            dialog = FileEntryDialog(file_entry, parent=self)
+            dialog = FileEntryDialog.get_instance(file_entry, parent=self)
             if dialog.exec() == QDialog.Accepted:
-                self.password_manager.update_file(current_row, dialog.file_entry)
+                self.password_manager.update_file(current_row, dialog.take_entry())
                 self.refresh_files()
                 self.refresh_favorites()  # Refresh favorites in case favorite status changed
                 self.save_data_with_status()
@@ -1705,7 +1659,7 @@ class MainWindow(QMainWindow):
     
     def delete_file(self):
         """Delete the selected file entry."""
-        current_row = self.files_table.currentRow()
+        current_row = self.files_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Delete File",
@@ -1723,7 +1677,7 @@ class MainWindow(QMainWindow):
     
     def copy_file(self):
         """Copy the selected file to a new location."""
-        current_row = self.files_table.currentRow()
+        current_row = self.files_table.currentIndex().row()
         if current_row >= 0:
             file_entry = self.password_manager.files[current_row]
             
@@ -1750,10 +1704,11 @@ class MainWindow(QMainWindow):
 
     def edit_favorite(self):
         """Edit the selected favorite item."""
-        current_row = self.favorites_table.currentRow()
+        current_row = self.favorites_table.currentIndex().row()
         if current_row >= 0:
-            item_title = self.favorites_table.item(current_row, 0).text()
-            item_type = self.favorites_table.item(current_row, 1).text()
+            favorite = self.favorites_model.entry(current_row)
+            item_title = favorite.title
+            item_type = favorite.type
             
             item_found = False
             if item_type == "Password":
@@ -1792,9 +1747,9 @@ class MainWindow(QMainWindow):
             elif item_type == "Identity":
                 for i, item in enumerate(self.password_manager.identities):
                     if item.title == item_title:
-                        dialog = IdentityEntryDialog(item, parent=self)
+                        dialog = IdentityEntryDialog.get_instance(item, parent=self)
                         if dialog.exec() == QDialog.Accepted:
-                            updated_item = dialog.identity_entry
+                            updated_item = dialog.take_entry()
                             self.password_manager.update_identity(i, updated_item)
                             self.save_data_with_status()
                             self.refresh_data()
@@ -1808,10 +1763,11 @@ class MainWindow(QMainWindow):
     
     def delete_favorite(self):
         """Delete the selected favorite item (unfavorite it)."""
-        current_row = self.favorites_table.currentRow()
+        current_row = self.favorites_table.currentIndex().row()
         if current_row >= 0:
-            item_title = self.favorites_table.item(current_row, 0).text()
-            item_type = self.favorites_table.item(current_row, 1).text()
+            favorite = self.favorites_model.entry(current_row)
+            item_title = favorite.title
+            item_type = favorite.type
 
             reply = QMessageBox.question(
                 self, "Unfavorite Item",
@@ -1824,25 +1780,25 @@ class MainWindow(QMainWindow):
                 if item_type == "Password":
                     for item in self.password_manager.passwords:
                         if item.title == item_title:
-                            item.is_favorite = False
+                            self.password_manager.set_favorite(item, False)
                             item_unfavorited = True
                             break
                 elif item_type == "Secure Note":
                     for item in self.password_manager.notes:
                         if item.title == item_title:
-                            item.is_favorite = False
+                            self.password_manager.set_favorite(item, False)
                             item_unfavorited = True
                             break
                 elif item_type == "Card":
                     for item in self.password_manager.cards:
                         if item.title == item_title:
-                            item.is_favorite = False
+                            self.password_manager.set_favorite(item, False)
                             item_unfavorited = True
                             break
                 elif item_type == "Identity":
                     for item in self.password_manager.identities:
                         if item.title == item_title:
-                            item.is_favorite = False
+                            self.password_manager.set_favorite(item, False)
                             item_unfavorited = True
                             break
 
@@ -1857,10 +1813,11 @@ class MainWindow(QMainWindow):
 
     def copy_favorite(self):
         """Copy content of the selected favorite item to clipboard based on its type."""
-        current_row = self.favorites_table.currentRow()
+        current_row = self.favorites_table.currentIndex().row()
         if current_row >= 0:
-            item_title = self.favorites_table.item(current_row, 0).text()
-            item_type = self.favorites_table.item(current_row, 1).text()
+            favorite = self.favorites_model.entry(current_row)
+            item_title = favorite.title
+            item_type = favorite.type
 
             clipboard = QApplication.clipboard()
             copied_content = ""
@@ -1897,9 +1854,14 @@ class MainWindow(QMainWindow):
 
     def global_search(self):
         """Perform global search across all tables based on the currently active tab.
-        This method is connected to the textChanged signal of self.global_search_edit.
+        This method runs 150 ms after the last edit of self.global_search_edit, and does
+        nothing if neither the text nor the tab changed since it last ran.
         """
         current_tab_index = self.content_stack.currentIndex()
+        search = (current_tab_index, self.global_search_edit.text())
+        if search == self._last_search:
+            return
+        self._last_search = search
         if current_tab_index == 0: # Favorites tab
             self.filter_favorites()
         elif current_tab_index == 1: # Passwords tab
@@ -1916,17 +1878,8 @@ class MainWindow(QMainWindow):
 
     def filter_favorites(self):
         """Filter favorites based on search text."""
-        search_text = self.global_search_edit.text().lower()
-        
-        for i in range(self.favorites_table.rowCount()):
-            title = self.favorites_table.item(i, 0).text().lower()
-            item_type = self.favorites_table.item(i, 1).text().lower()
-            category = self.favorites_table.item(i, 2).text().lower()
-            
-            if search_text in title or search_text in item_type or search_text in category:
-                self.favorites_table.setRowHidden(i, False)
-            else:
-                self.favorites_table.setRowHidden(i, True)
+        matches = self.password_manager.search('favorites', self.global_search_edit.text())
+        self.apply_row_filter(self.favorites_table, matches)
     
     def update_all_toolbar_buttons_states(self):
         """Updates the enabled/disabled state of all toolbar buttons based on selection and search status."""
@@ -1952,7 +1905,7 @@ class MainWindow(QMainWindow):
         elif current_tab_index == 4: # Secure Notes tab
             current_table = self.notes_table
 
-        has_selection = current_table and current_table.currentRow() >= 0
+        has_selection = current_table and current_table.currentIndex().row() >= 0
 
         # Disable edit/delete/copy buttons if search is active or no selection
         for btn in self.edit_buttons + self.delete_buttons + self.copy_buttons:
@@ -2108,7 +2061,7 @@ class MainWindow(QMainWindow):
         """Toggle the favorite status of a password entry."""
         if 0 <= row < len(self.password_manager.passwords):
             password_entry = self.password_manager.passwords[row]
-            password_entry.is_favorite = not password_entry.is_favorite
+            self.password_manager.set_favorite(password_entry, not password_entry.is_favorite)
             self.save_data_with_status()
             self.refresh_passwords()
             self.refresh_favorites()
@@ -2118,7 +2071,7 @@ class MainWindow(QMainWindow):
         """Toggle the favorite status of a secure note entry."""
         if 0 <= row < len(self.password_manager.notes):
             note_entry = self.password_manager.notes[row]
-            note_entry.is_favorite = not note_entry.is_favorite
+            self.password_manager.set_favorite(note_entry, not note_entry.is_favorite)
             self.save_data_with_status()
             self.refresh_notes()
             self.refresh_favorites()
@@ -2128,7 +2081,7 @@ class MainWindow(QMainWindow):
         """Toggle the favorite status of a card entry."""
         if 0 <= row < len(self.password_manager.cards):
             card_entry = self.password_manager.cards[row]
-            card_entry.is_favorite = not card_entry.is_favorite
+            self.password_manager.set_favorite(card_entry, not card_entry.is_favorite)
             self.save_data_with_status()
             self.refresh_cards()
             self.refresh_favorites()
@@ -2138,7 +2091,7 @@ class MainWindow(QMainWindow):
         """Toggle the favorite status of an identity entry."""
         if 0 <= row < len(self.password_manager.identities):
             identity_entry = self.password_manager.identities[row]
-            identity_entry.is_favorite = not identity_entry.is_favorite
+            self.password_manager.set_favorite(identity_entry, not identity_entry.is_favorite)
             self.save_data_with_status()
             self.refresh_identities()
             self.refresh_favorites()
@@ -2148,8 +2101,8 @@ class MainWindow(QMainWindow):
         """Toggle the favorite status of a file entry."""
         if 0 <= row < len(self.password_manager.files):
             file_entry = self.password_manager.files[row]
-            file_entry.is_favorite = not file_entry.is_favorite
+            self.password_manager.set_favorite(file_entry, not file_entry.is_favorite)
             self.save_data_with_status()
             self.refresh_files()
             self.refresh_favorites()
-            self.statusBar().showMessage(f"File '{file_entry.title}' favorite status toggled", 2000)
\ No newline at end of file
+            self.statusBar().showMessage(f"File '{file_entry.title}' favorite status toggled", 2000)
\ No newline at end of file
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QCheckBox, QTextEdit, QSizePolicy
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 
 from ..models import PasswordEntry
 from .password_generator_dialog import PasswordGeneratorDialog
@@ -22,11 +22,10 @@ class PasswordEntryDialog(QDialog):
     def __init__(self, entry: Optional[PasswordEntry] = None, parent=None):
         super().__init__(parent)
         self.entry = entry
+        self._title_bar_applied = False
         self.setup_ui()
         if entry:
             self.load_entry(entry)
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
     
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
@@ -34,8 +33,10 @@ class PasswordEntryDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -100,26 +101,14 @@ class PasswordEntryDialog(QDialog):
         button_layout = QHBoxLayout()
         self.save_btn = QPushButton("Save")
         self.save_btn.clicked.connect(self.accept)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078D7; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #005B9C; }
-        """)
+        self.save_btn.setObjectName("primaryBtn")
         self.save_btn.setMinimumHeight(36)
         self.save_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         button_layout.addWidget(self.save_btn)
 
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6C757D; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #545B62; }
-        """)
+        self.cancel_btn.setObjectName("secondaryBtn")
         self.cancel_btn.setMinimumHeight(36)
         self.cancel_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         button_layout.addWidget(self.cancel_btn)
@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QSpinBox, QCheckBox, QMessageBox
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
 from ..core import PasswordGenerator
@@ -21,9 +21,8 @@ class PasswordGeneratorDialog(QDialog):
         super().__init__(parent)
         self.generator = PasswordGenerator()
         self.generated_password = ""
+        self._title_bar_applied = False
         self.setup_ui()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
     
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
@@ -31,8 +30,10 @@ class PasswordGeneratorDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the user interface."""
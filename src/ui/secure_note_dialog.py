@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QLineEdit, 
     QTextEdit, QComboBox, QDialogButtonBox, QCheckBox, QFormLayout, QHBoxLayout, QPushButton, QScrollArea, QWidget, QSizePolicy, QMessageBox
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
 from ..models import SecureNote
@@ -22,11 +22,10 @@ class SecureNoteDialog(QDialog):
     def __init__(self, note: Optional[SecureNote] = None, parent=None):
         super().__init__(parent)
         self.note = note
+        self._title_bar_applied = False
         self.setup_ui()
         if note:
             self.load_note(note)
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
     
     def customize_title_bar(self):
         """Apply custom title bar styling using Windows API."""
@@ -34,8 +33,10 @@ class SecureNoteDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the dialog UI."""
@@ -58,7 +59,7 @@ class SecureNoteDialog(QDialog):
         # --- Note Information Section Heading (as a row in the form layout) ---
         note_info_label = QLabel("Note Information")
         note_info_label.setFont(QFont("Arial", 12, QFont.Bold))
-        note_info_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
+        note_info_label.setProperty("heading", True)
         form_layout.addRow(note_info_label)
 
         # Title
@@ -84,7 +85,7 @@ class SecureNoteDialog(QDialog):
         # --- File Attachments Section Heading and Widget (outside form layout) ---
         file_label = QLabel("File Attachments")
         file_label.setFont(QFont("Arial", 12, QFont.Bold))
-        file_label.setStyleSheet("color: #0078D7; margin-top: 10px;")
+        file_label.setProperty("heading", True)
         main_layout.addWidget(file_label)
         self.file_attachment_widget = FileAttachmentWidget()
         main_layout.addWidget(self.file_attachment_widget)
@@ -99,26 +100,14 @@ class SecureNoteDialog(QDialog):
         self.save_btn.setDefault(True)
         self.save_btn.setMinimumHeight(36)
         self.save_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078D7; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #005B9C; }
-        """)
+        self.save_btn.setObjectName("primaryBtn")
         self.save_btn.clicked.connect(self.handle_save)
         button_layout.addWidget(self.save_btn)
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.clicked.connect(self.reject)
         self.cancel_btn.setMinimumHeight(36)
         self.cancel_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6C757D; color: white; border: none;
-                padding: 10px 20px; border-radius: 4px; font-weight: bold;
-            }
-            QPushButton:hover { background-color: #545B62; }
-        """)
+        self.cancel_btn.setObjectName("secondaryBtn")
         button_layout.addWidget(self.cancel_btn)
         main_layout.addLayout(button_layout)
     
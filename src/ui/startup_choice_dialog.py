@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QApplication, QSizePolicy
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QPixmap
 
 from ..utils import apply_custom_title_bar
@@ -20,9 +20,8 @@ class StartupChoiceDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.choice = None  # 'new' or 'restore'
+        self._title_bar_applied = False
         self.setup_ui()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
         # Center the dialog on the screen
         qr = self.frameGeometry()
         cp = QApplication.primaryScreen().availableGeometry().center()
@@ -35,8 +34,10 @@ class StartupChoiceDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -25,9 +25,8 @@ class WelcomeBackDialog(QDialog):
         self.master_password = ""
         self.uploaded_file_path = ""
         self.password_manager = None
+        self._title_bar_applied = False
         self.setup_ui()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
         # Center the dialog on the screen
         qr = self.frameGeometry()
         cp = QApplication.primaryScreen().availableGeometry().center()
@@ -40,8 +39,10 @@ class WelcomeBackDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -245,11 +246,7 @@ class WelcomeBackDialog(QDialog):
             temp_password_manager = PasswordManager(master_password, temp_user_manager)
             
             # Try to load the data with the provided password
-            with open(self.uploaded_file_path, 'rb') as f:
-                lp_data = f.read()
-            
-            # Test if we can decrypt the data
-            temp_password_manager.import_data(lp_data)
+            temp_password_manager.import_file(self.uploaded_file_path)
             
             # If we get here, the password is correct
             self.status_label.setText("Password verified successfully!")
@@ -261,7 +258,7 @@ class WelcomeBackDialog(QDialog):
             self.password_manager.data_file = get_appdata_path("luckeepass_data.lp")
             
             # Import the data
-            self.password_manager.import_data(lp_data)
+            self.password_manager.import_file(self.uploaded_file_path)
             
             # Save the data to the local file
             self.password_manager.save_data()
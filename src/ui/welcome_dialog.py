@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QMessageBox, QFrame, QApplication
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QPixmap
 
 from ..core import UserManager
@@ -22,9 +22,8 @@ class WelcomeDialog(QDialog):
         super().__init__(parent)
         self.user_manager = user_manager
         self.master_password = ""
+        self._title_bar_applied = False
         self.setup_ui()
-        # Apply custom title bar after setup
-        QTimer.singleShot(100, self.customize_title_bar)
         # Center the dialog on the screen
         qr = self.frameGeometry()
         cp = QApplication.primaryScreen().availableGeometry().center()
@@ -37,8 +36,10 @@ class WelcomeDialog(QDialog):
     
     def showEvent(self, event):
         super().showEvent(event)
-        # Apply custom title bar when shown
-        QTimer.singleShot(100, self.customize_title_bar)
+        # The native window exists by the first show, so style it right away
+        if not self._title_bar_applied:
+            self._title_bar_applied = True
+            self.customize_title_bar()
     
     def setup_ui(self):
         """Setup the user interface."""